@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import List
+from pathlib import Path
+from typing import List, Optional
 
 import altair as alt
+import duckdb
 import pandas as pd
 import streamlit as st
 
@@ -18,6 +20,8 @@ from lib.data import (
 
 PAGE_TITLE = "Defense vs Position (Fantasy Points Allowed)"
 DEFAULT_POSITIONS = ["WR", "RB", "TE", "QB"]
+# Rollup cube written by queries/reports/materialize_team_position_week_cube.sql
+TEAM_POSITION_WEEK_CUBE = Path("data/gold/cubes/team_position_week")
 
 
 @lru_cache(maxsize=8)
@@ -105,7 +109,55 @@ def _summarize(data: pd.DataFrame) -> pd.DataFrame:
     return summary
 
 
-summary_df = _summarize(df)
+def _summarize_from_cube(
+    season: int, weeks: List[int], positions: List[str], defenses: List[str]
+) -> Optional[pd.DataFrame]:
+    """Same summary as ``_summarize``, summed from the (team, position) week cube.
+
+    Each cube row is one offense's position total for a week, so a defense's points allowed in a
+    week is the row whose opponent_team is that defense. Returns None if the cube is not built.
+    """
+    part = TEAM_POSITION_WEEK_CUBE / f"season={season}"
+    if not any(part.glob("*/*.parquet")):
+        return None
+    summary = duckdb.execute(
+        f"""
+        WITH allowed AS (
+            SELECT opponent_team AS defense_team, position, week,
+                   SUM(sum_fantasy_points_ppr) AS points_allowed_ppr
+            FROM read_parquet('{part.as_posix()}/*/*.parquet', hive_partitioning = true)
+            WHERE opponent_team IS NOT NULL
+              AND (len($weeks) = 0 OR list_contains($weeks, week))
+              AND list_contains($positions, position)
+              AND (len($defenses) = 0 OR list_contains($defenses, opponent_team))
+            GROUP BY ALL
+        ), league AS (
+            SELECT position,
+                   AVG(points_allowed_ppr) AS league_avg_points_allowed,
+                   STDDEV_POP(points_allowed_ppr) AS league_std_points_allowed
+            FROM allowed
+            GROUP BY position
+        )
+        SELECT a.defense_team, a.position,
+               COUNT(DISTINCT a.week) AS games_played,
+               SUM(a.points_allowed_ppr) AS total_points_allowed,
+               AVG(a.points_allowed_ppr) AS avg_points_allowed,
+               ANY_VALUE(l.league_avg_points_allowed) AS league_avg_points_allowed,
+               ANY_VALUE(l.league_std_points_allowed) AS league_std_points_allowed
+        FROM allowed a
+        JOIN league l USING (position)
+        GROUP BY a.defense_team, a.position
+        """,
+        {"weeks": weeks, "positions": positions or DEFAULT_POSITIONS, "defenses": defenses},
+    ).df()
+    summary["avg_vs_league"] = summary["avg_points_allowed"] - summary["league_avg_points_allowed"]
+    summary["percent_vs_league"] = summary["avg_points_allowed"] / summary["league_avg_points_allowed"] - 1.0
+    return summary.sort_values(["position", "avg_points_allowed"], ascending=[True, False])
+
+
+summary_df = _summarize_from_cube(season, selected_weeks, selected_positions, selected_defenses)
+if summary_df is None:
+    summary_df = _summarize(df)
 
 st.subheader("Fantasy Points Allowed (Summary)")
 st.caption(
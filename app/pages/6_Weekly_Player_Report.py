@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from typing import List
+from pathlib import Path
+from typing import List, Optional
 
 import altair as alt
+import duckdb
 import pandas as pd
 import streamlit as st
 
@@ -15,6 +17,26 @@ from lib.data import (
 )
 
 
+# Rollup cube written by queries/reports/materialize_team_position_week_cube.sql
+TEAM_POSITION_WEEK_CUBE = Path("data/gold/cubes/team_position_week")
+
+
+def _team_totals(season: int, week: int) -> Optional[pd.DataFrame]:
+    """Team target and air-yard totals over every position, summed from the week cube."""
+    part = TEAM_POSITION_WEEK_CUBE / f"season={season}" / f"week={week}"
+    if not any(part.glob("*.parquet")):
+        return None
+    return duckdb.sql(
+        f"""
+        SELECT season_type, team,
+               SUM(sum_targets) AS team_targets,
+               SUM(sum_receiving_air_yards) AS team_air_yards
+        FROM read_parquet('{part.as_posix()}/*.parquet')
+        GROUP BY ALL
+        """
+    ).df()
+
+
 st.set_page_config(page_title="Weekly Player Report", layout="wide")
 st.title("Weekly Player Report")
 
@@ -77,8 +99,13 @@ if df.empty:
 df["targets"] = pd.to_numeric(df.get("targets"), errors="coerce")
 df["receiving_air_yards"] = pd.to_numeric(df.get("receiving_air_yards"), errors="coerce")
 
-df["team_targets"] = df.groupby(["season", "week", "team"], dropna=False)["targets"].transform("sum")
-df["team_air_yards"] = df.groupby(["season", "week", "team"], dropna=False)["receiving_air_yards"].transform("sum")
+# Shares are over the whole team, so take totals from the cube rather than the filtered rows
+team_totals = _team_totals(season, week)
+if team_totals is not None:
+    df = df.merge(team_totals, on=["season_type", "team"], how="left")
+else:
+    df["team_targets"] = df.groupby(["season", "week", "team"], dropna=False)["targets"].transform("sum")
+    df["team_air_yards"] = df.groupby(["season", "week", "team"], dropna=False)["receiving_air_yards"].transform("sum")
 df["target_share"] = (df["targets"] / df["team_targets"].replace({0: pd.NA})) * 100
 df["air_yards_share"] = (df["receiving_air_yards"] / df["team_air_yards"].replace({0: pd.NA})) * 100
 df = df.drop(columns=["team_targets", "team_air_yards"], errors="ignore")
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import duckdb
+import streamlit as st
+
+
+QUALITY_STORE = Path("catalog/quality/columns")
+
+st.set_page_config(page_title="Data Quality", layout="wide")
+st.title("Data Quality")
+
+if not any(QUALITY_STORE.glob("*.parquet")):
+    st.warning("No column profiles found. Run `python -m src.cli profile` to populate the quality store.")
+    st.stop()
+
+con = duckdb.connect()
+con.execute(
+    f"""
+    CREATE VIEW latest AS
+    SELECT * EXCLUDE (rn) FROM (
+        SELECT *, row_number() OVER (
+            PARTITION BY dataset, layer, "partition", "column" ORDER BY profiled_at DESC
+        ) AS rn
+        FROM read_parquet('{QUALITY_STORE.as_posix()}/*.parquet', union_by_name = true)
+    ) WHERE rn = 1
+    """
+)
+
+datasets = [r[0] for r in con.execute("SELECT DISTINCT dataset FROM latest ORDER BY 1").fetchall()]
+dataset = st.sidebar.selectbox("Dataset", datasets)
+layers = [r[0] for r in con.execute("SELECT DISTINCT layer FROM latest WHERE dataset = ? ORDER BY 1", [dataset]).fetchall()]
+layer = st.sidebar.selectbox("Layer", layers)
+
+summary = con.execute(
+    """
+    SELECT "column", any_value(dtype) AS dtype, count(*) AS partitions, sum(rows) AS rows,
+           sum(null_count) AS null_count, sum(null_count) / nullif(sum(rows), 0) AS null_ratio,
+           max(approx_distinct) AS max_partition_distinct, min("min") AS "min", max("max") AS "max"
+    FROM latest
+    WHERE dataset = ? AND layer = ?
+    GROUP BY "column"
+    ORDER BY null_ratio DESC, "column"
+    """,
+    [dataset, layer],
+).df()
+st.subheader("Columns")
+st.dataframe(summary, use_container_width=True)
+
+column = st.sidebar.selectbox("Column", summary["column"].tolist() if not summary.empty else [])
+if column:
+    detail = con.execute(
+        """
+        SELECT "partition", rows, null_ratio, approx_distinct, "min", p01, p25, p50, p75, p99, "max", top_values
+        FROM latest
+        WHERE dataset = ? AND layer = ? AND "column" = ?
+        ORDER BY "partition"
+        """,
+        [dataset, layer, column],
+    ).df()
+    st.subheader(f"{column} by partition")
+    st.line_chart(detail.set_index("partition")[["null_ratio"]])
+    st.dataframe(detail, use_container_width=True)
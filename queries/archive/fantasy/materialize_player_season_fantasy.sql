@@ -19,22 +19,7 @@ COPY (
   ),
   scored AS (
     SELECT e.*,
-      (
-        0.04 * COALESCE(e.passing_yards, 0) +
-        4.0  * COALESCE(e.passing_tds, 0) +
-       -1.0  * COALESCE(e.interceptions, 0) +
-        0.10 * COALESCE(e.rushing_yards, 0) +
-        6.0  * COALESCE(e.rushing_tds, 0) +
-        0.10 * COALESCE(e.receiving_yards, 0) +
-        6.0  * COALESCE(e.receiving_tds, 0) +
-        1.0  * COALESCE(e.receptions, 0) +
-        6.0  * COALESCE(e.special_teams_tds, 0) +
-       -1.0  * (COALESCE(e.rushing_fumbles_lost, 0) + COALESCE(e.receiving_fumbles_lost, 0) + COALESCE(e.sack_fumbles_lost, 0)) +
-        2.0  * (COALESCE(e.passing_2pt_conversions, 0) + COALESCE(e.rushing_2pt_conversions, 0) + COALESCE(e.receiving_2pt_conversions, 0)) +
-        CASE WHEN COALESCE(e.passing_yards, 0)  >= 300 THEN 3.0 ELSE 0.0 END +
-        CASE WHEN COALESCE(e.rushing_yards, 0)  >= 100 THEN 3.0 ELSE 0.0 END +
-        CASE WHEN COALESCE(e.receiving_yards, 0) >= 100 THEN 3.0 ELSE 0.0 END
-      ) AS dk_ppr_points
+      dk_classic_points(e) AS dk_ppr_points
     FROM enriched e
   ),
   agg AS (
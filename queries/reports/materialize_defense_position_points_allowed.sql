@@ -1,12 +1,10 @@
 -- reports/materialize_defense_position_points_allowed.sql
 -- Materialize per-defense fantasy points allowed by offensive position (PPR scoring)
 -- Output: data/gold/reports/defense_position_points_allowed (partitioned by season, week)
+-- Params: $season, $season_type (bound by src/reports/runner.py); reads the season-scoped silver_*_for_season views
 
 COPY (
-  WITH params AS (
-    SELECT 2025 AS season,
-           'REG' AS season_type
-  ), weekly AS (
+  WITH weekly AS (
     SELECT
       season,
       week,
@@ -14,9 +12,9 @@ COPY (
       UPPER(opponent_team) AS defense_team,
       UPPER(position) AS position,
       COALESCE(fantasy_points_ppr, 0.0) AS fantasy_points_ppr
-    FROM read_parquet('data/silver/weekly/season=*/**/*.parquet', union_by_name=true)
-    WHERE season = (SELECT season FROM params)
-      AND season_type = (SELECT season_type FROM params)
+    FROM silver_weekly_for_season
+    WHERE season = $season
+      AND season_type = $season_type
       AND opponent_team IS NOT NULL
       AND position IN ('QB', 'RB', 'WR', 'TE')
   ), player_points AS (
@@ -35,18 +33,18 @@ COPY (
       week,
       game_type AS season_type,
       UPPER(home_team) AS defense_team
-    FROM read_parquet('data/silver/schedules/season=*/**/*.parquet', union_by_name=true)
-    WHERE season = (SELECT season FROM params)
-      AND game_type = (SELECT season_type FROM params)
+    FROM silver_schedules_for_season
+    WHERE season = $season
+      AND game_type = $season_type
     UNION ALL
     SELECT
       season,
       week,
       game_type AS season_type,
       UPPER(away_team) AS defense_team
-    FROM read_parquet('data/silver/schedules/season=*/**/*.parquet', union_by_name=true)
-    WHERE season = (SELECT season FROM params)
-      AND game_type = (SELECT season_type FROM params)
+    FROM silver_schedules_for_season
+    WHERE season = $season
+      AND game_type = $season_type
   ), positions AS (
     SELECT DISTINCT position
     FROM weekly
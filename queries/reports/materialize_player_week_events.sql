@@ -0,0 +1,59 @@
+-- reports/materialize_player_week_events.sql
+-- Per player-week target and carry counts shared by the utilization reports
+-- Params: $season, $season_type (bound by src/reports/runner.py); reads the season-scoped silver_*_for_season views
+-- pbp is scanned once; receiving and rushing events both aggregate the materialized ``plays``.
+
+COPY (
+  WITH plays AS MATERIALIZED (
+    SELECT year AS season, week, season_type, posteam AS team,
+           receiver_player_id, rusher_player_id,
+           rush,
+           air_yards, yardline_100,
+           down, ydstogo,
+           half_seconds_remaining,
+           offense_personnel,
+           shotgun::INT AS is_shotgun,
+           no_huddle::INT AS is_no_huddle,
+           0::INT AS is_play_action,
+           CASE WHEN pass=1 AND receiver_player_id IS NOT NULL THEN 1 ELSE 0 END AS is_target
+    FROM silver_pbp_for_season
+    WHERE year = $season AND season_type = $season_type
+  ), rec AS (
+    SELECT season, week, season_type, team, receiver_player_id AS player_id,
+           SUM(is_target) AS targets,
+           SUM(CASE WHEN air_yards IS NOT NULL AND yardline_100 - air_yards <= 0 THEN 1 ELSE 0 END) AS end_zone_targets,
+           SUM(CASE WHEN yardline_100 <= 20 AND is_target=1 THEN 1 ELSE 0 END) AS rz20_targets,
+           SUM(CASE WHEN yardline_100 <= 10 AND is_target=1 THEN 1 ELSE 0 END) AS rz10_targets,
+           SUM(CASE WHEN yardline_100 <=  5 AND is_target=1 THEN 1 ELSE 0 END) AS rz5_targets,
+           SUM(CASE WHEN down IN (3,4) AND is_target=1 THEN 1 ELSE 0 END) AS third_fourth_down_targets,
+           SUM(CASE WHEN down IN (3,4) AND ydstogo >= 5 AND is_target=1 THEN 1 ELSE 0 END) AS ldd_targets,
+           SUM(CASE WHEN down IN (1,2,3,4) AND ydstogo <= 2 AND is_target=1 THEN 1 ELSE 0 END) AS sdd_targets,
+           SUM(CASE WHEN half_seconds_remaining <= 120 AND is_target=1 THEN 1 ELSE 0 END) AS two_minute_targets,
+           SUM(CASE WHEN half_seconds_remaining <= 240 AND is_target=1 THEN 1 ELSE 0 END) AS four_minute_targets,
+           SUM(CASE WHEN is_play_action=1 AND is_target=1 THEN 1 ELSE 0 END) AS play_action_targets,
+           SUM(CASE WHEN is_shotgun=1 AND is_target=1 THEN 1 ELSE 0 END) AS shotgun_targets,
+           SUM(CASE WHEN is_no_huddle=1 AND is_target=1 THEN 1 ELSE 0 END) AS no_huddle_targets,
+           SUM(CASE WHEN offense_personnel = '11' AND is_target=1 THEN 1 ELSE 0 END) AS p11_targets,
+           SUM(CASE WHEN offense_personnel = '12' AND is_target=1 THEN 1 ELSE 0 END) AS p12_targets,
+           SUM(CASE WHEN offense_personnel = '21' AND is_target=1 THEN 1 ELSE 0 END) AS p21_targets,
+           SUM(CASE WHEN is_target=1 AND air_yards IS NOT NULL THEN air_yards ELSE 0 END) AS sum_air_yards,
+           SUM(CASE WHEN is_target=1 AND air_yards IS NOT NULL THEN 1 ELSE 0 END) AS cnt_air_targets
+    FROM plays
+    WHERE receiver_player_id IS NOT NULL
+    GROUP BY season, week, season_type, team, receiver_player_id
+  ), rush AS (
+    SELECT season, week, season_type, team, rusher_player_id AS player_id,
+           COUNT(*) AS carries,
+           SUM(CASE WHEN yardline_100 <= 20 THEN 1 ELSE 0 END) AS rz20_carries,
+           SUM(CASE WHEN yardline_100 <= 10 THEN 1 ELSE 0 END) AS rz10_carries,
+           SUM(CASE WHEN yardline_100 <=  5 THEN 1 ELSE 0 END) AS rz5_carries,
+           SUM(CASE WHEN down IN (3,4) THEN 1 ELSE 0 END) AS third_fourth_down_carries
+    FROM plays
+    WHERE rush = 1 AND rusher_player_id IS NOT NULL
+    GROUP BY season, week, season_type, team, rusher_player_id
+  )
+  -- Rushing-only players get NULL receiving columns (and vice versa), as a LEFT JOIN on each side would
+  SELECT * FROM rec
+  FULL OUTER JOIN rush USING (season, week, season_type, team, player_id)
+) TO 'data/gold/player_week_events'
+WITH (FORMAT PARQUET, PARTITION_BY (season, week), OVERWRITE_OR_IGNORE 1);
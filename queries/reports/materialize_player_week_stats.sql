@@ -1,16 +1,15 @@
 -- reports/materialize_player_week_stats.sql
 -- Materialize per-player weekly stats + DraftKings/PPR scoring and select advanced metrics
 -- Output: data/gold/reports/player_week_stats (partitioned by season, week)
+-- Params: $season, $season_type (bound by src/reports/runner.py); reads the season-scoped silver_*_for_season views
+-- Scoring: standard_ppr_points / dk_classic_points macros compiled from catalog/scoring and catalog/draftkings
 
 COPY (
-  WITH params AS (
-    SELECT 2025 AS season,
-           'REG' AS season_type
-  ), weekly AS (
+  WITH weekly AS (
     SELECT *
-    FROM read_parquet('data/silver/weekly/season=*/**/*.parquet', union_by_name=true)
-    WHERE season = (SELECT season FROM params)
-      AND season_type = (SELECT season_type FROM params)
+    FROM silver_weekly_for_season
+    WHERE season = $season
+      AND season_type = $season_type
   ), weekly_norm AS (
     -- Pick one row per player-week-team to avoid duplicate sources in weekly
     SELECT
@@ -48,9 +47,9 @@ COPY (
            receiver_player_id AS player_id,
            SUM(CASE WHEN pass=1 AND receiver_player_id IS NOT NULL AND air_yards IS NOT NULL THEN air_yards ELSE 0 END) AS sum_air_yards,
            SUM(CASE WHEN pass=1 AND receiver_player_id IS NOT NULL AND air_yards IS NOT NULL THEN 1 ELSE 0 END) AS cnt_air_targets
-    FROM read_parquet('data/silver/pbp/year=*/**/*.parquet', union_by_name=true)
-    WHERE year = (SELECT season FROM params)
-      AND season_type = (SELECT season_type FROM params)
+    FROM silver_pbp_for_season
+    WHERE year = $season
+      AND season_type = $season_type
     GROUP BY year, week, season_type, posteam, receiver_player_id
   ), xfp AS (
     -- Simple expected fantasy points proxy
@@ -59,8 +58,8 @@ COPY (
              receiver_player_id AS rec_id,
              rusher_player_id   AS rush_id,
              pass, rush, yardline_100, air_yards
-      FROM read_parquet('data/silver/pbp/year=*/**/*.parquet', union_by_name=true)
-      WHERE year = (SELECT season FROM params) AND season_type = (SELECT season_type FROM params)
+      FROM silver_pbp_for_season
+      WHERE year = $season AND season_type = $season_type
     ), recv AS (
       SELECT season, week, season_type, team, rec_id AS player_id,
              SUM(CASE WHEN pass=1 THEN 1 ELSE 0 END) AS targets,
@@ -84,35 +83,10 @@ COPY (
     FROM rush r
     FULL OUTER JOIN recv v USING (season, week, season_type, team, player_id)
   ), scored AS (
-    -- Compute fantasy scoring
+    -- Fantasy scoring from the rules catalog (macros registered by src/scoring.py)
     SELECT b.*,
-      (
-        0.04 * COALESCE(b.passing_yards, 0) +
-        4.0  * COALESCE(b.passing_tds, 0) +
-       -2.0  * COALESCE(b.interceptions, 0) +
-        0.10 * COALESCE(b.rushing_yards, 0) +
-        6.0  * COALESCE(b.rushing_tds, 0) +
-        0.10 * COALESCE(b.receiving_yards, 0) +
-        6.0  * COALESCE(b.receiving_tds, 0) +
-        1.0  * COALESCE(b.receptions, 0) +
-       -2.0  * (COALESCE(b.rushing_fumbles_lost, 0) + COALESCE(b.receiving_fumbles_lost, 0) + COALESCE(b.sack_fumbles_lost, 0))
-      ) AS ppr_points,
-      (
-        0.04 * COALESCE(b.passing_yards, 0) +
-        4.0  * COALESCE(b.passing_tds, 0) +
-       -1.0  * COALESCE(b.interceptions, 0) +
-        0.10 * COALESCE(b.rushing_yards, 0) +
-        6.0  * COALESCE(b.rushing_tds, 0) +
-        0.10 * COALESCE(b.receiving_yards, 0) +
-        6.0  * COALESCE(b.receiving_tds, 0) +
-        1.0  * COALESCE(b.receptions, 0) +
-        6.0  * COALESCE(b.special_teams_tds, 0) +
-       -1.0  * (COALESCE(b.rushing_fumbles_lost, 0) + COALESCE(b.receiving_fumbles_lost, 0) + COALESCE(b.sack_fumbles_lost, 0)) +
-        2.0  * (COALESCE(b.passing_2pt_conversions, 0) + COALESCE(b.rushing_2pt_conversions, 0) + COALESCE(b.receiving_2pt_conversions, 0)) +
-        CASE WHEN COALESCE(b.passing_yards, 0)  >= 300 THEN 3.0 ELSE 0.0 END +
-        CASE WHEN COALESCE(b.rushing_yards, 0)  >= 100 THEN 3.0 ELSE 0.0 END +
-        CASE WHEN COALESCE(b.receiving_yards, 0) >= 100 THEN 3.0 ELSE 0.0 END
-      ) AS dk_ppr_points
+      standard_ppr_points(b) AS ppr_points,
+      dk_classic_points(b) AS dk_ppr_points
     FROM base b
   ), joined AS (
     SELECT
@@ -1,14 +1,12 @@
 -- reports/materialize_player_week_utilization_rb.sql
 -- RB utilization (rushing + receiving) per player-week
+-- Params: $season, $season_type (bound by src/reports/runner.py); reads silver_weekly_for_season and the season-scoped gold_team_week_context/gold_player_week_events intermediates
 
 COPY (
-  WITH params AS (
-    SELECT 2025 AS season,
-           'REG' AS season_type
-  ), w_raw AS (
+  WITH w_raw AS (
     SELECT *
-    FROM read_parquet('data/silver/weekly/season=*/**/*.parquet', union_by_name=true)
-    WHERE season = (SELECT season FROM params) AND season_type = (SELECT season_type FROM params)
+    FROM silver_weekly_for_season
+    WHERE season = $season AND season_type = $season_type
   ), w AS (
     SELECT * EXCLUDE (rn)
     FROM (
@@ -20,54 +18,23 @@ COPY (
     )
     WHERE rn = 1 AND position='RB'
   ), rush_ev AS (
-    SELECT year AS season, week, season_type, posteam AS team,
-           rusher_player_id AS player_id,
-           COUNT(*) AS carries,
-           SUM(CASE WHEN yardline_100 <= 20 THEN 1 ELSE 0 END) AS rz20_carries,
-           SUM(CASE WHEN yardline_100 <= 10 THEN 1 ELSE 0 END) AS rz10_carries,
-           SUM(CASE WHEN yardline_100 <=  5 THEN 1 ELSE 0 END) AS rz5_carries,
-           SUM(CASE WHEN down IN (3,4) THEN 1 ELSE 0 END) AS third_fourth_down_carries
-    FROM read_parquet('data/silver/pbp/year=*/**/*.parquet', union_by_name=true)
-    WHERE year = (SELECT season FROM params)
-      AND season_type = (SELECT season_type FROM params)
-      AND rush = 1
-    GROUP BY year, week, season_type, posteam, rusher_player_id
+    SELECT *
+    FROM gold_player_week_events_for_season
+    WHERE season = $season AND season_type = $season_type
   ), rec_ev AS (
-    WITH plays AS (
-      SELECT year AS season, week, season_type, posteam AS team,
-             receiver_player_id AS player_id,
-             half_seconds_remaining,
-             CASE WHEN pass=1 AND receiver_player_id IS NOT NULL THEN 1 ELSE 0 END AS is_target
-      FROM read_parquet('data/silver/pbp/year=*/**/*.parquet', union_by_name=true)
-      WHERE year = (SELECT season FROM params) AND season_type = (SELECT season_type FROM params)
-    )
-    SELECT season, week, season_type, team, player_id,
-           SUM(is_target) AS targets,
-           SUM(CASE WHEN half_seconds_remaining <= 120 AND is_target=1 THEN 1 ELSE 0 END) AS two_minute_targets
-    FROM plays
-    GROUP BY season, week, season_type, team, player_id
+    SELECT *
+    FROM gold_player_week_events_for_season
+    WHERE season = $season AND season_type = $season_type
   ), ctx AS (
-    SELECT year AS season, week, season_type, posteam AS team,
-           SUM(CASE WHEN pass_attempt=1 AND sack=0 THEN 1 ELSE 0 END) AS team_pass_attempts,
-           SUM(CASE WHEN rush_attempt=1 THEN 1 ELSE 0 END) AS team_carries
-    FROM read_parquet('data/silver/pbp/year=*/**/*.parquet', union_by_name=true)
-    WHERE year = (SELECT season FROM params)
-      AND season_type = (SELECT season_type FROM params)
-    GROUP BY year, week, season_type, posteam
+    SELECT *
+    FROM gold_team_week_context_for_season
+    WHERE season = $season AND season_type = $season_type
   ), team_style AS (
-    WITH base AS (
-      SELECT year AS season, week, season_type, posteam AS team,
-             pass::INT AS is_pass, xpass,
-             half_seconds_remaining
-      FROM read_parquet('data/silver/pbp/year=*/**/*.parquet', union_by_name=true)
-      WHERE year=(SELECT season FROM params) AND season_type=(SELECT season_type FROM params)
-        AND qb_dropback = 1 AND half_seconds_remaining > 120
-    )
-    SELECT season, week, season_type, team,
-           AVG(is_pass) - AVG(xpass) AS proe_neutral,
-           30.0 / NULLIF(COUNT(*),0) * 60.0 AS sec_per_play_neutral
-    FROM base
-    GROUP BY season, week, season_type, team
+    -- RB reports keep their original pace estimate (30s per neutral dropback)
+    SELECT season, week, season_type, team, proe_neutral,
+           30.0 / NULLIF(neutral_dropbacks,0) * 60.0 AS sec_per_play_neutral
+    FROM gold_team_week_context_for_season
+    WHERE season = $season AND season_type = $season_type
   )
   SELECT
     w.season,
@@ -1,14 +1,12 @@
 -- reports/materialize_player_week_utilization_receiving.sql
 -- Receiving-focused weekly utilization per player
+-- Params: $season, $season_type (bound by src/reports/runner.py); reads silver_weekly_for_season and the season-scoped gold_team_week_context/gold_player_week_events intermediates
 
 COPY (
-  WITH params AS (
-    SELECT 2025 AS season,
-           'REG' AS season_type
-  ), w_raw AS (
+  WITH w_raw AS (
     SELECT *
-    FROM read_parquet('data/silver/weekly/season=*/**/*.parquet', union_by_name=true)
-    WHERE season = (SELECT season FROM params) AND season_type = (SELECT season_type FROM params)
+    FROM silver_weekly_for_season
+    WHERE season = $season AND season_type = $season_type
   ), w AS (
     SELECT * EXCLUDE (rn)
     FROM (
@@ -20,59 +18,13 @@ COPY (
     )
     WHERE rn = 1
   ), rec_ev AS (
-    WITH plays AS (
-      SELECT year AS season, week, season_type, posteam AS team,
-             receiver_player_id AS player_id,
-             air_yards, yardline_100,
-             down, ydstogo,
-             half_seconds_remaining,
-             offense_personnel,
-             shotgun::INT AS is_shotgun,
-             no_huddle::INT AS is_no_huddle,
-             CASE WHEN pass=1 AND receiver_player_id IS NOT NULL THEN 1 ELSE 0 END AS is_target,
-             CASE WHEN pass=1 AND receiver_player_id IS NOT NULL AND air_yards IS NOT NULL THEN 1 ELSE 0 END AS is_air_tgt
-      FROM read_parquet('data/silver/pbp/year=*/**/*.parquet', union_by_name=true)
-      WHERE year = (SELECT season FROM params) AND season_type = (SELECT season_type FROM params)
-    )
-    SELECT season, week, season_type, team, player_id,
-           SUM(is_target) AS targets,
-           SUM(CASE WHEN air_yards IS NOT NULL AND yardline_100 - air_yards <= 0 THEN 1 ELSE 0 END) AS end_zone_targets,
-           SUM(CASE WHEN yardline_100 <= 20 AND is_target=1 THEN 1 ELSE 0 END) AS rz20_targets,
-           SUM(CASE WHEN yardline_100 <= 10 AND is_target=1 THEN 1 ELSE 0 END) AS rz10_targets,
-           SUM(CASE WHEN yardline_100 <=  5 AND is_target=1 THEN 1 ELSE 0 END) AS rz5_targets,
-           SUM(CASE WHEN down IN (3,4) AND is_target=1 THEN 1 ELSE 0 END) AS third_fourth_down_targets,
-           SUM(CASE WHEN down IN (3,4) AND ydstogo >= 5 AND is_target=1 THEN 1 ELSE 0 END) AS ldd_targets,
-           SUM(CASE WHEN down IN (1,2,3,4) AND ydstogo <= 2 AND is_target=1 THEN 1 ELSE 0 END) AS sdd_targets,
-           SUM(CASE WHEN half_seconds_remaining <= 120 AND is_target=1 THEN 1 ELSE 0 END) AS two_minute_targets,
-           SUM(CASE WHEN half_seconds_remaining <= 240 AND is_target=1 THEN 1 ELSE 0 END) AS four_minute_targets,
-           SUM(CASE WHEN is_shotgun=1 AND is_target=1 THEN 1 ELSE 0 END) AS shotgun_targets,
-           SUM(CASE WHEN is_no_huddle=1 AND is_target=1 THEN 1 ELSE 0 END) AS no_huddle_targets,
-           SUM(CASE WHEN offense_personnel = '11' AND is_target=1 THEN 1 ELSE 0 END) AS p11_targets,
-           SUM(CASE WHEN offense_personnel = '12' AND is_target=1 THEN 1 ELSE 0 END) AS p12_targets,
-           SUM(CASE WHEN offense_personnel = '21' AND is_target=1 THEN 1 ELSE 0 END) AS p21_targets,
-           SUM(CASE WHEN is_air_tgt=1 THEN air_yards ELSE 0 END) AS sum_air_yards,
-           SUM(CASE WHEN is_air_tgt=1 THEN 1 ELSE 0 END) AS cnt_air_targets
-    FROM plays
-    GROUP BY season, week, season_type, team, player_id
+    SELECT *
+    FROM gold_player_week_events_for_season
+    WHERE season = $season AND season_type = $season_type
   ), rec_team AS (
-    WITH plays AS (
-      SELECT year AS season, week, season_type, posteam AS team,
-             offense_personnel,
-             shotgun::INT AS is_shotgun,
-             no_huddle::INT AS is_no_huddle,
-             CASE WHEN pass=1 AND receiver_player_id IS NOT NULL THEN 1 ELSE 0 END AS is_target
-      FROM read_parquet('data/silver/pbp/year=*/**/*.parquet', union_by_name=true)
-      WHERE year = (SELECT season FROM params) AND season_type = (SELECT season_type FROM params)
-    )
-    SELECT season, week, season_type, team,
-           SUM(is_target) AS team_targets,
-           SUM(CASE WHEN is_shotgun=1 THEN is_target ELSE 0 END) AS team_targets_shotgun,
-           SUM(CASE WHEN is_no_huddle=1 THEN is_target ELSE 0 END) AS team_targets_no_huddle,
-           SUM(CASE WHEN offense_personnel='11' THEN is_target ELSE 0 END) AS team_targets_p11,
-           SUM(CASE WHEN offense_personnel='12' THEN is_target ELSE 0 END) AS team_targets_p12,
-           SUM(CASE WHEN offense_personnel='21' THEN is_target ELSE 0 END) AS team_targets_p21
-    FROM plays
-    GROUP BY season, week, season_type, team
+    SELECT *
+    FROM gold_team_week_context_for_season
+    WHERE season = $season AND season_type = $season_type
   )
   SELECT
     w.season,
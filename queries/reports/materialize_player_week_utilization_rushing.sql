@@ -1,14 +1,12 @@
 -- reports/materialize_player_week_utilization_rushing.sql
 -- Rushing-focused weekly utilization per player
+-- Params: $season, $season_type (bound by src/reports/runner.py); reads silver_weekly_for_season and the season-scoped gold_team_week_context/gold_player_week_events intermediates
 
 COPY (
-  WITH params AS (
-    SELECT 2025 AS season,
-           'REG' AS season_type
-  ), w_raw AS (
+  WITH w_raw AS (
     SELECT *
-    FROM read_parquet('data/silver/weekly/season=*/**/*.parquet', union_by_name=true)
-    WHERE season = (SELECT season FROM params) AND season_type = (SELECT season_type FROM params)
+    FROM silver_weekly_for_season
+    WHERE season = $season AND season_type = $season_type
   ), w AS (
     SELECT * EXCLUDE (rn)
     FROM (
@@ -20,26 +18,13 @@ COPY (
     )
     WHERE rn = 1
   ), rush_ev AS (
-    SELECT year AS season, week, season_type, posteam AS team,
-           rusher_player_id AS player_id,
-           COUNT(*) AS carries,
-           SUM(CASE WHEN yardline_100 <= 20 THEN 1 ELSE 0 END) AS rz20_carries,
-           SUM(CASE WHEN yardline_100 <= 10 THEN 1 ELSE 0 END) AS rz10_carries,
-           SUM(CASE WHEN yardline_100 <=  5 THEN 1 ELSE 0 END) AS rz5_carries
-    FROM read_parquet('data/silver/pbp/year=*/**/*.parquet', union_by_name=true)
-    WHERE year = (SELECT season FROM params)
-      AND season_type = (SELECT season_type FROM params)
-      AND rush = 1
-    GROUP BY year, week, season_type, posteam, rusher_player_id
+    SELECT *
+    FROM gold_player_week_events_for_season
+    WHERE season = $season AND season_type = $season_type
   ), ctx AS (
-    SELECT year AS season, week, season_type, posteam AS team,
-           SUM(CASE WHEN rush_attempt=1 THEN 1 ELSE 0 END) AS team_carries,
-           SUM(CASE WHEN rush_attempt=1 AND yardline_100 <= 20 THEN 1 ELSE 0 END) AS team_rz20_carries,
-           SUM(CASE WHEN rush_attempt=1 AND yardline_100 <= 10 THEN 1 ELSE 0 END) AS team_rz10_carries,
-           SUM(CASE WHEN rush_attempt=1 AND yardline_100 <=  5 THEN 1 ELSE 0 END) AS team_rz5_carries
-    FROM read_parquet('data/silver/pbp/year=*/**/*.parquet', union_by_name=true)
-    WHERE year = (SELECT season FROM params) AND season_type = (SELECT season_type FROM params)
-    GROUP BY year, week, season_type, posteam
+    SELECT *
+    FROM gold_team_week_context_for_season
+    WHERE season = $season AND season_type = $season_type
   )
   SELECT
     w.season,
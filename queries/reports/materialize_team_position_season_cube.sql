@@ -0,0 +1,37 @@
+-- reports/materialize_team_position_season_cube.sql
+-- Season rollup of the team-position week cube at (season, season_type, team, position) grain
+-- Output: data/gold/cubes/team_position_season (partitioned by season)
+-- Params: $season, $season_type (bound by src/reports/runner.py); reads gold_team_position_week_for_season
+--
+-- Player-week measures are summed as is. n_team_weeks and sumsq_week_fantasy_points_ppr describe the
+-- team-week totals themselves (e.g. points a position scored per game), so their spread is available
+-- without going back to the week cube.
+
+COPY (
+  SELECT
+    season, season_type, team, position,
+    COUNT(*) AS n_team_weeks,
+    SUM(n_player_weeks) AS n_player_weeks,
+    SUM(sum_fantasy_points_ppr) AS sum_fantasy_points_ppr,
+    SUM(sumsq_fantasy_points_ppr) AS sumsq_fantasy_points_ppr,
+    SUM(sum_fantasy_points_ppr * sum_fantasy_points_ppr) AS sumsq_week_fantasy_points_ppr,
+    SUM(sum_targets) AS sum_targets,
+    SUM(sumsq_targets) AS sumsq_targets,
+    SUM(sum_receptions) AS sum_receptions,
+    SUM(sumsq_receptions) AS sumsq_receptions,
+    SUM(sum_receiving_yards) AS sum_receiving_yards,
+    SUM(sumsq_receiving_yards) AS sumsq_receiving_yards,
+    SUM(sum_receiving_air_yards) AS sum_receiving_air_yards,
+    SUM(sumsq_receiving_air_yards) AS sumsq_receiving_air_yards,
+    SUM(sum_carries) AS sum_carries,
+    SUM(sumsq_carries) AS sumsq_carries,
+    SUM(sum_rushing_yards) AS sum_rushing_yards,
+    SUM(sumsq_rushing_yards) AS sumsq_rushing_yards,
+    SUM(sum_passing_yards) AS sum_passing_yards,
+    SUM(sumsq_passing_yards) AS sumsq_passing_yards
+  FROM gold_team_position_week_for_season
+  WHERE season = $season
+    AND season_type = $season_type
+  GROUP BY season, season_type, team, position
+) TO 'data/gold/cubes/team_position_season'
+WITH (FORMAT PARQUET, PARTITION_BY (season), OVERWRITE_OR_IGNORE 1);
@@ -0,0 +1,61 @@
+-- reports/materialize_team_position_week_cube.sql
+-- Rollup cube of player-weeks at (season, week, season_type, team, position) grain for the dashboard pages
+-- Output: data/gold/cubes/team_position_week (partitioned by season, week)
+-- Params: $season, $season_type (bound by src/reports/runner.py); reads the season-scoped silver_weekly_for_season view
+--
+-- Measures are additive so any filter is answered by summing cube rows: n_player_weeks, sum_<m> and
+-- sumsq_<m> per player-week, giving mean = sum / n and population std = sqrt(sumsq / n - mean^2).
+-- opponent_team is fixed by (season, week, team), so it rides along without changing the grain and
+-- defense-vs-position views roll up on it.
+
+COPY (
+  WITH weekly_norm AS (
+    -- One row per player-week-team, as in player_week_stats
+    SELECT
+      w.season, w.week, w.season_type,
+      UPPER(w.team) AS team,
+      UPPER(w.opponent_team) AS opponent_team,
+      UPPER(w.position) AS position,
+      COALESCE(w.fantasy_points_ppr, 0.0) AS fantasy_points_ppr,
+      COALESCE(w.targets, 0) AS targets,
+      COALESCE(w.receptions, 0) AS receptions,
+      COALESCE(w.receiving_yards, 0) AS receiving_yards,
+      COALESCE(w.receiving_air_yards, 0) AS receiving_air_yards,
+      COALESCE(w.carries, 0) AS carries,
+      COALESCE(w.rushing_yards, 0) AS rushing_yards,
+      COALESCE(w.passing_yards, 0) AS passing_yards,
+      ROW_NUMBER() OVER (
+        PARTITION BY w.season, w.week, w.season_type, w.team, w.player_id
+        ORDER BY w.source NULLS LAST
+      ) AS rn
+    FROM silver_weekly_for_season w
+    WHERE w.season = $season
+      AND w.season_type = $season_type
+      AND w.team IS NOT NULL
+      AND w.position IS NOT NULL
+  )
+  SELECT
+    season, week, season_type, team, position,
+    ANY_VALUE(opponent_team) AS opponent_team,
+    COUNT(*) AS n_player_weeks,
+    SUM(fantasy_points_ppr) AS sum_fantasy_points_ppr,
+    SUM(fantasy_points_ppr * fantasy_points_ppr) AS sumsq_fantasy_points_ppr,
+    SUM(targets) AS sum_targets,
+    SUM(targets * targets) AS sumsq_targets,
+    SUM(receptions) AS sum_receptions,
+    SUM(receptions * receptions) AS sumsq_receptions,
+    SUM(receiving_yards) AS sum_receiving_yards,
+    SUM(receiving_yards * receiving_yards) AS sumsq_receiving_yards,
+    SUM(receiving_air_yards) AS sum_receiving_air_yards,
+    SUM(receiving_air_yards * receiving_air_yards) AS sumsq_receiving_air_yards,
+    SUM(carries) AS sum_carries,
+    SUM(carries * carries) AS sumsq_carries,
+    SUM(rushing_yards) AS sum_rushing_yards,
+    SUM(rushing_yards * rushing_yards) AS sumsq_rushing_yards,
+    SUM(passing_yards) AS sum_passing_yards,
+    SUM(passing_yards * passing_yards) AS sumsq_passing_yards
+  FROM weekly_norm
+  WHERE rn = 1
+  GROUP BY season, week, season_type, team, position
+) TO 'data/gold/cubes/team_position_week'
+WITH (FORMAT PARQUET, PARTITION_BY (season, week), OVERWRITE_OR_IGNORE 1);
@@ -0,0 +1,77 @@
+-- reports/materialize_team_week_context.sql
+-- Team-week denominators and play-style context shared by the utilization reports
+-- Params: $season, $season_type (bound by src/reports/runner.py); reads the season-scoped silver_*_for_season views
+-- pbp is scanned once; every team-level CTE reads the materialized ``plays`` projection.
+
+COPY (
+  WITH plays AS MATERIALIZED (
+    SELECT year AS season, week, season_type, posteam AS team,
+           game_id, drive,
+           pass, pass_attempt, sack, rush_attempt, qb_dropback, xpass,
+           yardline_100, air_yards,
+           half_seconds_remaining,
+           offense_personnel,
+           shotgun::INT AS is_shotgun,
+           no_huddle::INT AS is_no_huddle,
+           drive_play_count, drive_time_of_possession,
+           CASE WHEN pass=1 AND receiver_player_id IS NOT NULL THEN 1 ELSE 0 END AS is_target
+    FROM silver_pbp_for_season
+    WHERE year = $season AND season_type = $season_type
+  ), team AS (
+    SELECT season, week, season_type, team,
+           -- target denominators
+           SUM(is_target) AS team_targets,
+           SUM(CASE WHEN is_shotgun=1 THEN is_target ELSE 0 END) AS team_targets_shotgun,
+           SUM(CASE WHEN is_no_huddle=1 THEN is_target ELSE 0 END) AS team_targets_no_huddle,
+           SUM(CASE WHEN offense_personnel='11' THEN is_target ELSE 0 END) AS team_targets_p11,
+           SUM(CASE WHEN offense_personnel='12' THEN is_target ELSE 0 END) AS team_targets_p12,
+           SUM(CASE WHEN offense_personnel='21' THEN is_target ELSE 0 END) AS team_targets_p21,
+           SUM(CASE WHEN yardline_100 <= 20 AND is_target=1 THEN 1 ELSE 0 END) AS team_targets_rz20,
+           SUM(CASE WHEN yardline_100 <= 10 AND is_target=1 THEN 1 ELSE 0 END) AS team_targets_rz10,
+           SUM(CASE WHEN yardline_100 <=  5 AND is_target=1 THEN 1 ELSE 0 END) AS team_targets_rz5,
+           SUM(CASE WHEN air_yards IS NOT NULL AND yardline_100 - air_yards <= 0 THEN 1 ELSE 0 END) AS team_end_zone_targets,
+           -- passing/rushing volume
+           SUM(CASE WHEN qb_dropback=1 THEN 1 ELSE 0 END) AS team_dropbacks,
+           SUM(CASE WHEN pass_attempt=1 AND sack=0 THEN 1 ELSE 0 END) AS team_pass_attempts,
+           SUM(CASE WHEN pass=1 AND yardline_100 <= 20 THEN 1 ELSE 0 END) AS team_rz20_pass_attempts,
+           SUM(CASE WHEN pass=1 AND yardline_100 <= 10 THEN 1 ELSE 0 END) AS team_rz10_pass_attempts,
+           SUM(CASE WHEN pass=1 AND yardline_100 <=  5 THEN 1 ELSE 0 END) AS team_rz5_pass_attempts,
+           SUM(CASE WHEN rush_attempt=1 THEN 1 ELSE 0 END) AS team_carries,
+           SUM(CASE WHEN rush_attempt=1 AND yardline_100 <= 20 THEN 1 ELSE 0 END) AS team_rz20_carries,
+           SUM(CASE WHEN rush_attempt=1 AND yardline_100 <= 10 THEN 1 ELSE 0 END) AS team_rz10_carries,
+           SUM(CASE WHEN rush_attempt=1 AND yardline_100 <=  5 THEN 1 ELSE 0 END) AS team_rz5_carries
+    FROM plays
+    GROUP BY season, week, season_type, team
+  ), neutral AS (
+    SELECT season, week, season_type, team, game_id, drive,
+           pass::INT AS is_pass, xpass
+    FROM plays
+    WHERE qb_dropback = 1 AND half_seconds_remaining > 120
+  ), drive_info AS (
+    SELECT season, week, season_type, team, game_id, drive,
+           MAX(drive_play_count) AS drive_play_count,
+           -- drive_time_of_possession is formatted 'MM:SS'; parse to seconds
+           MAX(CASE WHEN drive_time_of_possession IS NOT NULL THEN (
+             CAST(SPLIT_PART(drive_time_of_possession, ':', 1) AS DOUBLE) * 60 +
+             CAST(SPLIT_PART(drive_time_of_possession, ':', 2) AS DOUBLE)
+           ) END) AS drive_time_seconds
+    FROM plays
+    GROUP BY season, week, season_type, team, game_id, drive
+  ), style AS (
+    -- One row per neutral dropback, so drive pace is weighted by neutral plays in the drive
+    SELECT n.season, n.week, n.season_type, n.team,
+           AVG(n.is_pass) - AVG(n.xpass) AS proe_neutral,
+           AVG(CASE WHEN di.drive_play_count > 0 AND di.drive_time_seconds IS NOT NULL THEN di.drive_time_seconds::DOUBLE / NULLIF(di.drive_play_count,0) END) AS sec_per_play_neutral,
+           COUNT(*) AS neutral_dropbacks
+    FROM neutral n
+    LEFT JOIN drive_info di ON di.season=n.season AND di.week=n.week AND di.season_type=n.season_type AND di.team=n.team AND di.game_id=n.game_id AND di.drive=n.drive
+    GROUP BY n.season, n.week, n.season_type, n.team
+  )
+  SELECT t.*,
+         s.proe_neutral,
+         s.sec_per_play_neutral,
+         s.neutral_dropbacks
+  FROM team t
+  LEFT JOIN style s ON s.season=t.season AND s.week=t.week AND s.season_type=t.season_type AND s.team=t.team
+) TO 'data/gold/team_week_context'
+WITH (FORMAT PARQUET, PARTITION_BY (season, week), OVERWRITE_OR_IGNORE 1);
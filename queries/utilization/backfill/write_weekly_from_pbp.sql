@@ -1,27 +1,25 @@
 -- queries/utilization/backfill/write_weekly_from_pbp.sql
 -- Minimal weekly backfill derived from PBP (receiving-oriented). Shares/WOPR left NULL.
+-- Params: $season, $season_type (bound by src/reports/runner.py); reads the season-scoped silver_*_for_season views
 COPY (
-  WITH params AS (
-    SELECT CAST(2025 AS INTEGER) AS season,
-           CAST('REG' AS VARCHAR) AS season_type
-  ), rec AS (
+  WITH rec AS (
     SELECT year AS season, week, season_type,
            posteam AS team,
            receiver_player_id AS player_id,
            COUNT(*) AS targets,
            SUM(COALESCE(receiving_yards, CASE WHEN pass=1 THEN yards_gained END)) AS receiving_yards,
            SUM(COALESCE(air_yards, 0)) AS receiving_air_yards
-    FROM read_parquet('data/silver/pbp/year=*/**/*.parquet', union_by_name=true)
-    WHERE year = (SELECT season FROM params)
-      AND season_type = (SELECT season_type FROM params)
+    FROM silver_pbp_for_season
+    WHERE year = $season
+      AND season_type = $season_type
       AND pass = 1 AND receiver_player_id IS NOT NULL
     GROUP BY year, week, season_type, posteam, receiver_player_id
   ), rost AS (
     SELECT season, week, team, player_id,
            COALESCE(player_name, football_name, first_name || ' ' || last_name) AS player_name,
            position
-    FROM read_parquet('data/silver/rosters/season=*/**/*.parquet', union_by_name=true)
-    WHERE season = (SELECT season FROM params)
+    FROM silver_rosters_for_season
+    WHERE season = $season
   )
   SELECT r.season, r.week, r.season_type, r.team, r.player_id,
          ro.player_name, ro.position,
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""Lineup optimizer benchmark: diversified lineups per second on synthetic slates.
+
+Builds a Classic main slate and a Showdown slate with DraftKings-like salaries and projections
+that grow with salary, generates ``--lineups`` lineups for each, and fails when a slate takes
+longer than its budget (60s by default; scale it with ``--scale`` on slow CI machines).
+
+    python scripts/bench_lineups.py [classic showdown] [--lineups 3000] [--scale 1.5]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.lineups import Slate, load_contest, optimize  # noqa: E402
+
+# Players per position and salary range (in steps of ``step``) of a typical slate
+SLATES: Dict[str, Dict[str, object]] = {
+    "classic": {"positions": {"QB": 32, "RB": 70, "WR": 110, "TE": 50, "DST": 28}, "salaries": (30, 90), "step": 100},
+    "showdown": {"positions": {"QB": 4, "RB": 10, "WR": 18, "TE": 8, "K": 2, "DST": 2}, "salaries": (1, 60), "step": 200},
+}
+BUDGET_S = 60.0
+
+
+def synthetic_slate(name: str, seed: int = 0) -> Slate:
+    spec = SLATES[name]
+    rng = np.random.default_rng(seed)
+    positions = [p for p, count in spec["positions"].items() for _ in range(count)]  # type: ignore[union-attr]
+    low, high = spec["salaries"]  # type: ignore[misc]
+    salaries = rng.integers(low, high + 1, len(positions)) * spec["step"]
+    projections = np.maximum(0.0, salaries / 400 + rng.normal(0.0, 3.0, len(positions)))
+    return Slate(
+        player_ids=tuple(f"{name}-{i}" for i in range(len(positions))),
+        positions=tuple(positions),
+        salaries=salaries,
+        projections=projections,
+        spread=np.maximum(1.0, projections / 2),
+    )
+
+
+def run(names: Sequence[str], lineups: int, scale: float) -> List[str]:
+    """Time each slate; returns the budget violations."""
+    failures: List[str] = []
+    for name in names:
+        slate = synthetic_slate(name)
+        started = time.perf_counter()
+        made = optimize(slate, load_contest(name), lineups, randomness=1.0, min_unique=2, max_exposure=0.6)
+        seconds = time.perf_counter() - started
+        budget = BUDGET_S * scale
+        short = len(made) < lineups
+        status = "FAIL" if seconds > budget or short else "ok"
+        print(f"{name:<10} {len(made):6d} lineups {seconds:7.1f}s / {budget:.0f}s  {len(made) / seconds:7.1f}/s  {status}")
+        if seconds > budget:
+            failures.append(f"{name}: {seconds:.1f}s exceeds {budget:.0f}s budget")
+        if short:
+            failures.append(f"{name}: only {len(made)} of {lineups} lineups")
+    return failures
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("slates", nargs="*", help=f"Slates to run: {', '.join(SLATES)} (default: all)")
+    parser.add_argument("--lineups", type=int, default=3000, help="Lineups per slate")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply the time budget")
+    opts = parser.parse_args(argv)
+    unknown = sorted(set(opts.slates) - set(SLATES))
+    if unknown:
+        parser.error(f"unknown slate(s): {', '.join(unknown)}")
+    failures = run(opts.slates or list(SLATES), opts.lineups, opts.scale)
+    for failure in failures:
+        print(f"budget violation: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""CLI start-up benchmark: import time and imported modules per command.
+
+Runs ``python -X importtime -m src.cli <command>`` in a scratch directory (copy of the catalog,
+empty lake and run log) and fails when a command exceeds its import-time budget or imports a
+module it has no use for, e.g. ``--help`` pulling in pandas. Budgets are roughly 1.6x a laptop
+measurement; scale them with ``--scale`` on slow CI machines, or check modules only with
+``--no-timing``.
+
+    python scripts/bench_startup.py [help lineage-runs ...] [--repeat 3] [--scale 1.5] [--no-timing]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Sequence, Set, Tuple
+
+
+REPO = Path(__file__).resolve().parents[1]
+
+_DATA_STACK = ("pandas", "polars", "pyarrow", "numpy", "pandera", "duckdb", "nfl_data_py")
+
+
+class Case(NamedTuple):
+    args: Tuple[str, ...]
+    budget_ms: float
+    forbidden: Tuple[str, ...]
+
+
+CASES: Dict[str, Case] = {
+    "help": Case(("--help",), 450, _DATA_STACK + ("pydantic", "yaml", "structlog")),
+    "lineage-runs": Case(("lineage-runs", "--limit", "1"), 500, _DATA_STACK + ("pydantic", "yaml")),
+    "stats": Case(("stats",), 500, _DATA_STACK + ("pydantic", "yaml")),
+    # promote needs pandas/polars for the merge itself, but never pandera when not validating
+    "promote": Case(("promote", "--no-validate", "--datasets", "_none_"), 2000, ("pandera", "duckdb", "nfl_data_py")),
+    "profile": Case(("profile", "--datasets", "_none_"), 1200, ("pandas", "pandera", "duckdb", "nfl_data_py")),
+}
+
+
+def _scratch_dir() -> Path:
+    work = Path(tempfile.mkdtemp(prefix="bench_startup_"))
+    (work / "catalog").mkdir()
+    shutil.copy(REPO / "catalog" / "datasets.yml", work / "catalog" / "datasets.yml")
+    for layer in ("bronze", "silver"):
+        (work / "data" / layer).mkdir(parents=True)
+    # An empty run log so ``stats`` has a run to summarize
+    (work / "logs").mkdir()
+    (work / "logs" / "run_bench.jsonl").touch()
+    return work
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Set[str]]:
+    """Total import time in ms (sum of top-level cumulative times) and the top-level packages."""
+    total_us = 0
+    packages: Set[str] = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        packages.add(name.strip().split(".", 1)[0])
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us / 1000, packages
+
+
+def measure(args: Sequence[str], cwd: Path) -> Tuple[float, Set[str]]:
+    env = dict(os.environ, PYTHONPATH=str(REPO), LAKE_ROOT=str(cwd / "data"), PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "src.cli", *args],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"src.cli {' '.join(args)} exited {proc.returncode}: {proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+
+def run(names: Sequence[str], repeat: int, scale: float, timing: bool) -> List[str]:
+    """Measure each command; returns the budget violations."""
+    work = _scratch_dir()
+    failures: List[str] = []
+    try:
+        for name in names:
+            case = CASES[name]
+            samples = [measure(case.args, work) for _ in range(repeat if timing else 1)]
+            ms = statistics.median(s[0] for s in samples)
+            imported = set().union(*(s[1] for s in samples))
+            leaked = sorted(set(case.forbidden) & imported)
+            budget = case.budget_ms * scale
+            over = timing and ms > budget
+            status = "FAIL" if leaked or over else "ok"
+            timing_col = f"{ms:8.0f}ms / {budget:.0f}ms" if timing else "-"
+            print(f"{name:<14} {timing_col:>20}  {status}{'  imports ' + ','.join(leaked) if leaked else ''}")
+            if leaked:
+                failures.append(f"{name}: imports {', '.join(leaked)}")
+            if over:
+                failures.append(f"{name}: {ms:.0f}ms import time exceeds {budget:.0f}ms budget")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return failures
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("commands", nargs="*", help=f"Commands to check: {', '.join(CASES)} (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per command; the median is reported")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every time budget")
+    parser.add_argument("--no-timing", action="store_true", help="Only check which modules are imported")
+    opts = parser.parse_args(argv)
+    unknown = sorted(set(opts.commands) - set(CASES))
+    if unknown:
+        parser.error(f"unknown command(s): {', '.join(unknown)}")
+    failures = run(opts.commands or list(CASES), opts.repeat, opts.scale, not opts.no_timing)
+    for failure in failures:
+        print(f"budget violation: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
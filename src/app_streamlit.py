@@ -10,6 +10,12 @@ import pandas as pd
 import streamlit as st
 import altair as alt
 
+try:
+    from .scoring import register_macros, score
+    from .sql_runner import SqlRunner
+except ImportError:  # run as a script: streamlit run src/app_streamlit.py
+    from scoring import register_macros, score
+    from sql_runner import SqlRunner
 
 QUERIES_DIR = Path("queries")
 RESEARCH_DIR = Path("research")
@@ -21,23 +27,29 @@ def list_sql_files() -> List[Path]:
     return sorted([p for p in QUERIES_DIR.glob("**/*.sql")])
 
 
-def run_sql(path: Path, params: dict[str, str] | None = None) -> pl.DataFrame:
-    sql = path.read_text()
-    # Simple parameter substitution for :name placeholders
-    params = params or {}
-    for k, v in params.items():
-        # If value looks numeric, keep as-is; else quote
-        if re.fullmatch(r"-?\d+(\.\d+)?", str(v)):
-            repl = str(v)
-        else:
-            repl = f"'{v}'"
-        sql = re.sub(fr"\:{re.escape(k)}\b", repl, sql)
+@st.cache_resource(show_spinner=False)
+def sql_runner() -> SqlRunner:
+    # One connection per app process; each query file is parsed once and re-run with bound values
     con = duckdb.connect()
-    try:
-        tbl = con.sql(sql).pl()
-        return tbl
-    finally:
-        con.close()
+    register_macros(con)
+    return SqlRunner(con)
+
+
+def _param_value(value: str) -> object:
+    # Numeric-looking inputs bind as numbers (e.g. LIMIT :limit); everything else as text
+    if re.fullmatch(r"-?\d+", value):
+        return int(value)
+    if re.fullmatch(r"-?\d+\.\d+", value):
+        return float(value)
+    return value
+
+
+def run_sql(path: Path, params: dict[str, str] | None = None) -> pl.DataFrame:
+    runner = sql_runner()
+    query = runner.load(path)
+    # Placeholders left empty bind as NULL so queries can COALESCE to their defaults
+    values = {name: _param_value(str((params or {})[name])) if name in (params or {}) else None for name in query.params}
+    return runner.execute(query, values).pl()
 
 
 def choose_chart(df: pl.DataFrame) -> str:
@@ -102,14 +114,19 @@ def render_chart(df: pl.DataFrame, default_chart: Optional[str] = None) -> None:
 
 
 @st.cache_data(show_spinner=False)
+def _read_research(path: str, mtime_ns: int) -> pl.DataFrame:
+    # Cached per file version: a table rewritten by the macro report is read again on the next rerun
+    return pl.read_parquet(path) if path.endswith(".parquet") else pl.read_csv(path)
+
+
 def load_research(name: str) -> pl.DataFrame:
     """Load a research output by stem name (prefers Parquet)."""
-    pq = RESEARCH_DIR / f"{name}.parquet"
-    csv = RESEARCH_DIR / f"{name}.csv"
-    if pq.exists():
-        return pl.read_parquet(pq)
-    if csv.exists():
-        return pl.read_csv(csv)
+    for path in (RESEARCH_DIR / f"{name}.parquet", RESEARCH_DIR / f"{name}.csv"):
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            continue
+        return _read_research(str(path), mtime_ns)
     return pl.DataFrame()
 
 
@@ -931,8 +948,11 @@ def render_query_viewer() -> None:
         st.code(path.read_text(), language="sql")
 
     # Parameter inputs discovered from :param placeholders
-    sql_text = path.read_text()
-    params = sorted(set(re.findall(r"\:([A-Za-z_][A-Za-z0-9_]*)\b", sql_text)))
+    try:
+        params = sorted(sql_runner().load(path).params)
+    except Exception as exc:
+        st.error(f"Could not parse query: {exc}")
+        return
     param_values: dict[str, str] = {}
     if params:
         st.sidebar.markdown("### Parameters")
@@ -1085,26 +1105,13 @@ def render_workhorse_rb_report() -> None:
     mask = (pdf["season"] >= s_start) & (pdf["season"] <= s_end)
     pdf = pdf.loc[mask].copy()
 
-    # Compute DraftKings fantasy points columns (current and next season)
-    try:
-        pdf["dk_pts_cur"] = (
-            0.1 * pdf["rush_yds"].astype(float)
-            + 6.0 * pdf["rush_td"].astype(float)
-            + 1.0 * pdf["receptions"].astype(float)
-            + 0.1 * pdf["rec_yds"].astype(float)
-            + 6.0 * pdf["rec_td"].astype(float)
-        )
-        pdf["dk_pts_ny"] = (
-            0.1 * pdf["rush_yds_ny"].astype(float)
-            + 6.0 * pdf["rush_td_ny"].astype(float)
-            + 1.0 * pdf["receptions_ny"].astype(float)
-            + 0.1 * pdf["rec_yds_ny"].astype(float)
-            + 6.0 * pdf["rec_td_ny"].astype(float)
-        )
-    except Exception:
-        # If any column is missing, default zeros so the option still appears without crashing
-        pdf["dk_pts_cur"] = 0.0
-        pdf["dk_pts_ny"] = 0.0
+    # DraftKings points for the season totals; yardage bonuses are per game, so they are left out
+    stats = {"rushing_yards": "rush_yds", "rushing_tds": "rush_td", "receptions": "receptions",
+             "receiving_yards": "rec_yds", "receiving_tds": "rec_td"}
+    pdf["dk_pts_cur"] = score(pdf, "dk_classic", columns=stats, bonuses=False).to_numpy()
+    pdf["dk_pts_ny"] = score(
+        pdf, "dk_classic", columns={k: f"{v}_ny" for k, v in stats.items()}, bonuses=False
+    ).to_numpy()
 
     # Metric selector (includes DK fantasy points)
     metric_options = [
@@ -0,0 +1,274 @@
+# pyright: reportMissingImports=false, reportMissingModuleSource=false
+"""Monte Carlo Best Ball tournament simulator.
+
+The format comes from ``dk_bestball`` silver: weekly lineup slots and the tournament rounds
+(weeks 1-14, then one playoff round per week). Each player's week is drawn from that player's
+weekly DraftKings points in gold ``player_week_stats`` for a reference season, with the weeks
+they did not play counting as zero. Draws are independent across players and weeks.
+
+A simulated season is a ``(sims, weeks, players)`` array. Every roster's best-ball lineup is
+picked per week with vectorized sorts, and its weekly points are summed per round. The
+rosters given are one draft room: the top ``advance[0]`` after round 1 move on, then the top
+``advance[k]`` of the survivors each playoff week, and the best survivor of the last round wins.
+Batches run on a spawn process pool, each with its own seed spawned from ``seed``.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import json
+import multiprocessing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import polars as pl
+
+
+DEFAULT_ADVANCE = (6, 3, 2)
+
+
+@dataclass(frozen=True)
+class LineupSlot:
+    slot: str
+    count: int
+    eligible: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class BestBallFormat:
+    slots: Tuple[LineupSlot, ...]
+    rounds: Tuple[Tuple[int, ...], ...]
+
+    @property
+    def weeks(self) -> Tuple[int, ...]:
+        return tuple(sorted({w for weeks in self.rounds for w in weeks}))
+
+
+@dataclass(frozen=True)
+class PlayerScores:
+    """Weekly points of each player over a reference season, zero for weeks not played."""
+
+    player_ids: Tuple[str, ...]
+    positions: Tuple[str, ...]
+    weekly: np.ndarray  # (players, weeks)
+
+
+def load_format(root: str) -> BestBallFormat:
+    """Lineup slots and tournament rounds from ``dk_bestball`` silver."""
+    import duckdb
+
+    base = Path(root) / "silver" / "dk_bestball"
+    if not any(base.rglob("*.parquet")):
+        raise FileNotFoundError(f"{base}: no dk_bestball silver; run the update for dk_bestball first")
+    rows = duckdb.sql(
+        f"SELECT * FROM read_parquet('{base.as_posix()}/**/*.parquet', hive_partitioning = true, union_by_name = true) "
+        "WHERE section IN ('lineup', 'tournaments_rounds')"
+    ).pl()
+    lineup = rows.filter(rows["section"] == "lineup")
+    rounds = rows.filter(rows["section"] == "tournaments_rounds").sort("round")
+    slots = tuple(
+        LineupSlot(r["slot"], int(r["count"]), tuple(json.loads(r["eligible_positions"])))
+        for r in lineup.iter_rows(named=True)
+    )
+    return BestBallFormat(slots=slots, rounds=tuple(tuple(json.loads(w)) for w in rounds["weeks"]))
+
+
+def load_player_scores(
+    root: str,
+    season: int,
+    player_ids: Optional[Sequence[str]] = None,
+    points: str = "dk_ppr_points",
+    season_type: str = "REG",
+) -> PlayerScores:
+    """Weekly ``points`` per player from one season of gold ``player_week_stats``."""
+    import duckdb
+
+    base = Path(root) / "gold" / "reports" / "player_week_stats" / f"season={season}"
+    if not any(base.rglob("*.parquet")):
+        raise FileNotFoundError(f"{base}: no player_week_stats for season {season}")
+    params: Dict[str, object] = {"season_type": season_type}
+    only = ""
+    if player_ids is not None:
+        only = "AND list_contains($players, player_id)"
+        params["players"] = list(player_ids)
+    frame = duckdb.execute(
+        f"""
+        SELECT player_id, any_value(position) AS position, week, sum({points}) AS points
+        FROM read_parquet('{base.as_posix()}/*/*.parquet', hive_partitioning = true)
+        WHERE season_type = $season_type {only}
+        GROUP BY player_id, week
+        """,
+        params,
+    ).pl()
+    ids = tuple(sorted(set(frame["player_id"])))
+    missing = sorted(set(player_ids or ()) - set(ids))
+    if missing:
+        raise ValueError(f"no {season} {season_type} weeks for players {missing}")
+    weeks = sorted(set(frame["week"]))
+    weekly = np.zeros((len(ids), len(weeks)))
+    row = {p: i for i, p in enumerate(ids)}
+    col = {w: j for j, w in enumerate(weeks)}
+    cells = ([row[p] for p in frame["player_id"]], [col[w] for w in frame["week"]])
+    weekly[cells] = frame["points"].fill_null(0.0).to_numpy()
+    position = dict(zip(frame["player_id"], frame["position"]))
+    return PlayerScores(ids, tuple(position[p] for p in ids), weekly)
+
+
+def _lineup_points(draws: np.ndarray, positions: np.ndarray, slots: Sequence[LineupSlot]) -> np.ndarray:
+    """Best-ball lineup points per column of one roster's ``draws`` (players, sims * weeks).
+
+    Each position's players are sorted per column once. Slots are then filled narrowest first
+    from the best remaining players they accept: a wider slot (FLEX) draws from the merged
+    leftovers of the narrower ones, which is the optimal lineup as long as slot eligibilities
+    nest, as in every DraftKings format.
+    """
+    # Remaining players per eligibility group, sorted best first along axis 0
+    remaining: Dict[FrozenSet[str], np.ndarray] = {
+        frozenset([pos]): np.sort(draws[positions == pos], axis=0)[::-1] for pos in set(positions)
+    }
+    total = np.zeros(draws.shape[1])
+    for slot in sorted(slots, key=lambda s: len(s.eligible)):
+        accepted = frozenset(slot.eligible)
+        merged = [key for key in remaining if key <= accepted]
+        if any(key & accepted and key not in merged for key in remaining):
+            raise ValueError(f"lineup slot {slot.slot} overlaps a wider slot without containing it")
+        if not merged:
+            continue
+        pool = np.concatenate([remaining.pop(key) for key in merged])
+        if len(merged) > 1:
+            pool = np.sort(pool, axis=0)[::-1]
+        total += pool[: slot.count].sum(axis=0)
+        remaining[accepted] = pool[slot.count :]
+    return total
+
+
+def _simulate_batch(
+    weekly: np.ndarray,
+    positions: np.ndarray,
+    rosters: List[np.ndarray],
+    slots: Tuple[LineupSlot, ...],
+    rounds: List[np.ndarray],
+    advance: Tuple[int, ...],
+    n_sims: int,
+    seed: np.random.SeedSequence,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns how often each roster reached each round (and won), and its round-1 points sum."""
+    rng = np.random.default_rng(seed)
+    n_players, history = weekly.shape
+    n_weeks = max(int(w.max()) for w in rounds) + 1
+    # (players, sims * weeks): each lineup pass then works on long contiguous rows
+    cells = rng.integers(0, history, size=(n_players, n_sims * n_weeks), dtype=np.int32)
+    cells += (np.arange(n_players, dtype=np.int32) * history)[:, None]
+    draws = np.take(weekly.ravel(), cells)
+    # (sims, rosters, weeks)
+    week_points = np.stack(
+        [_lineup_points(draws[r], positions[r], slots).reshape(n_sims, n_weeks) for r in rosters], axis=1
+    )
+
+    n_rosters = len(rosters)
+    reached = np.zeros((n_rosters, len(rounds) + 1), dtype=np.int64)
+    alive = np.ones((n_sims, n_rosters), dtype=bool)
+    order = np.broadcast_to(np.arange(n_rosters), alive.shape)
+    for k, weeks in enumerate(rounds):
+        reached[:, k] += alive.sum(axis=0)
+        points = week_points[:, :, weeks]
+        # Round points, then the best single week, then roster (draft slot) order
+        total = np.where(alive, points.sum(axis=-1), -np.inf)
+        best_week = np.where(alive, points.max(axis=-1), -np.inf)
+        ranked = np.lexsort((order, -best_week, -total), axis=-1)
+        keep = advance[k] if k < len(advance) else 1
+        advancing = np.zeros_like(alive)
+        np.put_along_axis(advancing, ranked[:, :keep], True, axis=-1)
+        alive &= advancing
+    reached[:, -1] += alive.sum(axis=0)
+    return reached, week_points[:, :, rounds[0]].sum(axis=-1).sum(axis=0)
+
+
+def simulate(
+    scores: PlayerScores,
+    rosters: Mapping[str, Sequence[str]],
+    fmt: BestBallFormat,
+    n_sims: int = 20_000,
+    advance: Sequence[int] = DEFAULT_ADVANCE,
+    batch_size: int = 2_000,
+    max_workers: int = 1,
+    seed: int = 0,
+) -> "pl.DataFrame":
+    """Advance and win rates of each roster over ``n_sims`` simulated seasons.
+
+    Results depend only on ``seed`` and ``batch_size``, not on ``max_workers``.
+    """
+    import polars as pl
+
+    if len(advance) != len(fmt.rounds) - 1:
+        raise ValueError(f"advance needs one count per round before the last ({len(fmt.rounds) - 1})")
+    index = {p: i for i, p in enumerate(scores.player_ids)}
+    unknown = sorted({p for players in rosters.values() for p in players} - set(index))
+    if unknown:
+        raise ValueError(f"rostered players without weekly scores: {unknown}")
+    names = list(rosters)
+    members = [np.array([index[p] for p in rosters[name]], dtype=np.int64) for name in names]
+    weeks = {w: j for j, w in enumerate(fmt.weeks)}
+    round_weeks = [np.array([weeks[w] for w in r], dtype=np.int64) for r in fmt.rounds]
+    positions = np.array(scores.positions, dtype=object)
+    # Only rostered players are drawn
+    used = np.unique(np.concatenate(members))
+    remap = np.full(len(scores.player_ids), -1)
+    remap[used] = np.arange(len(used))
+    rosters_used = [remap[m] for m in members]
+    weekly, pos_used = scores.weekly[used].astype(np.float32), positions[used]
+
+    sizes = [batch_size] * (n_sims // batch_size) + ([n_sims % batch_size] if n_sims % batch_size else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [
+        (weekly, pos_used, rosters_used, fmt.slots, round_weeks, tuple(advance), size, s)
+        for size, s in zip(sizes, seeds)
+    ]
+    reached = np.zeros((len(names), len(fmt.rounds) + 1), dtype=np.int64)
+    round1 = np.zeros(len(names))
+    if max_workers <= 1 or len(jobs) <= 1:
+        results = [_simulate_batch(*job) for job in jobs]
+    else:
+        # spawn, as in profiling: forking after polars/duckdb started their thread pools can deadlock
+        ctx = multiprocessing.get_context("spawn")
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+            results = list(pool.map(_simulate_batch, *zip(*jobs)))
+    for batch_reached, batch_round1 in results:
+        reached += batch_reached
+        round1 += batch_round1
+
+    out: Dict[str, object] = {"roster": names, "mean_round1_points": round1 / n_sims}
+    out["advance_rate"] = reached[:, 1] / n_sims
+    for k in range(2, len(fmt.rounds)):
+        out[f"reach_round_{k + 1}"] = reached[:, k] / n_sims
+    out["win_rate"] = reached[:, -1] / n_sims
+    return pl.DataFrame(out).sort("win_rate", "advance_rate", descending=True)
+
+
+def read_rosters(path: str) -> Dict[str, List[str]]:
+    """``roster``/``player_id`` rows from a CSV or Parquet file, in file order."""
+    import polars as pl
+
+    frame = pl.read_parquet(path) if path.endswith(".parquet") else pl.read_csv(path, infer_schema_length=0)
+    rosters: Dict[str, List[str]] = {}
+    for name, player in frame.select("roster", "player_id").iter_rows():
+        rosters.setdefault(str(name), []).append(str(player))
+    return rosters
+
+
+def run_bestball_sim(
+    root: str,
+    rosters_path: str,
+    season: int,
+    n_sims: int = 20_000,
+    advance: Sequence[int] = DEFAULT_ADVANCE,
+    max_workers: int = 1,
+    seed: int = 0,
+) -> "pl.DataFrame":
+    rosters = read_rosters(rosters_path)
+    players = sorted({p for roster in rosters.values() for p in roster})
+    scores = load_player_scores(root, season, players)
+    return simulate(scores, rosters, load_format(root), n_sims, advance, max_workers=max_workers, seed=seed)
@@ -4,11 +4,10 @@ from typing import List, Optional
 from datetime import datetime, timezone
 
 import typer
-from dotenv import load_dotenv
 
-from .config import load_dataset_catalog, DatasetConfig
-from .logging_setup import configure_logging
-from .lineage import load_lineage, save_lineage, update_dataset_lineage, record_partition_counts
+# Project modules are imported inside each command: pandas/polars/pyarrow/pandera/pydantic take
+# most of a second to import, and commands such as ``--help`` or ``lineage-runs`` never need them.
+# ``scripts/bench_startup.py`` enforces the per-command import budget.
 
 app = typer.Typer(no_args_is_help=True, add_completion=False)
 
@@ -18,8 +17,19 @@ def _resolve_root_from_env(default_root: str) -> str:
     return env_root or default_root
 
 
+def _load_catalog():
+    from .config import load_dataset_catalog
+
+    catalog = load_dataset_catalog()
+    return catalog, _resolve_root_from_env(catalog.root)
+
+
 @app.callback()
 def main() -> None:
+    from dotenv import load_dotenv
+
+    from .logging_setup import configure_logging
+
     load_dotenv()
     configure_logging()
 
@@ -30,12 +40,27 @@ def bootstrap(
     datasets: Optional[str] = typer.Option(None, help="Comma-separated dataset filter"),
     max_workers: int = typer.Option(2, help="Max parallel dataset workers"),
     no_validate: bool = typer.Option(False, help="Skip validation"),
+    revalidate: bool = typer.Option(False, help="Ignore cached validation results and re-validate every partition"),
+    resume: bool = typer.Option(False, help="Skip (dataset, year) units a previous bootstrap already completed"),
+    retry_attempts: int = typer.Option(3, help="Attempts per (dataset, year) fetch/promote before the dataset fails"),
+    retry_base_seconds: float = typer.Option(5, help="Base seconds for exponential backoff between attempts"),
+    executor: str = typer.Option("thread", help="Run per-dataset fetch+promote on 'thread' or 'process' workers"),
 ) -> None:
-    catalog = load_dataset_catalog()
-    root = _resolve_root_from_env(catalog.root)
-    # Lazy import to avoid heavy deps during --help
+    catalog, root = _load_catalog()
     from .orchestration import run_bootstrap
-    run_bootstrap(root, catalog, years, datasets, max_workers, no_validate)
+    run_bootstrap(
+        root,
+        catalog,
+        years,
+        datasets,
+        max_workers,
+        no_validate,
+        revalidate=revalidate,
+        resume=resume,
+        retry_attempts=retry_attempts,
+        retry_base_seconds=retry_base_seconds,
+        executor=executor,
+    )
 
 
 @app.command()
@@ -45,35 +70,39 @@ def update(
     max_workers: int = typer.Option(2, help="Max parallel dataset workers"),
     no_validate: bool = typer.Option(False, help="Skip validation"),
     since: Optional[str] = typer.Option(None, help="YYYY-MM-DD lower bound for fetching"),
+    revalidate: bool = typer.Option(False, help="Ignore cached validation results and re-validate every partition"),
+    executor: str = typer.Option("thread", help="Run per-dataset fetch+promote on 'thread' or 'process' workers"),
 ) -> None:
-    catalog = load_dataset_catalog()
-    root = _resolve_root_from_env(catalog.root)
+    catalog, root = _load_catalog()
     from .orchestration import run_update
-    run_update(root, catalog, season, datasets, max_workers, no_validate, since)
+    run_update(root, catalog, season, datasets, max_workers, no_validate, since, revalidate=revalidate, executor=executor)
 
 
 @app.command("recache-pbp")
 def recache_pbp(
     season: int = typer.Option(..., help="Season to re-pull for corrections"),
 ) -> None:
-    catalog = load_dataset_catalog()
-    root = _resolve_root_from_env(catalog.root)
+    catalog, root = _load_catalog()
     from .orchestration import run_recache_pbp
     run_recache_pbp(root, catalog, season)
 
 
 @app.command()
 def profile(
-    layer: str = typer.Option("silver", help="Layer to profile: bronze or silver"),
+    layer: str = typer.Option("silver", help="Layer to profile: bronze, silver or gold"),
     datasets: Optional[str] = typer.Option(None, help="Comma-separated dataset filter"),
     values: Optional[str] = typer.Option(None, help="Limit to partition values (comma-separated), e.g. 1999,2000"),
+    max_workers: int = typer.Option(1, help="Profile partitions in a process pool of this size"),
+    force: bool = typer.Option(False, help="Re-profile partitions even if their files are unchanged"),
+    columns: bool = typer.Option(True, "--columns/--no-columns", help="Append per-column sketches to the quality store"),
 ) -> None:
-    catalog = load_dataset_catalog()
-    root = _resolve_root_from_env(catalog.root)
+    catalog, root = _load_catalog()
     from .profiling import run_profile
 
     limit_values = [v.strip() for v in values.split(",")] if values else None
-    written = run_profile(root, catalog, datasets, layer, limit_values)
+    written = run_profile(
+        root, catalog, datasets, layer, limit_values, max_workers=max_workers, force=force, columns=columns
+    )
     for ds, lyr, part in written:
         typer.echo(f"profiled: {ds} {lyr} {part}")
 
@@ -83,16 +112,17 @@ def promote(
     datasets: Optional[str] = typer.Option(None, help="Comma-separated dataset filter"),
     values: Optional[str] = typer.Option(None, help="Limit to partition values (comma-separated), e.g. 1999,2000"),
     no_validate: bool = typer.Option(False, help="Skip validation"),
+    revalidate: bool = typer.Option(False, help="Ignore cached validation results and re-validate every partition"),
 ) -> None:
     """Promote existing bronze partitions to silver without re-fetching."""
-    catalog = load_dataset_catalog()
-    root = _resolve_root_from_env(catalog.root)
-    # Lazy imports to avoid heavy deps during --help
+    catalog, root = _load_catalog()
+    from .lineage import LineageStore
+    from .locks import lake_lock, write_lock
     from .profiling import _iter_partitions
     from .promote import promote_to_silver
 
     allow = {x.strip() for x in datasets.split(",") if x.strip()} if datasets else None
-    selected: List[DatasetConfig] = []
+    selected = []
     for name, cfg in catalog.datasets.items():
         if not cfg.enabled:
             continue
@@ -101,34 +131,247 @@ def promote(
         selected.append(cfg)
 
     limit_values = [v.strip() for v in values.split(",")] if values else None
-    lineage = load_lineage()
-    for cfg in selected:
-        changed_parts = _iter_partitions(root, cfg.name, "bronze", cfg.partitions, limit_values)
-        part_stats = promote_to_silver(root, cfg, changed_parts, no_validate=no_validate)
-        # Update lineage with stats and counts
-        lineage = update_dataset_lineage(
-            lineage,
-            dataset=cfg.name,
-            last_ingest_utc=datetime.now(timezone.utc).isoformat(),
-            rows_last_batch=sum(st.row_count for st in part_stats.values()) if isinstance(part_stats, dict) else 0,
-            changed_partitions=changed_parts,
-            partition_stats=part_stats if isinstance(part_stats, dict) else None,
-        )
-        for part in changed_parts:
-            rc = 0
-            if isinstance(part_stats, dict):
+    with lake_lock(root), LineageStore() as store:
+        for cfg in selected:
+            changed_parts = _iter_partitions(root, cfg.name, "bronze", cfg.partitions, limit_values)
+            cache = store.validation_cache(cfg.name)
+            with write_lock(root, cfg.name, changed_parts if limit_values else None):
+                part_stats = promote_to_silver(
+                    root,
+                    cfg,
+                    changed_parts,
+                    no_validate=no_validate,
+                    validation_cache=cache,
+                    revalidate=revalidate,
+                )
+            # One transaction per dataset: touches only this dataset's partition rows
+            store.record_dataset_run(
+                dataset=cfg.name,
+                last_ingest_utc=datetime.now(timezone.utc).isoformat(),
+                rows_last_batch=sum(st.row_count for st in part_stats.values()),
+                changed_partitions=changed_parts,
+                partition_stats=part_stats,
+                partition_row_counts={part: 0 for part in changed_parts if part not in part_stats},
+                validation_cache=cache,
+                flow="promote",
+            )
+            for part in changed_parts:
                 st = part_stats.get(part)
-                if st is not None and hasattr(st, "row_count"):
-                    rc = int(getattr(st, "row_count"))
-            lineage = record_partition_counts(lineage, cfg.name, part, rc)
-        save_lineage(lineage)
-        for part in changed_parts:
-            rc = 0
-            if isinstance(part_stats, dict):
-                st = part_stats.get(part)
-                if st is not None and hasattr(st, "row_count"):
-                    rc = int(getattr(st, "row_count"))
-            typer.echo(f"promoted: {cfg.name} silver <- bronze {part} rows={rc}")
+                rc = int(st.row_count) if st is not None else 0
+                typer.echo(f"promoted: {cfg.name} silver <- bronze {part} rows={rc}")
+        store.export_json()
+
+
+@app.command("lineage-export")
+def lineage_export(
+    path: str = typer.Option("catalog/lineage.json", help="Destination for the JSON export"),
+) -> None:
+    """Export the lineage store to the legacy lineage.json layout."""
+    from .lineage import LineageStore
+
+    with LineageStore() as store:
+        target = store.export_json(path)
+    typer.echo(f"exported: {target}")
+
+
+@app.command("lineage-runs")
+def lineage_runs(
+    dataset: Optional[str] = typer.Option(None, help="Only show runs for this dataset"),
+    limit: int = typer.Option(20, help="Number of most recent runs to show"),
+) -> None:
+    """Show recent run history from the lineage store."""
+    from .lineage import LineageStore
+
+    with LineageStore() as store:
+        for rec in store.runs(dataset=dataset, limit=limit):
+            typer.echo(
+                f"{rec['event_utc']} {rec['flow'] or '-'} {rec['dataset']} {rec['status']} "
+                f"rows={rec['rows']} parts={len(rec['changed_partitions'])}"
+            )
+
+
+@app.command()
+def stats(
+    run_id: Optional[str] = typer.Option(None, "--run-id", help="Run to summarize (default: latest logs/run_*.jsonl)"),
+    by: str = typer.Option("stage", help="Group by stage, dataset, or dataset,stage"),
+) -> None:
+    """Summarize per-stage wall/CPU time, throughput, bytes and peak RSS recorded for a run."""
+    from .telemetry import latest_run_id, load_stage_events, summarize_stages
+
+    run_id = run_id or latest_run_id()
+    if run_id is None:
+        typer.echo("no run logs under logs/")
+        raise typer.Exit(code=1)
+    rows = summarize_stages(load_stage_events(run_id), by=by)
+    typer.echo(f"{run_id}: {sum(r['count'] for r in rows)} stage records")
+    typer.echo(
+        f"{by:<36} {'n':>5} {'wall_s':>9} {'cpu_s':>9} {'rows':>11} {'rows/s':>11} "
+        f"{'MB_read':>9} {'MB_written':>10} {'peak_MB':>8}"
+    )
+    for r in rows:
+        label = "/".join(str(r[k.strip()]) for k in by.split(","))
+        rate = f"{r['rows_per_sec']:.0f}" if r["rows_per_sec"] is not None else "-"
+        rss = f"{r['peak_rss_mb']:.0f}" if r["peak_rss_mb"] is not None else "-"
+        typer.echo(
+            f"{label:<36} {r['count']:>5} {r['wall_s']:>9.2f} {r['cpu_s']:>9.2f} {r['rows']:>11} {rate:>11} "
+            f"{r['bytes_read'] / 1e6:>9.1f} {r['bytes_written'] / 1e6:>10.1f} {rss:>8}"
+        )
+
+
+@app.command()
+def trace(
+    run_id: Optional[str] = typer.Option(None, "--run-id", help="Run to export (default: latest logs/run_*.jsonl)"),
+    out: Optional[str] = typer.Option(None, help="Destination (default: logs/<run_id>.trace.json)"),
+) -> None:
+    """Export a run's spans and stages as Chrome trace JSON for Perfetto / chrome://tracing."""
+    from .telemetry import export_chrome_trace, latest_run_id
+
+    run_id = run_id or latest_run_id()
+    if run_id is None:
+        typer.echo("no run logs under logs/")
+        raise typer.Exit(code=1)
+    typer.echo(f"trace: {export_chrome_trace(run_id, out=out)}")
+
+
+@app.command()
+def query(
+    sql: Optional[str] = typer.Argument(None, help="SQL to run; $name placeholders are bound from --param"),
+    file: Optional[str] = typer.Option(None, "--file", "-f", help="Read the SQL from a file instead"),
+    param: List[str] = typer.Option([], "--param", "-p", help="Bind a parameter: name=value (repeatable)"),
+    fmt: str = typer.Option("table", "--format", help="Output: table, csv, parquet or arrow"),
+    out: Optional[str] = typer.Option(None, help="Destination file (required for parquet/arrow)"),
+    explain: bool = typer.Option(False, help="Print DuckDB's EXPLAIN ANALYZE profile and timing instead of rows"),
+    refresh: bool = typer.Option(False, help="Rebuild every view in the catalog database"),
+    database: Optional[str] = typer.Option(None, help="Catalog database (default: <lake root>/lake.duckdb)"),
+) -> None:
+    """Query silver_*/gold_* views in the persistent DuckDB catalog of the lake."""
+    from pathlib import Path
+
+    from .lakedb import LakeDatabase, parse_params, write_result
+
+    if (sql is None) == (file is None):
+        raise typer.BadParameter("pass either SQL or --file")
+    text = Path(file).read_text() if file else sql
+    catalog, root = _load_catalog()
+    with LakeDatabase(root, catalog, database) as lake:
+        refreshed = lake.open(refresh=refresh)
+        if refreshed:
+            typer.echo(f"refreshed views: {', '.join(refreshed)}", err=True)
+        params = parse_params(param)
+        if explain:
+            profile, seconds = lake.explain_analyze(text, params)
+            typer.echo(profile)
+            typer.echo(f"wall: {seconds:.3f}s", err=True)
+            return
+        target = write_result(lake.execute(text, params), fmt, out)
+    if target is not None:
+        typer.echo(f"wrote: {target}", err=True)
+
+
+@app.command("bestball-sim")
+def bestball_sim(
+    rosters: str = typer.Option(..., help="CSV or Parquet with roster and player_id columns, one draft room"),
+    season: int = typer.Option(..., help="Season of gold player_week_stats to draw weekly scores from"),
+    sims: int = typer.Option(20000, help="Simulated seasons"),
+    advance: str = typer.Option("6,3,2", help="Rosters advancing after each round but the last"),
+    max_workers: Optional[int] = typer.Option(None, help="Worker processes (default: CPU count)"),
+    seed: int = typer.Option(0, help="Random seed"),
+    out: Optional[str] = typer.Option(None, help="Write the rates to this CSV instead of printing them"),
+) -> None:
+    """Monte Carlo advance and win rates for Best Ball rosters under the dk_bestball format."""
+    from .bestball import run_bestball_sim
+
+    _, root = _load_catalog()
+    rates = run_bestball_sim(
+        root,
+        rosters,
+        season,
+        n_sims=sims,
+        advance=[int(a) for a in advance.split(",")],
+        max_workers=max_workers or os.cpu_count() or 1,
+        seed=seed,
+    )
+    if out:
+        rates.write_csv(out)
+        typer.echo(f"wrote: {out}", err=True)
+    else:
+        import polars as pl
+
+        with pl.Config(tbl_rows=rates.height):
+            typer.echo(rates)
+
+
+@app.command()
+def lineups(
+    slate: str = typer.Option(..., help="CSV or Parquet with player_id and salary (optionally position, projection, spread)"),
+    season: int = typer.Option(..., help="Season of gold player_week_stats to project from"),
+    contest: str = typer.Option("classic", help="classic, showdown, or a path to a rules YAML with a lineup section"),
+    week: Optional[int] = typer.Option(None, help="Project from the games before this week (default: latest)"),
+    window: int = typer.Option(4, help="Recent games averaged per player"),
+    n: int = typer.Option(1, "--lineups", help="Lineups to generate"),
+    randomness: float = typer.Option(0.0, help="Projection jitter per lineup, in weekly standard deviations"),
+    min_unique: int = typer.Option(1, help="Players each lineup must not share with every earlier lineup"),
+    max_exposure: float = typer.Option(1.0, help="Largest share of the lineups any player may appear in"),
+    seed: int = typer.Option(0, help="Random seed"),
+    out: Optional[str] = typer.Option(None, help="Write one row per lineup slot to this CSV instead of printing"),
+) -> None:
+    """Optimal and diversified DraftKings Classic/Showdown lineups from gold projections."""
+    from .lineups import run_lineups
+
+    _, root = _load_catalog()
+    frame = run_lineups(
+        root,
+        contest,
+        slate,
+        season,
+        week=week,
+        window=window,
+        n_lineups=n,
+        randomness=randomness,
+        min_unique=min_unique,
+        max_exposure=max_exposure,
+        seed=seed,
+    )
+    if out:
+        frame.write_csv(out)
+        typer.echo(f"wrote: {out}", err=True)
+    else:
+        import polars as pl
+
+        totals = frame.group_by("lineup", maintain_order=True).agg(
+            pl.col("salary").sum(), pl.col("projection").sum().round(2), pl.col("player_id").str.join(",").alias("players")
+        )
+        with pl.Config(tbl_rows=totals.height, fmt_str_lengths=200):
+            typer.echo(totals)
+
+
+@app.command()
+def watch(
+    season: int = typer.Option(..., help="Season to watch"),
+    datasets: Optional[str] = typer.Option(None, help="Comma-separated dataset filter"),
+    interval: float = typer.Option(300, help="Seconds between upstream polls"),
+    full_refresh_hours: float = typer.Option(6, help="Hours between refreshes of datasets without an upstream probe"),
+    mirror: Optional[str] = typer.Option(None, help="Local directory mirroring upstream files (probed by mtime/size)"),
+    status_file: str = typer.Option("logs/watch_status.json", help="Health/status JSON rewritten every cycle"),
+    max_workers: int = typer.Option(2, help="Max parallel dataset workers"),
+    no_validate: bool = typer.Option(False, help="Skip validation"),
+) -> None:
+    """Run as a daemon: poll upstream and update only datasets whose files changed."""
+    catalog, root = _load_catalog()
+    from .watch import Watcher
+
+    Watcher(
+        root,
+        catalog,
+        season,
+        datasets=datasets,
+        interval_seconds=interval,
+        full_refresh_seconds=full_refresh_hours * 3600,
+        mirror=mirror,
+        status_path=status_file,
+        max_workers=max_workers,
+        no_validate=no_validate,
+    ).run()
 
 
 @app.command()
@@ -140,13 +383,11 @@ def inseason(
     retry_base_seconds: int = typer.Option(5, help="Base seconds for backoff"),
 ) -> None:
     """Convenience command: run safe datasets immediately, then 404-prone datasets with retry."""
-    catalog = load_dataset_catalog()
-    root = _resolve_root_from_env(catalog.root)
+    catalog, root = _load_catalog()
+    from .dag import inseason_passes
     from .orchestration import run_update
-    # Safe now
-    safe = "schedules,rosters,rosters_seasonal,players,ids,ngs_weekly,pbp"
-    # Unstable early Monday
-    unstable = "weekly,injuries,depth_charts,snap_counts"
+    # Datasets flagged unstable in the catalog (and anything depending on them) often 404 early Monday
+    safe, unstable = inseason_passes(catalog)
 
     # Inject retry options into importer options (read by importers where supported)
     # We pass via environment variables to avoid changing many signatures
@@ -154,10 +395,11 @@ def inseason(
     os.environ["IMPORTER_RETRY_ATTEMPTS"] = str(retry_attempts)
     os.environ["IMPORTER_RETRY_BASE_SECONDS"] = str(retry_base_seconds)
 
-    # First pass: safe datasets
-    run_update(root, catalog, season, datasets=safe, max_workers=max_workers, no_validate=no_validate, since=None)
-    # Second pass: unstable datasets (may still skip if upstream not ready)
-    run_update(root, catalog, season, datasets=unstable, max_workers=max_workers, no_validate=no_validate, since=None)
+    # First pass: safe datasets; second pass: unstable datasets (may still skip if upstream not ready).
+    # An empty pass is skipped: an empty dataset filter would select every dataset
+    for names in (safe, unstable):
+        if names:
+            run_update(root, catalog, season, datasets=",".join(names), max_workers=max_workers, no_validate=no_validate, since=None)
 
 if __name__ == "__main__":
     app()
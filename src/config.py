@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
 import yaml
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class DatasetConfigModel(BaseModel):
@@ -17,6 +17,9 @@ class DatasetConfigModel(BaseModel):
     enabled: bool = True
     sort_by: Optional[List[str]] = None
     max_rows_per_file: Optional[int] = None
+    depends_on: List[str] = Field(default_factory=list)
+    unstable: bool = False
+    inseason: bool = True
 
     @field_validator("key")
     @classmethod
@@ -26,11 +29,41 @@ class DatasetConfigModel(BaseModel):
         return v
 
 
+class ReportConfigModel(BaseModel):
+    fn: Optional[str] = None
+    sql: Optional[str] = None
+    inputs: List[str] = Field(default_factory=list)
+    depends_on: List[str] = Field(default_factory=list)
+    output: Optional[str] = None
+    only_if_missing: Optional[str] = None
+    # Rows for a week depend only on that week's inputs, so changed weeks can be rebuilt alone
+    week_local: bool = True
+    # Layout of a gold table (a report with an output): hive partitions, outermost first, and row key
+    partitions: List[str] = Field(default_factory=list)
+    key: List[str] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def fn_or_sql(self) -> "ReportConfigModel":
+        if not self.fn and not self.sql:
+            raise ValueError("report needs either fn or sql")
+        return self
+
+    @model_validator(mode="after")
+    def gold_layout(self) -> "ReportConfigModel":
+        if self.output:
+            if self.partitions[:1] != ["season"]:
+                raise ValueError("a report with an output needs partitions starting with season")
+            if not self.key:
+                raise ValueError("a report with an output needs a key")
+        return self
+
+
 class CatalogModel(BaseModel):
     root: str
     compression: str = Field("zstd")
     row_group_mb: int = Field(96)
     datasets: Dict[str, DatasetConfigModel]
+    reports: Dict[str, ReportConfigModel] = Field(default_factory=dict)
 
 
 @dataclass
@@ -44,6 +77,28 @@ class DatasetConfig:
     enabled: bool
     sort_by: Optional[List[str]]
     max_rows_per_file: Optional[int]
+    depends_on: List[str] = field(default_factory=list)
+    unstable: bool = False
+    inseason: bool = True
+
+
+@dataclass
+class ReportConfig:
+    name: str
+    fn: Optional[str]
+    inputs: List[str]
+    depends_on: List[str]
+    output: Optional[str]
+    only_if_missing: Optional[str]
+    sql: Optional[str] = None
+    week_local: bool = True
+    partitions: List[str] = field(default_factory=list)
+    key: List[str] = field(default_factory=list)
+
+    @property
+    def layer(self) -> Optional[str]:
+        """``gold`` for reports that write a table, ``None`` for side-effect steps."""
+        return "gold" if self.output else None
 
 
 @dataclass
@@ -52,6 +107,11 @@ class DatasetCatalog:
     compression: str
     row_group_mb: int
     datasets: Dict[str, DatasetConfig]
+    reports: Dict[str, ReportConfig] = field(default_factory=dict)
+
+    def gold_tables(self) -> Dict[str, ReportConfig]:
+        """Reports that materialize a gold table, by name."""
+        return {name: rep for name, rep in self.reports.items() if rep.layer == "gold"}
 
 
 def load_dataset_catalog(path: Optional[str] = None) -> DatasetCatalog:
@@ -71,6 +131,24 @@ def load_dataset_catalog(path: Optional[str] = None) -> DatasetCatalog:
             enabled=cfg.enabled,
             sort_by=cfg.sort_by,
             max_rows_per_file=cfg.max_rows_per_file,
+            depends_on=cfg.depends_on,
+            unstable=cfg.unstable,
+            inseason=cfg.inseason,
+        )
+
+    reports: Dict[str, ReportConfig] = {}
+    for name, rep in parsed.reports.items():
+        reports[name] = ReportConfig(
+            name=name,
+            fn=rep.fn,
+            inputs=rep.inputs,
+            depends_on=rep.depends_on,
+            output=rep.output,
+            only_if_missing=rep.only_if_missing,
+            sql=rep.sql,
+            week_local=rep.week_local,
+            partitions=rep.partitions,
+            key=rep.key,
         )
 
     return DatasetCatalog(
@@ -78,5 +156,6 @@ def load_dataset_catalog(path: Optional[str] = None) -> DatasetCatalog:
         compression=parsed.compression,
         row_group_mb=parsed.row_group_mb,
         datasets=datasets,
+        reports=reports,
     )
 
@@ -0,0 +1,167 @@
+# pyright: reportMissingImports=false, reportMissingModuleSource=false
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import multiprocessing
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import structlog
+
+from .config import DatasetCatalog
+
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class DagNode:
+    name: str
+    run: Callable[[], Any]
+    deps: List[str] = field(default_factory=list)
+    kind: str = "dataset"
+    # Called with the results of this node's dependencies; returning False skips the node
+    should_run: Optional[Callable[[Dict[str, "NodeResult"]], bool]] = None
+    # Decides whether a completed result counts as new data for downstream skip checks
+    changed: Callable[[Any], bool] = lambda value: True
+    # ``run`` is picklable and may execute in a worker process under ``executor="process"``
+    process_safe: bool = False
+
+
+@dataclass
+class NodeResult:
+    name: str
+    status: str  # completed | failed | skipped
+    value: Any = None
+    error: Optional[str] = None
+    changed: bool = False
+
+
+def topo_order(nodes: Dict[str, DagNode]) -> List[str]:
+    """Return node names in dependency order; deps outside the graph are treated as satisfied."""
+    order: List[str] = []
+    state: Dict[str, int] = {}
+
+    def _visit(name: str, path: Tuple[str, ...]) -> None:
+        mark = state.get(name)
+        if mark == 2:
+            return
+        if mark == 1:
+            raise ValueError(f"dependency cycle: {' -> '.join(path + (name,))}")
+        state[name] = 1
+        for dep in nodes[name].deps:
+            if dep in nodes:
+                _visit(dep, path + (name,))
+        state[name] = 2
+        order.append(name)
+
+    for name in sorted(nodes):
+        _visit(name, ())
+    return order
+
+
+def run_dag(
+    nodes: Dict[str, DagNode],
+    max_workers: int,
+    on_result: Optional[Callable[[NodeResult], None]] = None,
+    executor: str = "thread",
+    initializer: Optional[Callable[[], None]] = None,
+) -> Dict[str, NodeResult]:
+    """Run each node once all of its in-graph dependencies have finished.
+
+    Independent nodes run concurrently on a thread pool. With ``executor="process"`` nodes marked
+    ``process_safe`` run in a spawned process pool instead (``initializer`` runs once per worker
+    process); the rest stay on threads. A failed dependency does not block
+    its dependents (the previous lake state is still readable); ``should_run`` decides whether a
+    node is worth running. ``on_result`` is invoked on the calling thread, so it may safely use
+    thread-bound resources such as the lineage store.
+    """
+    if executor not in ("thread", "process"):
+        raise ValueError(f"unknown executor {executor!r}; expected 'thread' or 'process'")
+    topo_order(nodes)  # validates there are no cycles
+    pending: Dict[str, Set[str]] = {n: {d for d in node.deps if d in nodes} for n, node in nodes.items()}
+    results: Dict[str, NodeResult] = {}
+
+    def _finish(res: NodeResult) -> None:
+        results[res.name] = res
+        if on_result is not None:
+            on_result(res)
+
+    with contextlib.ExitStack() as stack:
+        pool = stack.enter_context(concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_workers)))
+        procs = pool
+        if executor == "process" and any(node.process_safe for node in nodes.values()):
+            # Spawn rather than fork: the parent holds threads, DuckDB and SQLite handles
+            procs = stack.enter_context(
+                concurrent.futures.ProcessPoolExecutor(
+                    max_workers=max(1, max_workers),
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=initializer,
+                )
+            )
+        running: Dict[concurrent.futures.Future, str] = {}
+        while pending or running:
+            ready = sorted(n for n, deps in pending.items() if deps <= results.keys())
+            for name in ready:
+                del pending[name]
+                node = nodes[name]
+                dep_results = {d: results[d] for d in node.deps if d in results}
+                if node.should_run is not None and not node.should_run(dep_results):
+                    logger.info("dag_node_skipped", node=name, kind=node.kind)
+                    _finish(NodeResult(name=name, status="skipped"))
+                    continue
+                running[(procs if node.process_safe else pool).submit(node.run)] = name
+            if not running:
+                if pending and not ready:
+                    raise RuntimeError(f"unschedulable nodes: {sorted(pending)}")
+                continue
+            done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                try:
+                    value = fut.result()
+                    _finish(NodeResult(name=name, status="completed", value=value, changed=nodes[name].changed(value)))
+                except Exception as exc:
+                    logger.error("dag_node_failed", node=name, kind=nodes[name].kind, error=str(exc))
+                    _finish(NodeResult(name=name, status="failed", error=str(exc)))
+    return results
+
+
+def upstream_changed(
+    node_inputs: List[str], node_deps: List[str], results: Dict[str, NodeResult]
+) -> bool:
+    """True when any input dataset or dependency completed with new data in this run."""
+    for name in list(node_inputs) + list(node_deps):
+        res = results.get(name)
+        if res is not None and res.status == "completed" and res.changed:
+            return True
+    return False
+
+
+def _descendants(catalog: DatasetCatalog, roots: Set[str]) -> Set[str]:
+    children: Dict[str, Set[str]] = {}
+    for name, cfg in catalog.datasets.items():
+        for dep in cfg.depends_on:
+            children.setdefault(dep, set()).add(name)
+    seen = set(roots)
+    stack = list(roots)
+    while stack:
+        for child in children.get(stack.pop(), ()):
+            if child not in seen:
+                seen.add(child)
+                stack.append(child)
+    return seen
+
+
+def inseason_passes(catalog: DatasetCatalog) -> Tuple[List[str], List[str]]:
+    """Split enabled in-season datasets into (safe, unstable) passes.
+
+    A dataset is unstable when it is flagged ``unstable`` in the catalog or depends
+    (transitively) on one that is; everything else can be fetched right away.
+    """
+    enabled = {name for name, cfg in catalog.datasets.items() if cfg.enabled and cfg.inseason}
+    flagged = {name for name in enabled if catalog.datasets[name].unstable}
+    unstable = _descendants(catalog, flagged) & enabled
+    safe = enabled - unstable
+    return sorted(safe), sorted(unstable)
@@ -1,10 +1,11 @@
 # pyright: reportMissingImports=false, reportMissingModuleSource=false
 from __future__ import annotations
 
-from typing import Optional
+from typing import List, Optional
 import pandas as pd
 
 from ..config import DatasetConfig
+from .. import telemetry
 from .nflverse import (
     fetch_pbp,
     fetch_schedules,
@@ -24,11 +25,23 @@ from .nflverse import (
     fetch_ids,
     fetch_seasonal_rosters,
     fetch_players,
+    _parse_years_arg,
 )
 from .draftkings import fetch_dk_bestball
 
 
-def fetch_dataset_bootstrap(cfg: DatasetConfig, years: str) -> pd.DataFrame:
+# Importers that ignore ``years`` and always return the whole dataset
+_YEARLESS_IMPORTERS = {"dk_bestball", "ids", "players"}
+
+
+def bootstrap_units(cfg: DatasetConfig, years: str) -> List[str]:
+    """Independently fetchable units of a bootstrap: one per year, or ``["all"]``."""
+    if cfg.importer in _YEARLESS_IMPORTERS or not cfg.partitions:
+        return ["all"]
+    return [str(yr) for yr in _parse_years_arg(years)]
+
+
+def _fetch_bootstrap(cfg: DatasetConfig, years: str) -> pd.DataFrame:
     if cfg.importer == "pbp":
         return fetch_pbp(years=years, options=cfg.options)
     if cfg.importer == "schedules":
@@ -70,9 +83,7 @@ def fetch_dataset_bootstrap(cfg: DatasetConfig, years: str) -> pd.DataFrame:
     raise NotImplementedError(f"Importer not implemented: {cfg.importer}")
 
 
-def fetch_dataset_update(
-    cfg: DatasetConfig, season: int, since: Optional[str]
-) -> pd.DataFrame:
+def _fetch_update(cfg: DatasetConfig, season: int, since: Optional[str]) -> pd.DataFrame:
     if cfg.importer == "pbp":
         return fetch_pbp(years=str(season), options=cfg.options)
     if cfg.importer == "schedules":
@@ -113,3 +124,18 @@ def fetch_dataset_update(
         return fetch_players(options=cfg.options)
     raise NotImplementedError(f"Importer not implemented: {cfg.importer}")
 
+
+def fetch_dataset_bootstrap(cfg: DatasetConfig, years: str) -> pd.DataFrame:
+    with telemetry.stage("fetch", years=years) as st:
+        df = _fetch_bootstrap(cfg, years)
+        st["rows"] = len(df)
+    return df
+
+
+def fetch_dataset_update(
+    cfg: DatasetConfig, season: int, since: Optional[str]
+) -> pd.DataFrame:
+    with telemetry.stage("fetch", years=str(season)) as st:
+        df = _fetch_update(cfg, season, since)
+        st["rows"] = len(df)
+    return df
@@ -8,6 +8,10 @@ import pandas as pd
 import nfl_data_py as nfl
 import structlog
 import os
+
+from .. import telemetry
+
+
 def _retry_params(options: Optional[Dict[str, Any]] = None) -> tuple[int, int]:
     opts = options or {}
     env_attempts = os.getenv("IMPORTER_RETRY_ATTEMPTS")
@@ -93,6 +97,32 @@ def _load_schedule_lookup(year: int) -> pd.DataFrame:
     return out.drop_duplicates(subset=["team", "game_date"])
 
 
+def refresh_lookups(season: Optional[int] = None) -> None:
+    """Reload the cached ID lookup (and ``season``'s schedule lookup).
+
+    Long-running processes call this periodically so rookies and schedule changes are picked up.
+    """
+    _load_ids_lookup.cache_clear()
+    _load_schedule_lookup.cache_clear()
+    _load_ids_lookup()
+    if season is not None:
+        _load_schedule_lookup(season)
+
+
+_RELEASES = "https://github.com/nflverse/nflverse-data/releases/download"
+
+# Season-scoped upstream files per importer; ``watch`` probes these to notice new data cheaply
+SEASON_ASSETS: Dict[str, str] = {
+    "pbp": _RELEASES + "/pbp/play_by_play_{season}.parquet",
+    "weekly": _RELEASES + "/stats_player/stats_player_week_{season}.parquet",
+    "rosters": _RELEASES + "/weekly_rosters/roster_weekly_{season}.parquet",
+    "injuries": _RELEASES + "/injuries/injuries_{season}.parquet",
+    "depth_charts": _RELEASES + "/depth_charts/depth_charts_{season}.parquet",
+    "snap_counts": _RELEASES + "/snap_counts/snap_counts_{season}.parquet",
+    "schedules": "https://raw.githubusercontent.com/nflverse/nfldata/master/data/games.csv",
+}
+
+
 def _assign_weeks_from_schedule(df: pd.DataFrame, year: int) -> pd.Series:
     if df.empty or "dt" not in df.columns or "team" not in df.columns:
         return pd.Series(pd.NA, index=df.index, dtype="Int64")
@@ -204,7 +234,7 @@ def fetch_pbp(years: str, options: Optional[Dict[str, Any]] = None) -> pd.DataFr
     downcast = bool(opts.get("downcast", True))
     default_cache = bool(opts.get("cache", False))
     frames: List[pd.DataFrame] = []
-    for yr in year_list:
+    for yr in telemetry.iter_spans(year_list, cat="year"):
         cache = default_cache
         try:
             df_y = nfl.import_pbp_data([yr], downcast=downcast, cache=cache)
@@ -245,7 +275,7 @@ def fetch_schedules(years: str, options: Optional[Dict[str, Any]] = None) -> pd.
     logger = structlog.get_logger(__name__)
     year_list = _parse_years_arg(years)
     frames: List[pd.DataFrame] = []
-    for yr in year_list:
+    for yr in telemetry.iter_spans(year_list, cat="year"):
         try:
             df_y = nfl.import_schedules([yr])
         except Exception as exc:
@@ -308,7 +338,7 @@ def fetch_weekly(years: str, options: Optional[Dict[str, Any]] = None) -> pd.Dat
     logger = structlog.get_logger(__name__)
     year_list = _parse_years_arg(years)
     frames: List[pd.DataFrame] = []
-    for yr in year_list:
+    for yr in telemetry.iter_spans(year_list, cat="year"):
         df_y = None
         attempts, base_sleep = _retry_params(options)
         for attempt in range(1, attempts + 1):
@@ -425,7 +455,7 @@ def fetch_rosters(years: str, options: Optional[Dict[str, Any]] = None) -> pd.Da
     logger = structlog.get_logger(__name__)
     year_list = _parse_years_arg(years)
     frames: List[pd.DataFrame] = []
-    for yr in year_list:
+    for yr in telemetry.iter_spans(year_list, cat="year"):
         try:
             # nfl_data_py rosters function name differs by version; try common variants
             if hasattr(nfl, "import_weekly_rosters"):
@@ -464,7 +494,7 @@ def fetch_injuries(years: str, options: Optional[Dict[str, Any]] = None) -> pd.D
     logger = structlog.get_logger(__name__)
     year_list = _parse_years_arg(years)
     frames: List[pd.DataFrame] = []
-    for yr in year_list:
+    for yr in telemetry.iter_spans(year_list, cat="year"):
         df_y = None
         attempts, base_sleep = _retry_params(options)
         for attempt in range(1, attempts + 1):
@@ -498,7 +528,7 @@ def fetch_depth_charts(years: str, options: Optional[Dict[str, Any]] = None) ->
     logger = structlog.get_logger(__name__)
     year_list = _parse_years_arg(years)
     frames: List[pd.DataFrame] = []
-    for yr in year_list:
+    for yr in telemetry.iter_spans(year_list, cat="year"):
         try:
             if hasattr(nfl, "import_depth_charts"):
                 df_y = nfl.import_depth_charts([yr])
@@ -562,7 +592,7 @@ def fetch_snap_counts(years: str, options: Optional[Dict[str, Any]] = None) -> p
     logger = structlog.get_logger(__name__)
     year_list = _parse_years_arg(years)
     frames: List[pd.DataFrame] = []
-    for yr in year_list:
+    for yr in telemetry.iter_spans(year_list, cat="year"):
         try:
             if hasattr(nfl, "import_snap_counts"):
                 df_y = nfl.import_snap_counts([yr])
@@ -601,7 +631,7 @@ def fetch_ngs_weekly(years: str, options: Optional[Dict[str, Any]] = None) -> pd
     stat_types: List[str] = list((options or {}).get("stat_types", ["passing", "rushing", "receiving"]))
     frames: List[pd.DataFrame] = []
     for s_type in stat_types:
-        for yr in year_list:
+        for yr in telemetry.iter_spans(year_list, cat="year"):
             try:
                 df_y = nfl.import_ngs_data(s_type, years=[yr])
             except Exception as exc:
@@ -621,7 +651,7 @@ def fetch_pfr_weekly(years: str, options: Optional[Dict[str, Any]] = None) -> pd
     stat_types: List[str] = list((options or {}).get("stat_types", ["pass", "rush", "rec"]))
     frames: List[pd.DataFrame] = []
     for s_type in stat_types:
-        for yr in year_list:
+        for yr in telemetry.iter_spans(year_list, cat="year"):
             try:
                 df_y = nfl.import_weekly_pfr(s_type, years=[yr])
             except Exception as exc:
@@ -641,7 +671,7 @@ def fetch_pfr_seasonal(years: str, options: Optional[Dict[str, Any]] = None) ->
     stat_types: List[str] = list((options or {}).get("stat_types", ["pass", "rush", "rec"]))
     frames: List[pd.DataFrame] = []
     for s_type in stat_types:
-        for yr in year_list:
+        for yr in telemetry.iter_spans(year_list, cat="year"):
             try:
                 df_y = nfl.import_seasonal_pfr(s_type, years=[yr])
             except Exception as exc:
@@ -681,7 +711,7 @@ def fetch_seasonal_rosters(years: str, options: Optional[Dict[str, Any]] = None)
     logger = structlog.get_logger(__name__)
     year_list = _parse_years_arg(years)
     frames: List[pd.DataFrame] = []
-    for yr in year_list:
+    for yr in telemetry.iter_spans(year_list, cat="year"):
         try:
             df_y = nfl.import_seasonal_rosters([yr])
         except Exception as exc:
@@ -719,7 +749,7 @@ def fetch_officials(years: str, options: Optional[Dict[str, Any]] = None) -> pd.
     logger = structlog.get_logger(__name__)
     year_list = _parse_years_arg(years)
     frames: List[pd.DataFrame] = []
-    for yr in year_list:
+    for yr in telemetry.iter_spans(year_list, cat="year"):
         try:
             df_y = nfl.import_officials([yr])
         except Exception as exc:
@@ -736,7 +766,7 @@ def fetch_win_totals(years: str, options: Optional[Dict[str, Any]] = None) -> pd
     logger = structlog.get_logger(__name__)
     year_list = _parse_years_arg(years)
     frames: List[pd.DataFrame] = []
-    for yr in year_list:
+    for yr in telemetry.iter_spans(year_list, cat="year"):
         try:
             df_y = nfl.import_win_totals([yr])
         except Exception as exc:
@@ -753,7 +783,7 @@ def fetch_scoring_lines(years: str, options: Optional[Dict[str, Any]] = None) ->
     logger = structlog.get_logger(__name__)
     year_list = _parse_years_arg(years)
     frames: List[pd.DataFrame] = []
-    for yr in year_list:
+    for yr in telemetry.iter_spans(year_list, cat="year"):
         try:
             df_y = nfl.import_sc_lines([yr])
         except Exception as exc:
@@ -770,7 +800,7 @@ def fetch_draft_picks(years: str, options: Optional[Dict[str, Any]] = None) -> p
     logger = structlog.get_logger(__name__)
     year_list = _parse_years_arg(years)
     frames: List[pd.DataFrame] = []
-    for yr in year_list:
+    for yr in telemetry.iter_spans(year_list, cat="year"):
         try:
             df_y = nfl.import_draft_picks([yr])
         except Exception as exc:
@@ -787,7 +817,7 @@ def fetch_combine(years: str, options: Optional[Dict[str, Any]] = None) -> pd.Da
     logger = structlog.get_logger(__name__)
     year_list = _parse_years_arg(years)
     frames: List[pd.DataFrame] = []
-    for yr in year_list:
+    for yr in telemetry.iter_spans(year_list, cat="year"):
         try:
             df_y = nfl.import_combine_data([yr])
         except Exception as exc:
@@ -23,17 +23,26 @@ def remove_dir(path: str | Path) -> None:
 
 
 def move_replace(src: str | Path, dest: str | Path) -> None:
+    """Publish ``src`` at ``dest`` by rename, so readers never see a partly written tree.
+
+    Replacing a directory takes two renames (old tree out, new tree in), and readers take no
+    locks: one listing ``dest`` between them finds it missing. The old tree is moved next to
+    ``src``, into the staging area rather than the dataset tree, so dataset globs never match it.
+    """
     import os
     import shutil
+    import uuid
 
     src_p = Path(src)
     dest_p = Path(dest)
     dest_p.parent.mkdir(parents=True, exist_ok=True)
-    if dest_p.exists():
-        if dest_p.is_dir():
-            shutil.rmtree(dest_p)
-        else:
-            dest_p.unlink()
+    if dest_p.is_dir():
+        # Rename the live tree aside first and delete it only after the new one is in place
+        trash = src_p.parent / f".{dest_p.name}.old-{uuid.uuid4().hex[:8]}"
+        dest_p.rename(trash)
+        os.replace(src_p, dest_p)
+        shutil.rmtree(trash, ignore_errors=True)
+        return
     os.replace(src_p, dest_p)
 
 
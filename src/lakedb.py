@@ -0,0 +1,317 @@
+# pyright: reportMissingImports=false, reportMissingModuleSource=false
+"""Persistent DuckDB catalog of the lake (``<root>/lake.duckdb``) behind ``cli query``.
+
+Every enabled silver dataset is exposed as ``silver_<name>`` and every gold table as
+``gold_<basename>`` (``lake_relations``, shared with the report runner). Views list their parquet
+files explicitly (hive partition columns are still derived from the paths and prune files), so a
+query neither globs the lake nor rebuilds views. A view is rebuilt only when its file set or
+partition directories change, or when the catalog's view set changes; the signatures live in the
+``lake_views`` table next to the views.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import duckdb
+import orjson
+import structlog
+
+from .config import DatasetCatalog
+from .scoring import register_macros
+from .sql_runner import SqlRunner
+
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_DB_NAME = "lake.duckdb"
+SCHEMA_CACHE_NAME = ".schema_cache.json"
+OUTPUT_FORMATS = ("table", "csv", "parquet", "arrow")
+
+
+@dataclass(frozen=True)
+class LakeRelation:
+    """One catalog dataset or report output as SQL sees it: a view over a hive-partitioned directory."""
+
+    view: str
+    path: str  # lake-relative directory
+    partitions: Tuple[str, ...] = ("season",)
+
+    @property
+    def glob(self) -> str:
+        # Anchored on the partition key so renamed-aside ``.season=...`` directories never match
+        if self.partitions:
+            return f"{self.path}/{self.partitions[0]}=*/**/*.parquet"
+        return f"{self.path}/**/*.parquet"
+
+    @property
+    def season_key(self) -> Optional[str]:
+        """The leading partition column when it holds the season (``season`` or pbp's ``year``)."""
+        return self.partitions[0] if self.partitions[:1] in (("season",), ("year",)) else None
+
+    @property
+    def scoped_view(self) -> str:
+        return f"{self.view}_for_season"
+
+    def season_files(self, root: Path, season: Any) -> List[str]:
+        """Parquet files of one season's partition directory; empty when it does not exist."""
+        return sorted(parquet_files(root / self.path / f"{self.season_key}={season}"))
+
+
+def lake_relations(catalog: DatasetCatalog) -> Dict[str, LakeRelation]:
+    """View name -> relation for enabled silver datasets and gold tables."""
+    relations = {
+        f"silver_{name}": LakeRelation(f"silver_{name}", f"silver/{name}", tuple(cfg.partitions or ()))
+        for name, cfg in catalog.datasets.items()
+        if cfg.enabled
+    }
+    for rep in catalog.gold_tables().values():
+        view = f"gold_{Path(rep.output).name}"
+        relations[view] = LakeRelation(view, rep.output, tuple(rep.partitions) or ("season",))
+    return relations
+
+
+def catalog_views(catalog: DatasetCatalog) -> Dict[str, str]:
+    """View name -> lake-relative directory for enabled silver datasets and gold tables."""
+    return {view: rel.path for view, rel in lake_relations(catalog).items()}
+
+
+def _walk(path: Path):
+    for dirpath, dirnames, filenames in os.walk(path):
+        # Staging and renamed-aside directories of in-flight swaps are not part of the dataset
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith((".", "_")))
+        yield dirpath, sorted(f for f in filenames if f.endswith(".parquet"))
+
+
+def parquet_files(path: Path) -> Dict[str, int]:
+    """Parquet files under ``path`` (posix paths) -> mtime in nanoseconds."""
+    return {
+        Path(dirpath, f).as_posix(): os.stat(os.path.join(dirpath, f)).st_mtime_ns
+        for dirpath, filenames in _walk(path)
+        for f in filenames
+    }
+
+
+def scan_dataset(path: Path) -> Tuple[str, List[str]]:
+    """Signature and sorted parquet files of one dataset directory.
+
+    The signature covers the file names and the mtime of every partition directory; partitions
+    are published by renaming a new directory in, so a rewrite changes it without statting files.
+    """
+    h = hashlib.sha256()
+    files: List[str] = []
+    for dirpath, filenames in _walk(path):
+        h.update(f"{dirpath}:{os.stat(dirpath).st_mtime_ns}\n".encode("utf-8"))
+        files.extend(Path(dirpath, f).as_posix() for f in filenames)
+    h.update("\n".join(files).encode("utf-8"))
+    return h.hexdigest()[:16], files
+
+
+class SchemaCache:
+    """Unified column schema of each relation, persisted at ``<root>/.schema_cache.json``.
+
+    Binding ``read_parquet(..., union_by_name = true)`` opens the footer of every file, so the
+    union schema is kept here and extended incrementally: only files that are new or rewritten
+    since the last refresh are described. Columns are only ever added; when a column's type
+    changes, the newest file's type wins.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.path = self.root / SCHEMA_CACHE_NAME
+        try:
+            self._entries: Dict[str, Dict[str, Any]] = orjson.loads(self.path.read_bytes())
+        except (OSError, ValueError):
+            self._entries = {}
+        self._dirty = False
+
+    def columns(self, con: duckdb.DuckDBPyConnection, view: str, files: Dict[str, int]) -> List[Tuple[str, str]]:
+        """``[(name, duckdb_type), ...]`` of ``view`` over ``files`` (path -> mtime_ns)."""
+        entry = self._entries.get(view, {"files": {}, "columns": []})
+        # Keyed relative to the root so the cache survives a change of working directory
+        keys = {f: Path(f).relative_to(self.root).as_posix() for f in files}
+        stamps = {keys[f]: mtime for f, mtime in files.items()}
+        fresh = sorted(f for f, mtime in files.items() if entry["files"].get(keys[f]) != mtime)
+        if fresh or set(entry["files"]) != set(stamps):
+            columns = dict(entry["columns"])
+            if fresh:
+                file_list = ", ".join(_sql_str(f) for f in fresh)
+                described = con.execute(
+                    f"DESCRIBE SELECT * FROM read_parquet([{file_list}], hive_partitioning = true, union_by_name = true)"
+                ).fetchall()
+                columns.update({row[0]: row[1] for row in described})
+            entry = {"files": stamps, "columns": [[name, typ] for name, typ in columns.items()]}
+            self._entries[view] = entry
+            self._dirty = True
+        return [(name, typ) for name, typ in entry["columns"]]
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.tmp-{os.getpid()}")
+        tmp.write_bytes(orjson.dumps(self._entries))
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+def _sql_str(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+class LakeDatabase:
+    """Open (and refresh when stale) the persistent view catalog; use as a context manager."""
+
+    def __init__(self, root: str, catalog: DatasetCatalog, path: Optional[str] = None) -> None:
+        self.root = Path(root).resolve()
+        self.path = Path(path) if path else Path(root) / DEFAULT_DB_NAME
+        self.views = catalog_views(catalog)
+        self.con: Optional[duckdb.DuckDBPyConnection] = None
+        self.sql: Optional[SqlRunner] = None
+
+    def _connect(self, read_only: bool) -> duckdb.DuckDBPyConnection:
+        if self.con is not None:
+            self.con.close()
+        self.con = duckdb.connect(str(self.path), read_only=read_only)
+        self.con.execute("SET parquet_metadata_cache = true")
+        self.sql = SqlRunner(self.con)
+        return self.con
+
+    def _stored_signatures(self) -> Dict[str, str]:
+        con = self._connect(read_only=True)
+        try:
+            return {v: sig for v, sig in con.execute("SELECT view, signature FROM lake_views").fetchall()}
+        except duckdb.CatalogException:
+            return {}
+        finally:
+            self.close()
+
+    def open(self, refresh: bool = False) -> List[str]:
+        """Connect, rebuilding stale views first; returns the views that were rebuilt or dropped.
+
+        A fresh catalog is opened read-only so concurrent ``query`` invocations do not contend
+        for DuckDB's write lock; only a refresh takes it.
+        """
+        scans = {view: scan_dataset(self.root / rel) for view, rel in self.views.items()}
+        stored: Dict[str, str] = {}
+        if self.path.exists():
+            stored = self._stored_signatures()
+            stale = sorted(
+                v for v, (sig, files) in scans.items() if refresh or stored.get(v) != (sig if files else None)
+            )
+            # Views of datasets removed from the catalog
+            stale += sorted(set(stored) - set(scans))
+            if not stale:
+                self._connect(read_only=True)
+                return []
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            stale = sorted(scans)
+        con = self._connect(read_only=False)
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS lake_views "
+            "(view VARCHAR PRIMARY KEY, path VARCHAR, signature VARCHAR, files INTEGER, refreshed_utc TIMESTAMPTZ)"
+        )
+        changed: List[str] = []
+        for view in stale:
+            sig, files = scans.get(view, (None, []))
+            if files or view in stored:
+                changed.append(view)
+            con.execute(f"DROP VIEW IF EXISTS {view}")
+            con.execute("DELETE FROM lake_views WHERE view = ?", [view])
+            if not files:
+                continue
+            file_list = ", ".join(_sql_str(f) for f in files)
+            con.execute(
+                f"CREATE VIEW {view} AS SELECT * FROM read_parquet([{file_list}], "
+                "hive_partitioning = true, union_by_name = true)"
+            )
+            con.execute(
+                "INSERT INTO lake_views VALUES (?, ?, ?, ?, current_timestamp)",
+                [view, self.views[view], sig, len(files)],
+            )
+        logger.debug("lake_db_refreshed", path=str(self.path), views=changed)
+        return changed
+
+    def execute(self, sql: str, params: Optional[Dict[str, Any]] = None) -> duckdb.DuckDBPyConnection:
+        """Run ``sql`` with ``$name``/``:name`` parameters bound from ``params`` (unused ones are ignored)."""
+        if self.con is None:
+            self.open()
+        cur = self.con.cursor()
+        # Scoring macros are temporary so a read-only catalog can still define them
+        register_macros(cur, temporary=True)
+        return self.sql.execute(self.sql.parse(sql, name="query"), params, cur)
+
+    def explain_analyze(self, sql: str, params: Optional[Dict[str, Any]] = None) -> Tuple[str, float]:
+        """DuckDB's EXPLAIN ANALYZE profile of ``sql`` and the wall-clock seconds it took."""
+        start = time.perf_counter()
+        rows = self.execute(f"EXPLAIN ANALYZE {sql}", params).fetchall()
+        return "\n".join(str(r[-1]) for r in rows), time.perf_counter() - start
+
+    def close(self) -> None:
+        if self.con is not None:
+            self.con.close()
+            self.con = None
+            self.sql = None
+
+    def __enter__(self) -> "LakeDatabase":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def parse_params(pairs: List[str]) -> Dict[str, Any]:
+    """``["season=2024", "season_type=REG"]`` -> ``{"season": 2024, "season_type": "REG"}``.
+
+    Values are decoded as JSON where possible (numbers, booleans, lists) and kept as strings
+    otherwise.
+    """
+    params: Dict[str, Any] = {}
+    for pair in pairs:
+        name, sep, raw = pair.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"expected name=value, got {pair!r}")
+        try:
+            params[name.strip()] = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            params[name.strip()] = raw
+    return params
+
+
+def write_result(cur: duckdb.DuckDBPyConnection, fmt: str, out: Optional[str] = None) -> Optional[Path]:
+    """Write a query result as a table/CSV on stdout, or as CSV/Parquet/Arrow IPC to ``out``."""
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"unknown format {fmt!r}; expected one of {', '.join(OUTPUT_FORMATS)}")
+    if fmt == "table":
+        print(cur.pl())
+        return None
+    if fmt == "csv" and out is None:
+        import pyarrow.csv as pcsv
+
+        pcsv.write_csv(cur.to_arrow_table(), sys.stdout.buffer)
+        return None
+    if out is None:
+        raise ValueError(f"--out is required for {fmt} output")
+    target = Path(out)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    table = cur.to_arrow_table()
+    if fmt == "csv":
+        import pyarrow.csv as pcsv
+
+        pcsv.write_csv(table, str(target))
+    elif fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, str(target), compression="zstd")
+    else:
+        import pyarrow as pa
+
+        with pa.OSFile(str(target), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return target
@@ -1,11 +1,19 @@
 # pyright: reportMissingImports=false, reportMissingModuleSource=false
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, is_dataclass
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Optional
 import orjson
 import hashlib
+import os
+import sqlite3
+
+
+DEFAULT_LINEAGE_DB = "catalog/lineage.db"
+DEFAULT_LINEAGE_JSON = "catalog/lineage.json"
 
 
 @dataclass
@@ -25,6 +33,42 @@ def compute_sha256_for_keys(rows: List[str]) -> str:
     return h.hexdigest()
 
 
+def _validation_key(layer: str, partition: str) -> str:
+    return f"{layer}/{partition or 'all'}"
+
+
+def is_validation_cached(
+    cache: Dict[str, Any] | None,
+    layer: str,
+    partition: str,
+    schema_version: str,
+    fingerprint: str,
+) -> bool:
+    if not cache or not fingerprint:
+        return False
+    entry = cache.get(_validation_key(layer, partition))
+    if not entry:
+        return False
+    return entry.get("schema_version") == schema_version and entry.get("fingerprint") == fingerprint
+
+
+def record_validation(
+    cache: Dict[str, Any] | None,
+    layer: str,
+    partition: str,
+    schema_version: str,
+    fingerprint: str,
+    validated_at: str,
+) -> None:
+    if cache is None or not fingerprint:
+        return
+    cache[_validation_key(layer, partition)] = {
+        "schema_version": schema_version,
+        "fingerprint": fingerprint,
+        "validated_at": validated_at,
+    }
+
+
 def load_lineage(path: str = "catalog/lineage.json") -> Dict[str, Any]:
     p = Path(path)
     if not p.exists():
@@ -35,31 +79,10 @@ def load_lineage(path: str = "catalog/lineage.json") -> Dict[str, Any]:
 def save_lineage(data: Dict[str, Any], path: str = "catalog/lineage.json") -> None:
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
-
-
-def update_dataset_lineage(
-    lineage: Dict[str, Any],
-    dataset: str,
-    last_ingest_utc: str,
-    rows_last_batch: int,
-    changed_partitions: List[str],
-    partition_stats: Dict[str, PartitionStats] | None = None,
-) -> Dict[str, Any]:
-    ds = lineage.get(dataset, {})
-    ds.update(
-        {
-            "last_ingest_utc": last_ingest_utc,
-            "rows_last_batch": rows_last_batch,
-            "changed_partitions": list(changed_partitions),
-            "partitions": ds.get("partitions", {}),
-        }
-    )
-    if partition_stats:
-        for part, st in partition_stats.items():
-            ds["partitions"][part] = asdict(st)
-    lineage[dataset] = ds
-    return lineage
+    # Concurrent jobs each export at the end of a run; replace atomically so readers never see a torn file
+    tmp = p.with_name(f".{p.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    os.replace(tmp, p)
 
 
 def record_partition_counts(
@@ -74,3 +97,434 @@ def record_partition_counts(
     lineage[dataset] = ds
     return lineage
 
+
+_LINEAGE_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS datasets (
+        dataset TEXT PRIMARY KEY,
+        last_ingest_utc TEXT,
+        rows_last_batch INTEGER,
+        changed_partitions TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS partitions (
+        dataset TEXT NOT NULL,
+        partition TEXT NOT NULL,
+        row_count INTEGER,
+        sha256_fingerprint TEXT,
+        max_ingested_at TEXT,
+        min_ingested_at TEXT,
+        updated_utc TEXT,
+        PRIMARY KEY (dataset, partition)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS validations (
+        dataset TEXT NOT NULL,
+        key TEXT NOT NULL,
+        schema_version TEXT,
+        fingerprint TEXT,
+        validated_at TEXT,
+        PRIMARY KEY (dataset, key)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id TEXT,
+        flow TEXT,
+        dataset TEXT NOT NULL,
+        event_utc TEXT NOT NULL,
+        status TEXT,
+        rows INTEGER,
+        changed_partitions TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS report_partitions (
+        report TEXT NOT NULL,
+        season INTEGER NOT NULL,
+        week INTEGER NOT NULL,
+        input_fingerprint TEXT,
+        materialized_utc TEXT,
+        PRIMARY KEY (report, season, week)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS checkpoints (
+        flow TEXT NOT NULL,
+        dataset TEXT NOT NULL,
+        unit TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        status TEXT NOT NULL,
+        run_id TEXT,
+        attempts INTEGER,
+        partitions TEXT,
+        error TEXT,
+        updated_utc TEXT,
+        PRIMARY KEY (flow, dataset, unit, stage)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_runs_dataset ON runs (dataset, event_utc)",
+    "CREATE INDEX IF NOT EXISTS idx_runs_run_id ON runs (run_id)",
+    "CREATE INDEX IF NOT EXISTS idx_partitions_updated ON partitions (dataset, updated_utc)",
+]
+
+
+def _stats_dict(st: Any) -> Dict[str, Any]:
+    if is_dataclass(st):
+        return asdict(st)
+    return dict(st or {})
+
+
+class LineageStore:
+    """Transactional lineage store backed by an embedded SQLite database.
+
+    Partitions, validation cache entries and datasets are upserted row-by-row inside
+    ``BEGIN IMMEDIATE`` transactions, so concurrent jobs only touch the rows they changed.
+    Every dataset result is also appended to ``runs`` as history. ``to_dict``/``export_json``
+    produce the legacy ``catalog/lineage.json`` shape; on first open an existing JSON file is
+    imported.
+    """
+
+    def __init__(self, path: str = DEFAULT_LINEAGE_DB, json_path: Optional[str] = DEFAULT_LINEAGE_JSON) -> None:
+        self.path = Path(path)
+        self.json_path = Path(json_path) if json_path else None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._con = sqlite3.connect(str(self.path), timeout=60.0, isolation_level=None)
+        self._con.row_factory = sqlite3.Row
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        # Validation cache as handed out by validation_cache(); used to upsert only changed keys
+        self._validation_snapshots: Dict[str, Dict[str, Any]] = {}
+        with self.transaction():
+            for ddl in _LINEAGE_DDL:
+                self._con.execute(ddl)
+        self._maybe_import_json()
+
+    def __enter__(self) -> "LineageStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._con.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        self._con.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._con
+        except BaseException:
+            self._con.execute("ROLLBACK")
+            raise
+        self._con.execute("COMMIT")
+
+    def _maybe_import_json(self) -> None:
+        if self.json_path is None or not self.json_path.exists():
+            return
+        with self.transaction() as con:
+            done = con.execute("SELECT value FROM meta WHERE key = 'json_imported'").fetchone()
+            if done is not None:
+                return
+            self._import_dict(con, load_lineage(str(self.json_path)))
+            con.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_imported', ?)",
+                (datetime.now(timezone.utc).isoformat(),),
+            )
+
+    def _import_dict(self, con: sqlite3.Connection, data: Dict[str, Any]) -> None:
+        for dataset, ds in data.items():
+            con.execute(
+                "INSERT OR REPLACE INTO datasets (dataset, last_ingest_utc, rows_last_batch, changed_partitions) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    dataset,
+                    ds.get("last_ingest_utc"),
+                    ds.get("rows_last_batch"),
+                    orjson.dumps(list(ds.get("changed_partitions") or [])).decode(),
+                ),
+            )
+            for part, st in (ds.get("partitions") or {}).items():
+                self._upsert_partition(con, dataset, part, st, ds.get("last_ingest_utc"))
+            self._upsert_validations(con, dataset, ds.get("validation") or {})
+
+    @staticmethod
+    def _upsert_partition(
+        con: sqlite3.Connection, dataset: str, partition: str, st: Dict[str, Any], updated_utc: Optional[str]
+    ) -> None:
+        con.execute(
+            """
+            INSERT INTO partitions (dataset, partition, row_count, sha256_fingerprint,
+                                    max_ingested_at, min_ingested_at, updated_utc)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (dataset, partition) DO UPDATE SET
+                row_count = COALESCE(excluded.row_count, partitions.row_count),
+                sha256_fingerprint = COALESCE(excluded.sha256_fingerprint, partitions.sha256_fingerprint),
+                max_ingested_at = excluded.max_ingested_at,
+                min_ingested_at = excluded.min_ingested_at,
+                updated_utc = excluded.updated_utc
+            """,
+            (
+                dataset,
+                partition,
+                st.get("row_count"),
+                st.get("sha256_fingerprint"),
+                st.get("max_ingested_at"),
+                st.get("min_ingested_at"),
+                updated_utc,
+            ),
+        )
+
+    @staticmethod
+    def _upsert_row_count(
+        con: sqlite3.Connection, dataset: str, partition: str, row_count: int, updated_utc: Optional[str]
+    ) -> None:
+        # Count-only update: leaves fingerprint and ingested_at bounds untouched
+        con.execute(
+            """
+            INSERT INTO partitions (dataset, partition, row_count, updated_utc)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (dataset, partition) DO UPDATE SET
+                row_count = excluded.row_count,
+                updated_utc = excluded.updated_utc
+            """,
+            (dataset, partition, int(row_count), updated_utc),
+        )
+
+    @staticmethod
+    def _upsert_validations(con: sqlite3.Connection, dataset: str, cache: Dict[str, Any]) -> None:
+        con.executemany(
+            "INSERT OR REPLACE INTO validations (dataset, key, schema_version, fingerprint, validated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (dataset, key, e.get("schema_version"), e.get("fingerprint"), e.get("validated_at"))
+                for key, e in cache.items()
+            ],
+        )
+
+    def record_dataset_run(
+        self,
+        dataset: str,
+        last_ingest_utc: str,
+        rows_last_batch: int,
+        changed_partitions: List[str],
+        partition_stats: Dict[str, Any] | None = None,
+        partition_row_counts: Dict[str, int] | None = None,
+        validation_cache: Dict[str, Any] | None = None,
+        run_id: Optional[str] = None,
+        flow: Optional[str] = None,
+    ) -> None:
+        """Atomically record one successful dataset result: dataset row, touched partitions,
+        validation entries that changed since ``validation_cache`` was handed out, and a run entry."""
+        with self.transaction() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO datasets (dataset, last_ingest_utc, rows_last_batch, changed_partitions) "
+                "VALUES (?, ?, ?, ?)",
+                (dataset, last_ingest_utc, int(rows_last_batch), orjson.dumps(list(changed_partitions)).decode()),
+            )
+            for part, st in (partition_stats or {}).items():
+                self._upsert_partition(con, dataset, part, _stats_dict(st), last_ingest_utc)
+            for part, rc in (partition_row_counts or {}).items():
+                self._upsert_row_count(con, dataset, part, rc, last_ingest_utc)
+            if validation_cache:
+                snapshot = self._validation_snapshots.get(dataset, {})
+                changed = {k: v for k, v in validation_cache.items() if snapshot.get(k) != v}
+                self._upsert_validations(con, dataset, changed)
+                self._validation_snapshots[dataset] = {k: dict(v) for k, v in validation_cache.items()}
+            self._append_run(con, dataset, last_ingest_utc, "completed", rows_last_batch, changed_partitions, run_id, flow)
+
+    def record_run_failure(
+        self,
+        dataset: str,
+        event_utc: str,
+        run_id: Optional[str] = None,
+        flow: Optional[str] = None,
+    ) -> None:
+        """Append a failed run entry; the last successful dataset/partition state is left as is."""
+        with self.transaction() as con:
+            self._append_run(con, dataset, event_utc, "failed", 0, [], run_id, flow)
+
+    @staticmethod
+    def _append_run(
+        con: sqlite3.Connection,
+        dataset: str,
+        event_utc: str,
+        status: str,
+        rows: int,
+        changed_partitions: List[str],
+        run_id: Optional[str],
+        flow: Optional[str],
+    ) -> None:
+        con.execute(
+            "INSERT INTO runs (run_id, flow, dataset, event_utc, status, rows, changed_partitions) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (run_id, flow, dataset, event_utc, status, int(rows), orjson.dumps(list(changed_partitions)).decode()),
+        )
+
+    def record_partition_counts(self, dataset: str, partition: str, row_count: int) -> None:
+        with self.transaction() as con:
+            self._upsert_row_count(con, dataset, partition, row_count, datetime.now(timezone.utc).isoformat())
+
+    def validation_cache(self, dataset: str) -> Dict[str, Any]:
+        rows = self._con.execute(
+            "SELECT key, schema_version, fingerprint, validated_at FROM validations WHERE dataset = ?",
+            (dataset,),
+        ).fetchall()
+        cache = {
+            r["key"]: {
+                "schema_version": r["schema_version"],
+                "fingerprint": r["fingerprint"],
+                "validated_at": r["validated_at"],
+            }
+            for r in rows
+        }
+        self._validation_snapshots[dataset] = {k: dict(v) for k, v in cache.items()}
+        return cache
+
+    def report_weeks(self, report: str, season: int) -> Dict[int, str]:
+        """Input fingerprint per week of the last materialization of a gold report season."""
+        rows = self._con.execute(
+            "SELECT week, input_fingerprint FROM report_partitions WHERE report = ? AND season = ?",
+            (report, int(season)),
+        ).fetchall()
+        return {int(r["week"]): r["input_fingerprint"] for r in rows}
+
+    def record_report_weeks(self, report: str, season: int, fingerprints: Dict[int, str]) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        with self.transaction() as con:
+            con.executemany(
+                "INSERT INTO report_partitions (report, season, week, input_fingerprint, materialized_utc) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(report, season, week) DO UPDATE SET "
+                "input_fingerprint = excluded.input_fingerprint, materialized_utc = excluded.materialized_utc",
+                [(report, int(season), int(week), fp, now) for week, fp in sorted(fingerprints.items())],
+            )
+
+    def checkpoints(self, flow: str, dataset: str) -> Dict[tuple, Dict[str, Any]]:
+        """Checkpoints of a resumable flow keyed by ``(unit, stage)``."""
+        rows = self._con.execute(
+            "SELECT unit, stage, status, run_id, attempts, partitions, error, updated_utc "
+            "FROM checkpoints WHERE flow = ? AND dataset = ?",
+            (flow, dataset),
+        ).fetchall()
+        out: Dict[tuple, Dict[str, Any]] = {}
+        for r in rows:
+            rec = dict(r)
+            rec["partitions"] = orjson.loads(rec.get("partitions") or "[]")
+            out[(r["unit"], r["stage"])] = rec
+        return out
+
+    def record_checkpoint(
+        self,
+        flow: str,
+        dataset: str,
+        unit: str,
+        stage: str,
+        status: str,
+        run_id: Optional[str] = None,
+        attempts: int = 1,
+        partitions: Optional[List[str]] = None,
+        partition_stats: Dict[str, Any] | None = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Upsert one ``(dataset, unit, stage)`` checkpoint.
+
+        ``partition_stats`` are written in the same transaction, so a unit counted as done also has
+        its partitions in lineage even if the rest of the dataset later fails.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        with self.transaction() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO checkpoints "
+                "(flow, dataset, unit, stage, status, run_id, attempts, partitions, error, updated_utc) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    flow,
+                    dataset,
+                    unit,
+                    stage,
+                    status,
+                    run_id,
+                    int(attempts),
+                    orjson.dumps(list(partitions or [])).decode(),
+                    error,
+                    now,
+                ),
+            )
+            for part, st in (partition_stats or {}).items():
+                self._upsert_partition(con, dataset, part, _stats_dict(st), now)
+
+    def clear_checkpoints(self, flow: str, dataset: str) -> None:
+        with self.transaction() as con:
+            con.execute("DELETE FROM checkpoints WHERE flow = ? AND dataset = ?", (flow, dataset))
+
+    def partitions(self, dataset: str) -> Dict[str, Dict[str, Any]]:
+        rows = self._con.execute(
+            "SELECT partition, row_count, sha256_fingerprint, max_ingested_at, min_ingested_at "
+            "FROM partitions WHERE dataset = ? ORDER BY partition",
+            (dataset,),
+        ).fetchall()
+        return {
+            r["partition"]: {
+                "row_count": r["row_count"],
+                "sha256_fingerprint": r["sha256_fingerprint"],
+                "max_ingested_at": r["max_ingested_at"],
+                "min_ingested_at": r["min_ingested_at"],
+            }
+            for r in rows
+        }
+
+    def dataset(self, dataset: str) -> Dict[str, Any]:
+        row = self._con.execute(
+            "SELECT last_ingest_utc, rows_last_batch, changed_partitions FROM datasets WHERE dataset = ?",
+            (dataset,),
+        ).fetchone()
+        if row is None:
+            return {}
+        out: Dict[str, Any] = {
+            "last_ingest_utc": row["last_ingest_utc"],
+            "rows_last_batch": row["rows_last_batch"],
+            "changed_partitions": orjson.loads(row["changed_partitions"] or "[]"),
+            "partitions": self.partitions(dataset),
+        }
+        cache = self.validation_cache(dataset)
+        if cache:
+            out["validation"] = cache
+        return out
+
+    def runs(
+        self, dataset: Optional[str] = None, run_id: Optional[str] = None, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        clauses, args = [], []
+        if dataset:
+            clauses.append("dataset = ?")
+            args.append(dataset)
+        if run_id:
+            clauses.append("run_id = ?")
+            args.append(run_id)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        cur = self._con.execute(f"SELECT * FROM runs {where}ORDER BY id DESC LIMIT ?", (*args, limit))
+        out = []
+        for r in cur.fetchall():
+            rec = dict(r)
+            rec["changed_partitions"] = orjson.loads(rec.get("changed_partitions") or "[]")
+            out.append(rec)
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        names = [r["dataset"] for r in self._con.execute("SELECT dataset FROM datasets ORDER BY dataset")]
+        return {name: self.dataset(name) for name in names}
+
+    def export_json(self, path: Optional[str] = None) -> Path:
+        target = Path(path) if path else (self.json_path or Path(DEFAULT_LINEAGE_JSON))
+        save_lineage(self.to_dict(), str(target))
+        return target
@@ -0,0 +1,506 @@
+# pyright: reportMissingImports=false, reportMissingModuleSource=false
+"""DraftKings Classic and Showdown lineup optimizer.
+
+Roster structure and salary cap come from ``catalog/draftkings/{classic,showdown}.yml``.
+Salaries come from a slate file. Projections are each player's mean weekly ``dk_ppr_points``
+over recent weeks of gold ``player_week_stats``, unless the slate brings its own.
+
+Lineups are solved exactly by dynamic programming over a salary grid, with no external solver.
+The grid step is the gcd of the salaries, i.e. 100 on DraftKings slates.
+
+- Classic: each position is a 0/1 knapsack over "exactly k players using salary s". Positions
+  are combined by max-plus convolution over salary, once per way of filling the FLEX slots.
+- Showdown: one knapsack over every player, where a player is left out, taken as captain
+  (points and salary times the multiplier) or taken as FLEX.
+
+Lineups are solved in batches. Each lineup in a batch has its own projections, jittered by
+``randomness`` times the player's weekly spread. Before solving, players are dropped when
+enough cheaper, better players of their group exist in every lineup of the batch. Diversity is
+enforced on acceptance: no duplicates, at least ``min_unique`` players different from every
+earlier lineup, and no player in more than ``max_exposure`` of the lineups.
+"""
+from __future__ import annotations
+
+import itertools
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from math import gcd
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+import structlog
+import yaml
+
+from .bestball import LineupSlot
+
+if TYPE_CHECKING:
+    import polars as pl
+
+logger = structlog.get_logger(__name__)
+
+
+CONTESTS: Dict[str, Path] = {
+    "classic": Path(__file__).resolve().parents[1] / "catalog" / "draftkings" / "classic.yml",
+    "showdown": Path(__file__).resolve().parents[1] / "catalog" / "draftkings" / "showdown.yml",
+}
+
+
+@dataclass(frozen=True)
+class Contest:
+    name: str
+    slots: Tuple[LineupSlot, ...]
+    salary_cap: int
+    # Captain slot and its points/salary multipliers (Showdown)
+    captain: Optional[str] = None
+    captain_points: float = 1.0
+    captain_salary: float = 1.0
+
+    @property
+    def size(self) -> int:
+        return sum(s.count for s in self.slots)
+
+
+@dataclass(frozen=True)
+class Slate:
+    player_ids: Tuple[str, ...]
+    positions: Tuple[str, ...]
+    salaries: np.ndarray  # int
+    projections: np.ndarray
+    # Per-player spread scaling the projection noise; the weekly standard deviation by default
+    spread: np.ndarray
+
+
+@lru_cache(maxsize=None)
+def load_contest(name: str) -> Contest:
+    """Contest by catalog name (``classic``, ``showdown``) or by path to a rules YAML."""
+    path = CONTESTS.get(name) or Path(name)
+    lineup = (yaml.safe_load(path.read_text()) or {}).get("lineup") or {}
+    if not lineup.get("slots"):
+        raise ValueError(f"{path}: no lineup slots")
+    slots = tuple(LineupSlot(s["slot"], int(s["count"]), tuple(s["eligible_positions"])) for s in lineup["slots"])
+    multiplier = lineup.get("captain_multiplier")
+    if not multiplier:
+        return Contest(name, slots, int(lineup.get("salary_cap") or 0))
+    if len(slots) != 2 or slots[0].count != 1 or set(slots[0].eligible) != set(slots[1].eligible):
+        raise ValueError(f"{path}: captain contests need one captain slot and one FLEX slot of the same positions")
+    return Contest(
+        name,
+        slots,
+        int(lineup.get("salary_cap") or 0),
+        captain=slots[0].slot,
+        captain_points=float(multiplier.get("points", 1.0)),
+        captain_salary=float(multiplier.get("salary", 1.0)),
+    )
+
+
+def build_projections(
+    root: str,
+    season: int,
+    week: Optional[int] = None,
+    window: int = 4,
+    points: str = "dk_ppr_points",
+    season_type: str = "REG",
+) -> "pl.DataFrame":
+    """Mean and spread of ``points`` over each player's last ``window`` games before ``week``.
+
+    Reads one season of gold ``player_week_stats``; ``week=None`` projects from the latest weeks.
+    """
+    import duckdb
+
+    base = Path(root) / "gold" / "reports" / "player_week_stats" / f"season={season}"
+    if not any(base.rglob("*.parquet")):
+        raise FileNotFoundError(f"{base}: no player_week_stats for season {season}")
+    return duckdb.execute(
+        f"""
+        WITH games AS (
+            SELECT player_id, any_value(player_name) AS player_name, any_value(position) AS position,
+                   any_value(team) AS team, week, sum(COALESCE({points}, 0)) AS points
+            FROM read_parquet('{base.as_posix()}/*/*.parquet', hive_partitioning = true)
+            WHERE season_type = $season_type AND ($week IS NULL OR week < $week)
+            GROUP BY player_id, week
+        ), recent AS (
+            SELECT *, row_number() OVER (PARTITION BY player_id ORDER BY week DESC) AS recency FROM games
+        )
+        SELECT player_id, arg_max(player_name, week) AS player_name, arg_max(position, week) AS position,
+               arg_max(team, week) AS team, count(*) AS games, avg(points) AS projection,
+               COALESCE(stddev_samp(points), 0.0) AS spread
+        FROM recent
+        WHERE recency <= $window
+        GROUP BY player_id
+        ORDER BY projection DESC
+        """,
+        {"season_type": season_type, "week": week, "window": window},
+    ).pl()
+
+
+def load_slate(path: str, projections: Optional["pl.DataFrame"] = None) -> Tuple[Slate, "pl.DataFrame"]:
+    """Slate from a CSV or Parquet file of ``player_id`` and ``salary`` rows.
+
+    ``position``, ``projection`` and ``spread`` come from the file when it has them (e.g. DST
+    projections) and otherwise from ``projections``. Players left without a projection are
+    dropped. Returns the slate and its player table.
+    """
+    import polars as pl
+
+    frame = pl.read_parquet(path) if path.endswith(".parquet") else pl.read_csv(path)
+    frame = frame.with_columns(pl.col("player_id").cast(pl.Utf8), pl.col("salary").cast(pl.Int64))
+    columns = [c for c in ("player_name", "team", "position", "projection", "spread") if projections is not None and c in projections.columns]
+    if columns:
+        frame = frame.join(
+            projections.select("player_id", *[pl.col(c).alias(f"_{c}") for c in columns]), on="player_id", how="left"
+        )
+        frame = frame.with_columns(
+            [(pl.coalesce(c, f"_{c}") if c in frame.columns else pl.col(f"_{c}")).alias(c) for c in columns]
+        ).drop([f"_{c}" for c in columns])
+    if "position" not in frame.columns or "projection" not in frame.columns:
+        raise ValueError(f"{path}: slate players need a position and a projection")
+    if "spread" not in frame.columns:
+        frame = frame.with_columns(pl.lit(0.0).alias("spread"))
+    frame = frame.filter(pl.col("projection").is_not_null() & pl.col("position").is_not_null()).with_columns(
+        pl.col("projection").cast(pl.Float64), pl.col("spread").cast(pl.Float64).fill_null(0.0)
+    )
+    slate = Slate(
+        player_ids=tuple(frame["player_id"]),
+        positions=tuple(frame["position"]),
+        salaries=frame["salary"].to_numpy().astype(np.int64),
+        projections=frame["projection"].to_numpy(),
+        spread=frame["spread"].to_numpy(),
+    )
+    return slate, frame
+
+
+@dataclass(frozen=True)
+class _Group:
+    """Slate players solved by one knapsack; dimension ``d`` counts players taken with option ``d``."""
+
+    members: np.ndarray
+    dims: Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class _Plan:
+    groups: Tuple[_Group, ...]
+    # Final (a, b) count state of every group, one tuple per way of filling the slots
+    allocations: Tuple[Tuple[Tuple[int, int], ...], ...]
+    # (points, salary) multiplier of each option
+    options: Tuple[Tuple[float, float], ...]
+    weights: np.ndarray  # (players, options) salary in grid units
+    cap: int  # salary cap in grid units
+
+
+def _plan(contest: Contest, slate: Slate) -> _Plan:
+    positions = np.array(slate.positions, dtype=object)
+    if contest.captain is not None:
+        captain, flex = contest.slots
+        members = np.flatnonzero(np.isin(positions, flex.eligible))
+        groups: Tuple[_Group, ...] = (_Group(members, (2, flex.count + 1)),)
+        allocations: Tuple[Tuple[Tuple[int, int], ...], ...] = (((1, flex.count),),)
+        options = ((contest.captain_points, contest.captain_salary), (1.0, 1.0))
+    else:
+        present = set(slate.positions)
+        slots = [s for s in contest.slots if present & set(s.eligible)]
+        for slot in contest.slots:
+            if slot not in slots:
+                logger.warning("lineup_slot_unfilled", slot=slot.slot, eligible=list(slot.eligible))
+        choices = [sorted(present & set(s.eligible)) for s in slots for _ in range(s.count)]
+        fills = sorted({tuple(sorted(Counter(fill).items())) for fill in itertools.product(*choices)})
+        used = sorted({p for fill in fills for p, _ in fill})
+        # Positions with a single count first, so allocations share the longest convolution prefix
+        variants = {p: len({dict(fill).get(p, 0) for fill in fills}) for p in used}
+        used.sort(key=lambda p: (variants[p], p))
+        top = {p: max(dict(fill).get(p, 0) for fill in fills) for p in used}
+        groups = tuple(_Group(np.flatnonzero(positions == p), (top[p] + 1, 1)) for p in used)
+        allocations = tuple(tuple((dict(fill).get(p, 0), 0) for p in used) for fill in fills)
+        options = ((1.0, 1.0),)
+    salaries = np.round(slate.salaries[:, None] * np.array([s for _, s in options])[None, :]).astype(np.int64)
+    step = gcd(int(contest.salary_cap), *(int(s) for s in np.unique(salaries))) or 1
+    weights = salaries // step
+    # No lineup spends more than its most expensive players, so a smaller grid does
+    most = int(np.sort(weights.max(axis=1))[::-1][: contest.size].sum())
+    cap = min(contest.salary_cap // step, most) if contest.salary_cap else most
+    return _Plan(groups, allocations, options, weights, cap)
+
+
+def _undominated(values: np.ndarray, salaries: np.ndarray, picks: int) -> np.ndarray:
+    """Players not beaten on both salary and points by ``picks`` others in every row of ``values``.
+
+    A player with that many cheaper, better alternatives can always be swapped for an unused one,
+    so it never appears in an optimal lineup for that row.
+    """
+    n = values.shape[1]
+    cheaper = salaries[:, None] <= salaries[None, :]
+    strictly = salaries[:, None] < salaries[None, :]
+    earlier = np.arange(n)[:, None] < np.arange(n)[None, :]
+    vi, vj = values[:, :, None], values[:, None, :]
+    beats = cheaper & (vi >= vj) & (strictly | (vi > vj) | earlier)
+    return (beats.sum(axis=1) < picks).any(axis=0)
+
+
+def _knapsack(weights: np.ndarray, values: np.ndarray, dims: Tuple[int, int], size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Best points for every (row, option counts, exact salary) over the given players.
+
+    ``weights`` is (players, options), ``values`` (rows, players, options). Returns the table
+    (rows, dims..., size) and the option each player took in every state (players, rows, dims..., size),
+    0 for left out. Players given cheapest first keep the reachable salaries, the only columns
+    updated, narrow for longest.
+    """
+    rows, n = values.shape[:2]
+    table = np.full((rows, *dims, size), -np.inf, dtype=np.float32)
+    table[:, 0, 0, 0] = 0.0
+    taken = np.zeros((n, rows, *dims, size), dtype=np.int8)
+    reach = 1
+    for i in range(n):
+        reach = min(size, reach + int(weights[i].max()))
+        # Every option reads the table as it was before player i, so each player is taken once
+        moves = []
+        for option in range(weights.shape[1]):
+            w = int(weights[i, option])
+            if w >= reach or dims[option] == 1:
+                continue
+            v = values[:, i, option][:, None, None, None]
+            if option == 0:
+                src, dst = table[:, :-1, :, : reach - w], (slice(None), slice(1, None), slice(None), slice(w, reach))
+            else:
+                src, dst = table[:, :, :-1, : reach - w], (slice(None), slice(None), slice(1, None), slice(w, reach))
+            moves.append((option, dst, src + v))
+        for option, dst, cand in moves:
+            better = cand > table[dst]
+            np.copyto(table[dst], cand, where=better)
+            np.copyto(taken[i][dst], np.int8(option + 1), where=better)
+    return table, taken
+
+
+def _support(table: np.ndarray) -> Tuple[np.ndarray, int]:
+    """The salary columns of a (rows, salary) table where any row is finite, and the first one."""
+    finite = np.flatnonzero(np.isfinite(table).any(axis=0))
+    if not len(finite):
+        return table[:, :1], 0
+    return table[:, finite[0] : finite[-1] + 1], int(finite[0])
+
+
+def _maxplus(x: np.ndarray, x_lo: int, y: np.ndarray, y_lo: int, size: int) -> Tuple[np.ndarray, int, np.ndarray]:
+    """``z[s] = max over t of x[t] + y[s - t]`` per row, for tables starting at salaries ``x_lo``
+    and ``y_lo``. Only salaries below ``size`` are kept.
+
+    Returns ``z``, its first salary and the maximizing ``t`` (absolute salary).
+    """
+    rows, nx = x.shape
+    lo = x_lo + y_lo
+    width = max(1, min(nx + y.shape[1] - 1, size - lo))
+    t, s = np.arange(nx)[:, None], np.arange(width)[None, :]
+    shift = np.where((s >= t) & (s - t < y.shape[1]), s - t, y.shape[1])
+    padded = np.concatenate([y, np.full((rows, 1), -np.inf, dtype=y.dtype)], axis=1)
+    cells = x[:, :, None] + padded[:, shift]
+    split = cells.argmax(axis=1)
+    return np.take_along_axis(cells, split[:, None, :], axis=1)[:, 0], lo, split + x_lo
+
+
+def _solve(plan: _Plan, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Optimal lineup for every row of ``values`` (rows, players); ``-inf`` excludes a player.
+
+    Returns the option each player is taken with (rows, players), 0 for left out, and the
+    lineup points per row (``-inf`` when no lineup fits).
+    """
+    rows, n = values.shape
+    size = plan.cap + 1
+    scale = np.array([p for p, _ in plan.options])
+    tables, solved = [], []
+    for group in plan.groups:
+        members = group.members[
+            (plan.weights[group.members].min(axis=1) < size) & np.isfinite(values[:, group.members]).any(axis=0)
+        ]
+        members = members[_undominated(values[:, members], plan.weights[members, -1], sum(group.dims) - len(group.dims))]
+        members = members[np.argsort(plan.weights[members, -1], kind="stable")]
+        table, taken = _knapsack(plan.weights[members], values[:, members, None] * scale, group.dims, size)
+        tables.append(table)
+        solved.append((members, taken))
+
+    # Max-plus convolution over salary, group by group, for every allocation. Tables are cut to
+    # the salaries they can reach and prefixes are shared between allocations.
+    prefixes: Dict[Tuple[Tuple[int, int], ...], Tuple[np.ndarray, int, Optional[np.ndarray]]] = {}
+
+    def prefix(alloc: Tuple[Tuple[int, int], ...]) -> Tuple[np.ndarray, int, Optional[np.ndarray]]:
+        if alloc not in prefixes:
+            k = len(alloc) - 1
+            own, own_lo = _support(tables[k][:, alloc[k][0], alloc[k][1], :])
+            if k == 0:
+                prefixes[alloc] = (own, own_lo, None)
+            else:
+                head, head_lo, _ = prefix(alloc[:-1])
+                prefixes[alloc] = _maxplus(head, head_lo, own, own_lo, size)
+        return prefixes[alloc]
+
+    totals = np.full((len(plan.allocations), rows), -np.inf)
+    # Salary of the groups before the last, and of the last group
+    ends = np.zeros((len(plan.allocations), rows, 2), dtype=np.int64)
+    for a, alloc in enumerate(plan.allocations):
+        *head, (ca, cb) = alloc
+        last = tables[len(head)][:, ca, cb, :]
+        if not head:
+            ends[a, :, 1] = last.argmax(axis=1)
+            totals[a] = last.max(axis=1)
+            continue
+        # The last group takes the best of the salary left: a running max instead of a convolution
+        best = np.maximum.accumulate(last, axis=1)
+        at = np.maximum.accumulate(np.where(last == best, np.arange(size), 0), axis=1)
+        spent, lo, _ = prefix(tuple(head))
+        left = plan.cap - (lo + np.arange(spent.shape[1]))
+        spent = np.where(left >= 0, spent + best[:, np.maximum(left, 0)], -np.inf)
+        cut = spent.argmax(axis=1)
+        ends[a, :, 0] = lo + cut
+        ends[a, :, 1] = at[np.arange(rows), np.maximum(plan.cap - ends[a, :, 0], 0)]
+        totals[a] = spent.max(axis=1)
+
+    choice = totals.argmax(axis=0)
+    points = totals.max(axis=0)
+    feasible = np.isfinite(points)
+    lineups = np.zeros((rows, n), dtype=np.int8)
+    row = np.arange(rows)
+    for a, alloc in enumerate(plan.allocations):
+        mine = row[feasible & (choice == a)]
+        if not len(mine):
+            continue
+        # Salary of each group, walking the convolution splits back from the last group
+        salary = np.zeros((len(alloc), len(mine)), dtype=np.int64)
+        k = len(alloc) - 1
+        salary[k] = ends[a, mine, 1]
+        s = ends[a, mine, 0]
+        for j in range(k - 1, -1, -1):
+            if j == 0:
+                salary[0] = s
+                break
+            _, lo, split = prefixes[alloc[: j + 1]]
+            t = split[mine, s - lo]
+            salary[j], s = s - t, t
+        for g, ((members, taken), (ca, cb)) in enumerate(zip(solved, alloc)):
+            state = [np.full(len(mine), ca), np.full(len(mine), cb)]
+            s = salary[g].copy()
+            for i in range(len(members) - 1, -1, -1):
+                took = taken[i][mine, state[0], state[1], s]
+                for option in range(plan.weights.shape[1]):
+                    hit = took == option + 1
+                    lineups[mine[hit], members[i]] = option + 1
+                    state[option] -= hit
+                    s -= hit * plan.weights[members[i], option]
+    return lineups, points
+
+
+def optimize(
+    slate: Slate,
+    contest: Contest,
+    n_lineups: int = 1,
+    randomness: float = 0.0,
+    min_unique: int = 1,
+    max_exposure: float = 1.0,
+    batch_size: int = 16,
+    patience: int = 5,
+    seed: int = 0,
+) -> np.ndarray:
+    """Up to ``n_lineups`` distinct lineups, best first, as (lineups, players) slate options.
+
+    The first lineup is the optimum of the unjittered projections. The rest are optima of
+    jittered projections that pass the diversity rules. Generation stops at ``n_lineups`` or after
+    ``patience`` batches in a row add nothing.
+    """
+    plan = _plan(contest, slate)
+    rng = np.random.default_rng(seed)
+    n = len(slate.player_ids)
+    limit = max(1, int(max_exposure * n_lineups))
+    accepted = np.zeros((n_lineups, n), dtype=np.int8)
+    chosen = np.zeros((n_lineups, n), dtype=np.float32)
+    exposure = np.zeros(n, dtype=np.int64)
+    count, idle, first = 0, 0, True
+    while count < n_lineups and idle < patience:
+        rows = 1 if first or randomness <= 0 else batch_size
+        values = np.repeat(slate.projections[None, :], rows, axis=0)
+        if not first:
+            values = values + randomness * slate.spread * rng.standard_normal((rows, n))
+        values[:, exposure >= limit] = -np.inf
+        lineups, points = _solve(plan, values)
+        added = 0
+        for lineup in lineups[np.isfinite(points)]:
+            picked = lineup > 0
+            size = int(picked.sum())
+            if (exposure[picked] >= limit).any():
+                continue
+            if count and (chosen[:count] @ picked.astype(np.float32)).max() > size - max(min_unique, 1):
+                continue
+            accepted[count] = lineup
+            chosen[count] = picked
+            exposure += picked
+            count += 1
+            added += 1
+            if count == n_lineups:
+                break
+        idle = 0 if added else idle + 1
+        first = False
+    options = accepted[:count]
+    scale = np.array([0.0] + [p for p, _ in plan.options])
+    totals = (scale[options] * slate.projections).sum(axis=1)
+    return options[np.argsort(-totals, kind="stable")]
+
+
+def lineup_frame(slate: Slate, players: "pl.DataFrame", contest: Contest, lineups: np.ndarray) -> "pl.DataFrame":
+    """One row per lineup slot: ``lineup``, ``slot``, the player columns, ``salary`` and ``projection``.
+
+    Captain rows carry the multiplied salary and projection. Classic slots are filled narrowest
+    first, so FLEX takes the player left over.
+    """
+    import polars as pl
+
+    info = players.select([c for c in ("player_id", "player_name", "team", "position") if c in players.columns])
+    records: List[Dict[str, object]] = []
+    for k, lineup in enumerate(lineups, start=1):
+        if contest.captain is not None:
+            captain, flex = contest.slots
+            taken = [(captain.slot, i, contest.captain_points, contest.captain_salary) for i in np.flatnonzero(lineup == 1)]
+            taken += [(flex.slot, i, 1.0, 1.0) for i in np.flatnonzero(lineup == 2)]
+        else:
+            left = sorted(np.flatnonzero(lineup > 0), key=lambda i: -slate.projections[i])
+            taken = []
+            for slot in sorted(contest.slots, key=lambda s: len(s.eligible)):
+                fits = [i for i in left if slate.positions[i] in slot.eligible][: slot.count]
+                left = [i for i in left if i not in fits]
+                taken += [(slot.slot, i, 1.0, 1.0) for i in fits]
+        for slot, i, points, salary in taken:
+            records.append(
+                {
+                    "lineup": k,
+                    "slot": slot,
+                    "row": int(i),
+                    "salary": int(round(slate.salaries[i] * salary)),
+                    "projection": float(slate.projections[i] * points),
+                }
+            )
+    order = {s.slot: j for j, s in enumerate(contest.slots)}
+    frame = pl.DataFrame(
+        records, schema={"lineup": pl.Int64, "slot": pl.Utf8, "row": pl.Int64, "salary": pl.Int64, "projection": pl.Float64}
+    )
+    frame = frame.join(info.with_row_index("row").with_columns(pl.col("row").cast(pl.Int64)), on="row", how="left")
+    frame = frame.with_columns(pl.col("slot").replace_strict(order, return_dtype=pl.Int64).alias("_order"))
+    return frame.sort("lineup", "_order", "row").drop("row", "_order").select(
+        "lineup", "slot", *[c for c in info.columns], "salary", "projection"
+    )
+
+
+def run_lineups(
+    root: str,
+    contest: str,
+    slate_path: str,
+    season: int,
+    week: Optional[int] = None,
+    window: int = 4,
+    n_lineups: int = 1,
+    randomness: float = 0.0,
+    min_unique: int = 1,
+    max_exposure: float = 1.0,
+    seed: int = 0,
+) -> "pl.DataFrame":
+    rules = load_contest(contest)
+    slate, players = load_slate(slate_path, build_projections(root, season, week, window))
+    lineups = optimize(
+        slate, rules, n_lineups, randomness=randomness, min_unique=min_unique, max_exposure=max_exposure, seed=seed
+    )
+    return lineup_frame(slate, players, rules, lineups)
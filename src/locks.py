@@ -0,0 +1,64 @@
+# pyright: reportMissingImports=false, reportMissingModuleSource=false
+"""Hierarchical lake locks under ``<root>/../.locks/``.
+
+Every job holds the lake lock in shared mode; whole-lake maintenance takes it exclusively. Below
+it, a writer holds its dataset (or report) lock exclusively, or, when it only rewrites some
+partitions, holds the dataset lock shared plus an exclusive lock per partition. Jobs touching
+disjoint datasets or partitions therefore run side by side and jobs that overlap wait instead of
+being dropped. Readers take no locks: partitions are published by rename (see ``io.move_replace``).
+"""
+from __future__ import annotations
+
+import contextlib
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import structlog
+from filelock import FileLock, ReadWriteLock
+
+
+logger = structlog.get_logger(__name__)
+
+LOCK_DIR = ".locks"
+
+
+def _lock_dir(root: str | Path) -> Path:
+    path = Path(root).parent / LOCK_DIR
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@contextlib.contextmanager
+def _rw_lock(path: Path, exclusive: bool, timeout: float) -> Iterator[None]:
+    # A fresh instance per acquisition: instances coordinate processes, not threads
+    lock = ReadWriteLock(str(path), timeout=timeout, is_singleton=False)
+    try:
+        with lock.write_lock() if exclusive else lock.read_lock():
+            yield
+    finally:
+        lock.close()
+
+
+@contextlib.contextmanager
+def lake_lock(root: str | Path, exclusive: bool = False, timeout: float = -1) -> Iterator[None]:
+    """Hold the lake: shared for ordinary jobs, exclusive for whole-lake maintenance."""
+    with _rw_lock(_lock_dir(root) / "lake.db", exclusive, timeout):
+        yield
+
+
+@contextlib.contextmanager
+def write_lock(
+    root: str | Path, name: str, partitions: Optional[Sequence[str]] = None, timeout: float = -1
+) -> Iterator[None]:
+    """Exclusive write access to dataset/report ``name``, or only to ``partitions`` of it.
+
+    Partition locks are taken in sorted order, so two writers never wait on each other in a cycle.
+    """
+    lock_dir = _lock_dir(root)
+    parts = sorted(set(partitions or ()))
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(_rw_lock(lock_dir / f"{name}.db", not parts, timeout))
+        for part in parts:
+            stack.enter_context(FileLock(str(lock_dir / f"{name}@{part.replace('/', ',')}.lock"), timeout=timeout))
+        logger.debug("write_lock_acquired", name=name, partitions=parts or None)
+        yield
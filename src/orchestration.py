@@ -1,20 +1,26 @@
 # pyright: reportMissingImports=false, reportMissingModuleSource=false
 from __future__ import annotations
 
-import concurrent.futures
+import contextlib
+import functools
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
 
-from filelock import FileLock, BaseFileLock
 import structlog
 
-from .config import DatasetCatalog, DatasetConfig
-from .logging_setup import log_run_event
-from .lineage import load_lineage, save_lineage, update_dataset_lineage, record_partition_counts
+from .config import DatasetCatalog, DatasetConfig, ReportConfig
+from .dag import DagNode, NodeResult, run_dag, upstream_changed
+from .io import remove_dir
+from .logging_setup import configure_logging, log_run_event
+from .lineage import LineageStore, PartitionStats
 from . import importers
+from . import locks
 from . import promote
+from . import telemetry
 from .reports import utilization as util_reports
+from .reports.runner import get_runner
 
 
 logger = structlog.get_logger(__name__)
@@ -24,6 +30,13 @@ def _now_utc_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+class GoldBuild(NamedTuple):
+    """Result of a SQL report node: what was rebuilt and the lineage of the partitions it swapped in."""
+
+    weeks: Dict[int, str]  # rebuilt week -> input fingerprint
+    partition_stats: Dict[str, PartitionStats]
+
+
 def _select_datasets(catalog: DatasetCatalog, filter_csv: Optional[str]) -> List[DatasetConfig]:
     selected = []
     allow = None
@@ -38,16 +51,202 @@ def _select_datasets(catalog: DatasetCatalog, filter_csv: Optional[str]) -> List
     return selected
 
 
-def _lock_guard(root: str) -> BaseFileLock:
-    # filelock returns a BaseFileLock, which is compatible with FileLock usage
-    return FileLock(str(Path(root).parent / ".lake.lock"))
+def _season_partitions(cfg: DatasetConfig, season: int | str) -> Optional[List[str]]:
+    # Lock only the season being written when the dataset is partitioned by season first;
+    # anything else (yearless importers, other partitioning) locks the whole dataset
+    if cfg.partitions and cfg.partitions[0] in ("season", "year"):
+        return [f"{cfg.partitions[0]}={season}"]
+    return None
+
+
+def _report_lock(name: str, rep: ReportConfig, season: int) -> tuple[str, List[str]]:
+    layer, _, rest = (rep.output or rep.only_if_missing or "").partition("/")
+    # Steps that fill a silver dataset (weekly_backfill) share that dataset's lock
+    if layer == "silver" and rest:
+        return rest.split("/")[0], [f"season={season}"]
+    return f"report.{name}", [f"season={season}"]
+
+
+def _locked(root: str, name: str, partitions: Optional[List[str]], fn: Callable[[], Any]) -> Any:
+    with locks.write_lock(root, name, partitions):
+        return fn()
+
+
+def _record_dataset_result(
+    store: LineageStore,
+    name: str,
+    rows: int,
+    parts: list[str],
+    part_stats: dict,
+    validation_cache: Optional[dict],
+    run_id: Optional[str],
+    flow: str,
+    status: str,
+) -> None:
+    if status != "completed":
+        # Keep the last successful dataset/partition state; only the run history records the failure
+        store.record_run_failure(dataset=name, event_utc=_now_utc_iso(), run_id=run_id, flow=flow)
+        return
+    # Partitions without per-partition stats fall back to the batch row count
+    fallback_counts = {part: rows for part in parts if part not in (part_stats or {})}
+    store.record_dataset_run(
+        dataset=name,
+        last_ingest_utc=_now_utc_iso(),
+        rows_last_batch=rows,
+        changed_partitions=parts,
+        partition_stats=part_stats,
+        partition_row_counts=fallback_counts,
+        validation_cache=validation_cache,
+        run_id=run_id,
+        flow=flow,
+    )
+
+
+@contextlib.contextmanager
+def _checkpoint_store(lineage_path: Optional[str]) -> Iterator[Optional[LineageStore]]:
+    # Workers run off the main thread, so checkpoints go through their own SQLite connection
+    if lineage_path is None:
+        yield None
+        return
+    with LineageStore(lineage_path, json_path=None) as store:
+        yield store
+
+
+def _run_unit(
+    ck: Optional[LineageStore],
+    dataset: str,
+    unit: str,
+    stage: str,
+    fn: Callable[[], Any],
+    partitions_of: Callable[[Any], tuple],
+    run_id: Optional[str],
+    retry_attempts: int,
+    retry_base_seconds: float,
+) -> Any:
+    """Run one bootstrap unit stage with exponential backoff, checkpointing the outcome."""
+    attempt = 1
+    while True:
+        try:
+            value = fn()
+            break
+        except Exception as exc:
+            if ck is not None:
+                ck.record_checkpoint(
+                    "bootstrap", dataset, unit, stage, "failed", run_id=run_id, attempts=attempt, error=str(exc)
+                )
+            if attempt >= retry_attempts:
+                raise
+            delay = retry_base_seconds * 2 ** (attempt - 1)
+            logger.warning(
+                "unit_retry", dataset=dataset, unit=unit, stage=stage, attempt=attempt, delay_s=delay, error=str(exc)
+            )
+            time.sleep(delay)
+            attempt += 1
+    if ck is not None:
+        parts, stats = partitions_of(value)
+        ck.record_checkpoint(
+            "bootstrap",
+            dataset,
+            unit,
+            stage,
+            "completed",
+            run_id=run_id,
+            attempts=attempt,
+            partitions=parts,
+            partition_stats=stats,
+        )
+    return value
 
 
-def _run_dataset_bootstrap(root: str, cfg: DatasetConfig, years: str, no_validate: bool) -> tuple[int, list[str], dict]:
+def _fetch_to_bronze(root: str, cfg: DatasetConfig, years: str) -> tuple[int, list[str]]:
     df = importers.fetch_dataset_bootstrap(cfg, years)
-    changed_parts, _partition_stats = promote.write_bronze_and_collect(root, cfg, df)
-    part_stats = promote.promote_to_silver(root, cfg, changed_parts, no_validate=no_validate)
-    return len(df), changed_parts, part_stats
+    return len(df), promote.write_bronze_and_collect(root, cfg, df)[0]
+
+
+def _run_bootstrap_unit(
+    root: str,
+    cfg: DatasetConfig,
+    years: str,
+    unit: str,
+    done: Dict[tuple, Dict[str, Any]],
+    ck: Optional[LineageStore],
+    no_validate: bool,
+    validation_cache: Optional[dict],
+    revalidate: bool,
+    unit_kwargs: Dict[str, Any],
+) -> tuple[int, list[str], dict]:
+    bronze = done.get((unit, "bronze"), {})
+    rows = 0
+    if bronze.get("status") == "completed":
+        parts = bronze["partitions"]
+    else:
+        fetch = functools.partial(_fetch_to_bronze, root, cfg, years if unit == "all" else unit)
+        rows, parts = _run_unit(ck, cfg.name, unit, "bronze", fetch, lambda v: (v[1], None), **unit_kwargs)
+    stats = _run_unit(
+        ck,
+        cfg.name,
+        unit,
+        "silver",
+        functools.partial(
+            promote.promote_to_silver,
+            root,
+            cfg,
+            parts,
+            no_validate=no_validate,
+            validation_cache=validation_cache,
+            revalidate=revalidate,
+        ),
+        lambda v: (list(v), v),
+        **unit_kwargs,
+    )
+    return rows, parts, stats
+
+
+def _run_dataset_bootstrap(
+    root: str,
+    cfg: DatasetConfig,
+    years: str,
+    no_validate: bool,
+    validation_cache: Optional[dict] = None,
+    revalidate: bool = False,
+    run_id: Optional[str] = None,
+    lineage_path: Optional[str] = None,
+    resume: bool = False,
+    retry_attempts: int = 1,
+    retry_base_seconds: float = 0,
+) -> tuple[int, list[str], dict]:
+    """Fetch, write bronze and promote one year at a time.
+
+    Each ``(dataset, year)`` unit is checkpointed after its ``bronze`` and ``silver`` stages in
+    lineage (when ``lineage_path`` is given). With ``resume`` completed units are skipped and a unit
+    whose bronze landed but whose promote failed is promoted without re-fetching; otherwise the
+    dataset's checkpoints are reset first.
+    """
+    rows = 0
+    changed_parts: list[str] = []
+    part_stats: dict = {}
+    unit_kwargs = dict(run_id=run_id, retry_attempts=retry_attempts, retry_base_seconds=retry_base_seconds)
+    with telemetry.run_context(run_id, dataset=cfg.name, flow="bootstrap"), telemetry.span(
+        cfg.name, cat="dataset"
+    ), _checkpoint_store(lineage_path) as ck:
+        done: Dict[tuple, Dict[str, Any]] = {}
+        if ck is not None:
+            if resume:
+                done = ck.checkpoints("bootstrap", cfg.name)
+            else:
+                ck.clear_checkpoints("bootstrap", cfg.name)
+        for unit in importers.bootstrap_units(cfg, years):
+            if done.get((unit, "silver"), {}).get("status") == "completed":
+                logger.info("checkpoint_skip", dataset=cfg.name, unit=unit)
+                continue
+            with locks.write_lock(root, cfg.name, None if unit == "all" else _season_partitions(cfg, unit)):
+                unit_rows, parts, stats = _run_bootstrap_unit(
+                    root, cfg, years, unit, done, ck, no_validate, validation_cache, revalidate, unit_kwargs
+                )
+            rows += unit_rows
+            changed_parts.extend(parts)
+            part_stats.update(stats)
+    return rows, changed_parts, part_stats
 
 
 def _run_dataset_update(
@@ -56,13 +255,191 @@ def _run_dataset_update(
     season: int,
     no_validate: bool,
     since: Optional[str],
+    validation_cache: Optional[dict] = None,
+    revalidate: bool = False,
+    run_id: Optional[str] = None,
 ) -> tuple[int, list[str], dict]:
-    df = importers.fetch_dataset_update(cfg, season=season, since=since)
-    changed_parts, _partition_stats = promote.write_bronze_and_collect(root, cfg, df)
-    part_stats = promote.promote_to_silver(root, cfg, changed_parts, no_validate=no_validate)
+    with telemetry.run_context(run_id, dataset=cfg.name, flow="update"), telemetry.span(cfg.name, cat="dataset"):
+        df = importers.fetch_dataset_update(cfg, season=season, since=since)
+        with locks.write_lock(root, cfg.name, _season_partitions(cfg, season)):
+            changed_parts, _partition_stats = promote.write_bronze_and_collect(root, cfg, df)
+            part_stats = promote.promote_to_silver(
+                root,
+                cfg,
+                changed_parts,
+                no_validate=no_validate,
+                validation_cache=validation_cache,
+                revalidate=revalidate,
+            )
     return len(df), changed_parts, part_stats
 
 
+def _dataset_job(run_fn: Callable[..., tuple], cfg: DatasetConfig, validation_cache: dict) -> tuple:
+    rows, parts, part_stats = run_fn(cfg=cfg, validation_cache=validation_cache)
+    # A worker process updates its own copy of the cache, so it travels back with the result
+    return rows, parts, part_stats, validation_cache
+
+
+def _dataset_nodes(
+    selected: List[DatasetConfig], run_fn: Callable[..., tuple], caches: Dict[str, dict]
+) -> Dict[str, DagNode]:
+    # Node values are (rows, changed_partitions, partition_stats, validation_cache); ``run_fn`` is a
+    # partial of a module-level function so the node can be pickled into a worker process
+    return {
+        cfg.name: DagNode(
+            name=cfg.name,
+            run=functools.partial(_dataset_job, run_fn, cfg, caches[cfg.name]),
+            deps=list(cfg.depends_on),
+            kind="dataset",
+            changed=lambda value: bool(value[1]),
+            process_safe=True,
+        )
+        for cfg in selected
+    }
+
+
+def _report_should_run(root: str, rep: ReportConfig, season: int) -> Callable[[Dict[str, NodeResult]], bool]:
+    def _check(dep_results: Dict[str, NodeResult]) -> bool:
+        if rep.only_if_missing:
+            return not (Path(root) / rep.only_if_missing.format(season=season)).exists()
+        if rep.output and not (Path(root) / rep.output / f"season={season}").exists():
+            return True
+        return upstream_changed(rep.inputs, rep.depends_on, dep_results)
+
+    return _check
+
+
+def _materialize_changed_weeks(
+    root: str,
+    rep: ReportConfig,
+    season: int,
+    season_type: str,
+    previous: Dict[int, str],
+    run_id: Optional[str] = None,
+) -> GoldBuild:
+    """Rebuild only the weeks whose inputs changed.
+
+    Returns the new input fingerprints of the rebuilt weeks and the stats of every partition
+    swapped in, keyed like silver partitions (``season=2025/week=3``).
+    """
+    with telemetry.run_context(run_id, report=rep.name, flow="update"), telemetry.span(rep.name, cat="report"):
+        runner = get_runner(root)
+        inputs: Dict[int, List[str]] = {}
+        with telemetry.stage("fingerprint_inputs", season=season):
+            for ds in rep.inputs:
+                for week, fp in runner.week_fingerprints(f"silver_{ds}", season).items():
+                    inputs.setdefault(week, []).append(f"{ds}={fp}")
+        current = {week: "|".join(sorted(parts)) for week, parts in inputs.items()}
+        season_dir = Path(root) / rep.output / f"season={season}" if rep.output else None
+        if season_dir is not None:
+            # A week whose gold partition is gone is rebuilt whatever its recorded fingerprint
+            previous = {week: fp for week, fp in previous.items() if (season_dir / f"week={week}").exists()}
+        changed = sorted(week for week, fp in current.items() if previous.get(week) != fp)
+        if not changed:
+            logger.info("report_up_to_date", report=rep.name, season=season)
+            return GoldBuild({}, {})
+        weeks = changed if rep.week_local else None
+        with telemetry.stage("materialize", season=season, weeks=weeks) as st:
+            swapped = util_reports.materialize_report(Path(rep.sql or ""), season, season_type, weeks=weeks)
+            st["bytes_written"] = sum(telemetry.path_bytes(path) for path in swapped)
+            if weeks is None and season_dir is not None:
+                # A full rebuild replaces the season: weeks it no longer produces are stale
+                built = {path.name for path in swapped}
+                for stale in sorted(p for p in season_dir.glob("week=*") if p.name not in built):
+                    remove_dir(stale)
+                    logger.info("report_week_removed", report=rep.name, partition=stale.as_posix())
+        with telemetry.stage("fingerprint", season=season, partitions=len(swapped)):
+            stats = {
+                "/".join(seg for seg in path.parts if "=" in seg): promote.gold_partition_stats(path, rep.key)
+                for path in swapped
+            }
+        logger.info("report_materialized", report=rep.name, season=season, weeks=weeks or "all")
+    return GoldBuild({week: current[week] for week in (changed if rep.week_local else current)}, stats)
+
+
+def _report_nodes(
+    root: str,
+    catalog: DatasetCatalog,
+    season: int,
+    previous: Dict[str, Dict[int, str]],
+    season_type: str = "REG",
+    run_id: Optional[str] = None,
+) -> Dict[str, DagNode]:
+    # Node values are the rebuilt {week: input_fingerprint} for SQL reports, None for fn steps
+    nodes: Dict[str, DagNode] = {}
+    if any(rep.sql for rep in catalog.reports.values()):
+        # Expose every catalog dataset and report output to the report SQL
+        get_runner(root, catalog)
+    for name, rep in catalog.reports.items():
+        if rep.sql:
+            run = functools.partial(
+                _materialize_changed_weeks, root, rep, season, season_type, previous.get(name, {}), run_id
+            )
+        else:
+            run = functools.partial(getattr(util_reports, rep.fn), season=season, season_type=season_type)
+        lock_name, lock_parts = _report_lock(name, rep, season)
+        nodes[name] = DagNode(
+            name=name,
+            run=functools.partial(_locked, root, lock_name, lock_parts, run),
+            deps=list(rep.inputs) + list(rep.depends_on),
+            kind="report",
+            should_run=_report_should_run(root, rep, season),
+            changed=lambda value: not isinstance(value, GoldBuild) or bool(value.weeks),
+        )
+    return nodes
+
+
+def _run_graph(
+    store: LineageStore,
+    nodes: Dict[str, DagNode],
+    caches: Dict[str, dict],
+    max_workers: int,
+    run_id: str,
+    flow: str,
+    season: Optional[int] = None,
+    executor: str = "thread",
+) -> Dict[str, NodeResult]:
+    def _on_result(res: NodeResult) -> None:
+        node = nodes[res.name]
+        if node.kind == "report":
+            if res.status == "failed":
+                logger.warning("report_materialization_failed", report=res.name, error=res.error)
+                _record_dataset_result(store, res.name, 0, [], {}, None, run_id, flow, "failed")
+            elif res.status == "completed" and isinstance(res.value, GoldBuild) and res.value.weeks:
+                if season is not None:
+                    store.record_report_weeks(res.name, season, res.value.weeks)
+                # Gold tables get the same dataset/partition lineage as silver
+                stats = res.value.partition_stats
+                rows = sum(st.row_count for st in stats.values())
+                _record_dataset_result(store, res.name, rows, sorted(stats), stats, None, run_id, flow, "completed")
+            log_run_event(run_id, res.status, report=res.name, flow=flow)
+            return
+        if res.status == "completed":
+            rows, parts, part_stats, cache = res.value
+            if cache is not caches[res.name]:
+                caches[res.name].update(cache)
+            log_run_event(run_id, "completed", dataset=res.name, rows=rows, parts=parts)
+        else:
+            log_run_event(run_id, "failed", dataset=res.name, error=res.error)
+            rows, parts, part_stats = 0, [], {}
+        _record_dataset_result(
+            store, res.name, rows, parts, part_stats, caches[res.name], run_id, flow, res.status
+        )
+
+    return run_dag(
+        nodes, max_workers=max_workers, on_result=_on_result, executor=executor, initializer=configure_logging
+    )
+
+
+def _export_trace(run_id: str) -> None:
+    # Best effort: a trace is a debugging aid and must never fail the run
+    try:
+        path = telemetry.export_chrome_trace(run_id)
+        logger.info("trace_exported", run_id=run_id, path=str(path))
+    except Exception as exc:
+        logger.warning("trace_export_failed", run_id=run_id, error=str(exc))
+
+
 def run_bootstrap(
     root: str,
     catalog: DatasetCatalog,
@@ -70,45 +447,37 @@ def run_bootstrap(
     datasets: Optional[str],
     max_workers: int,
     no_validate: bool,
+    revalidate: bool = False,
+    resume: bool = False,
+    retry_attempts: int = 3,
+    retry_base_seconds: float = 5,
+    executor: str = "thread",
 ) -> None:
     run_id = f"run_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}"
-    with _lock_guard(root):
+    with locks.lake_lock(root), LineageStore() as store:
         selected = _select_datasets(catalog, datasets)
-        lineage = load_lineage()
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
-            futures = {}
-            for cfg in selected:
-                try:
-                    log_run_event(run_id, "submit", dataset=cfg.name, flow="bootstrap")
-                    futures[pool.submit(_run_dataset_bootstrap, root, cfg, years, no_validate)] = cfg.name
-                except Exception as exc:
-                    logger.error("dataset_submit_failed", dataset=cfg.name, error=str(exc))
-            for fut in concurrent.futures.as_completed(futures):
-                name = futures[fut]
-                try:
-                    rows, parts, part_stats = fut.result()
-                    log_run_event(run_id, "completed", dataset=name, rows=rows, parts=parts)
-                except Exception as exc:
-                    logger.error("dataset_run_failed", dataset=name, error=str(exc))
-                    log_run_event(run_id, "failed", dataset=name, error=str(exc))
-                    rows, parts, part_stats = 0, [], {}
-                lineage = update_dataset_lineage(
-                    lineage,
-                    dataset=name,
-                    last_ingest_utc=_now_utc_iso(),
-                    rows_last_batch=rows,
-                    changed_partitions=parts,
-                    partition_stats=part_stats,
-                )
-                for part in parts:
-                    # If we have per-partition stats, prefer those row counts; else fallback to rows
-                    rc = None
-                    if isinstance(part_stats, dict):
-                        st = part_stats.get(part)
-                        if st is not None and hasattr(st, "row_count"):
-                            rc = int(getattr(st, "row_count"))
-                    lineage = record_partition_counts(lineage, name, part, int(rc) if rc is not None else rows)
-        save_lineage(lineage)
+        caches = {cfg.name: store.validation_cache(cfg.name) for cfg in selected}
+        run = functools.partial(
+            _run_dataset_bootstrap,
+            root=root,
+            years=years,
+            no_validate=no_validate,
+            revalidate=revalidate,
+            run_id=run_id,
+            lineage_path=str(store.path),
+            resume=resume,
+            retry_attempts=retry_attempts,
+            retry_base_seconds=retry_base_seconds,
+        )
+
+        for cfg in selected:
+            log_run_event(run_id, "submit", dataset=cfg.name, flow="bootstrap", resume=resume, executor=executor)
+        with telemetry.run_context(run_id, flow="bootstrap"), telemetry.span("bootstrap", cat="run", years=years):
+            _run_graph(
+                store, _dataset_nodes(selected, run, caches), caches, max_workers, run_id, "bootstrap", executor=executor
+            )
+        store.export_json()
+    _export_trace(run_id)
 
 
 def run_update(
@@ -119,81 +488,52 @@ def run_update(
     max_workers: int,
     no_validate: bool,
     since: Optional[str],
-) -> None:
+    revalidate: bool = False,
+    executor: str = "thread",
+) -> Dict[str, NodeResult]:
     run_id = f"run_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}"
-    with _lock_guard(root):
+    with locks.lake_lock(root), LineageStore() as store:
         selected = _select_datasets(catalog, datasets)
-        lineage = load_lineage()
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
-            futures = {}
-            for cfg in selected:
-                try:
-                    log_run_event(run_id, "submit", dataset=cfg.name, flow="update", season=season)
-                    futures[pool.submit(_run_dataset_update, root, cfg, season, no_validate, since)] = cfg.name
-                except Exception as exc:
-                    logger.error("dataset_submit_failed", dataset=cfg.name, error=str(exc))
-            for fut in concurrent.futures.as_completed(futures):
-                name = futures[fut]
-                try:
-                    rows, parts, part_stats = fut.result()
-                    log_run_event(run_id, "completed", dataset=name, rows=rows, parts=parts)
-                except Exception as exc:
-                    logger.error("dataset_run_failed", dataset=name, error=str(exc))
-                    log_run_event(run_id, "failed", dataset=name, error=str(exc))
-                    rows, parts, part_stats = 0, [], {}
-                lineage = update_dataset_lineage(
-                    lineage,
-                    dataset=name,
-                    last_ingest_utc=_now_utc_iso(),
-                    rows_last_batch=rows,
-                    changed_partitions=parts,
-                    partition_stats=part_stats,
-                )
-                for part in parts:
-                    rc = None
-                    if isinstance(part_stats, dict):
-                        st = part_stats.get(part)
-                        if st is not None and hasattr(st, "row_count"):
-                            rc = int(getattr(st, "row_count"))
-                    lineage = record_partition_counts(lineage, name, part, int(rc) if rc is not None else rows)
-        save_lineage(lineage)
-
-        # Report materialization (current season only)
-        try:
-            weekly_dir = Path("data/silver/weekly/season=") / str(season)
-            if not weekly_dir.exists():
-                # Minimal backfill to ensure weekly exists for reports
-                util_reports.backfill_weekly_from_pbp(season=season, season_type="REG")
-            util_reports.materialize_player_week_stats(season=season, season_type="REG")
-            util_reports.materialize_player_week_utilization_receiving(season=season, season_type="REG")
-            util_reports.materialize_player_week_utilization_rushing(season=season, season_type="REG")
-            util_reports.materialize_player_week_utilization_wr(season=season, season_type="REG")
-            util_reports.materialize_player_week_utilization_te(season=season, season_type="REG")
-            util_reports.materialize_player_week_utilization_rb(season=season, season_type="REG")
-            util_reports.materialize_defense_position_points_allowed(season=season, season_type="REG")
-        except Exception as exc:
-            logger.warning("report_materialization_failed", error=str(exc))
+        caches = {cfg.name: store.validation_cache(cfg.name) for cfg in selected}
+        run = functools.partial(
+            _run_dataset_update,
+            root=root,
+            season=season,
+            no_validate=no_validate,
+            since=since,
+            revalidate=revalidate,
+            run_id=run_id,
+        )
+
+        for cfg in selected:
+            log_run_event(run_id, "submit", dataset=cfg.name, flow="update", season=season, executor=executor)
+        # Report steps (current season only) join the same graph, so each starts as soon as its
+        # inputs land and is skipped when none of them changed. They share the parent's DuckDB
+        # connection, so only dataset nodes move to worker processes under --executor process
+        nodes = _dataset_nodes(selected, run, caches)
+        previous = {name: store.report_weeks(name, season) for name in catalog.reports}
+        nodes.update(_report_nodes(root, catalog, season, previous, run_id=run_id))
+        with telemetry.run_context(run_id, flow="update"), telemetry.span("update", cat="run", season=season):
+            results = _run_graph(store, nodes, caches, max_workers, run_id, "update", season=season, executor=executor)
+        store.export_json()
 
         # Emit a concise end-of-run summary to stdout/log
         try:
             succeeded = []
             failed = []
-            for cfg in selected:
-                try:
-                    ds_lineage = lineage.get(cfg.name, {})
-                    last_rows = int(ds_lineage.get("rows_last_batch", 0))
-                    parts = ds_lineage.get("changed_partitions", []) or []
-                    succeeded.append((cfg.name, last_rows, parts))
-                except Exception:
-                    failed.append(cfg.name)
-            logger.info(
-                "update_summary",
-                season=season,
-                succeeded=[{"dataset": n, "rows": r, "parts": p} for n, r, p in succeeded],
-                failed=failed,
-            )
+            # Report nodes record runs too, so the limit covers every node of the graph
+            for rec in store.runs(run_id=run_id, limit=max(len(nodes), 1) * 4):
+                if rec["status"] == "completed":
+                    succeeded.append(
+                        {"dataset": rec["dataset"], "rows": rec["rows"], "parts": rec["changed_partitions"]}
+                    )
+                else:
+                    failed.append(rec["dataset"])
+            logger.info("update_summary", season=season, succeeded=succeeded, failed=failed)
         except Exception:
             pass
+    _export_trace(run_id)
+    return results
 
 
 def run_recache_pbp(root: str, catalog: DatasetCatalog, season: int) -> None:
@@ -201,15 +541,15 @@ def run_recache_pbp(root: str, catalog: DatasetCatalog, season: int) -> None:
     if not cfg:
         logger.warning("pbp dataset not configured")
         return
-    rows, parts, part_stats = _run_dataset_update(root, cfg, season, no_validate=False, since=None)
-    lineage = load_lineage()
-    lineage = update_dataset_lineage(
-        lineage,
-        dataset="pbp",
-        last_ingest_utc=_now_utc_iso(),
-        rows_last_batch=rows,
-        changed_partitions=parts,
-        partition_stats=part_stats,
-    )
-    save_lineage(lineage)
-
+    with locks.lake_lock(root), LineageStore() as store:
+        cache = store.validation_cache("pbp")
+        rows, parts, part_stats = _run_dataset_update(
+            root,
+            cfg,
+            season,
+            no_validate=False,
+            since=None,
+            validation_cache=cache,
+        )
+        _record_dataset_result(store, "pbp", rows, parts, part_stats, cache, None, "recache-pbp", "completed")
+        store.export_json()
@@ -4,10 +4,18 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+import concurrent.futures
+import hashlib
 import json
+import multiprocessing
+import uuid
 import polars as pl
 
 from .config import DatasetCatalog
+from .quality_store import scan_column_profiles, write_column_profiles
+
+# Bump when metric definitions change so incremental runs re-profile every partition.
+PROFILE_VERSION = "2"
 
 
 def _iter_partitions(
@@ -16,8 +24,9 @@ def _iter_partitions(
     layer: str,
     partition_keys: List[str],
     limit_values: Optional[List[str]] = None,
+    location: Optional[str] = None,
 ) -> List[str]:
-    base = Path(root) / layer / dataset
+    base = _partition_root(root, dataset, layer, "", location)
     if not partition_keys:
         return [""]
 
@@ -45,51 +54,240 @@ def _iter_partitions(
     return parts
 
 
-def _read_partition_as_polars(root: str, dataset: str, layer: str, partition: str) -> pl.DataFrame:
-    target = Path(root) / layer / dataset
-    if partition:
-        target = target / partition
-    # Scan the partition directory; use hive partitioning and upcast Null dtypes
-    lf = pl.scan_parquet(str(target), hive_partitioning=True)
+def _partition_constants(partition: str) -> Dict[str, str]:
+    consts: Dict[str, str] = {}
+    for seg in partition.split("/"):
+        if "=" in seg:
+            k, v = seg.split("=", 1)
+            consts[k] = v
+    return consts
+
+
+def _footer_summary(files: List[Path]) -> Tuple[int, Dict[str, Dict[str, object]]]:
+    """Aggregate row counts and per-column null counts/min/max from parquet footers.
+
+    A column's null count (or min/max) is only marked complete when every row group of every
+    file carries that statistic; otherwise callers fall back to scanning the column.
+    """
+    import pyarrow.parquet as pq
+
+    rows = 0
+    cols: Dict[str, Dict[str, object]] = {}
+    for f in files:
+        md = pq.read_metadata(str(f))
+        rows += md.num_rows
+        for rg_idx in range(md.num_row_groups):
+            rg = md.row_group(rg_idx)
+            for ci in range(rg.num_columns):
+                col = rg.column(ci)
+                name = col.path_in_schema
+                if "." in name:
+                    # Nested leaf; only top-level columns are profiled from the footer
+                    continue
+                ent = cols.setdefault(
+                    name, {"rows": 0, "null_count": 0, "min": None, "max": None, "nulls_ok": True, "minmax_ok": True}
+                )
+                ent["rows"] = int(ent["rows"]) + rg.num_rows
+                st = col.statistics
+                if st is None or not st.has_null_count:
+                    ent["nulls_ok"] = False
+                else:
+                    ent["null_count"] = int(ent["null_count"]) + int(st.null_count)
+                if st is None or not st.has_min_max:
+                    # An all-null row group has no min/max but does not affect them
+                    if not (st is not None and st.has_null_count and st.null_count == rg.num_rows):
+                        ent["minmax_ok"] = False
+                    continue
+                try:
+                    ent["min"] = st.min if ent["min"] is None else min(ent["min"], st.min)
+                    ent["max"] = st.max if ent["max"] is None else max(ent["max"], st.max)
+                except TypeError:
+                    ent["minmax_ok"] = False
+    for ent in cols.values():
+        # Columns absent from some files have implicit nulls the footers cannot count
+        if ent["rows"] != rows:
+            ent["nulls_ok"] = False
+            ent["minmax_ok"] = False
+    return rows, cols
+
+
+def _profile_metrics(
+    lf: pl.LazyFrame,
+    key_cols: List[str],
+    rows: Optional[int] = None,
+    footer: Optional[Dict[str, Dict[str, object]]] = None,
+    constants: Optional[Dict[str, str]] = None,
+) -> Dict[str, object]:
+    """Compute partition metrics, answering from footer statistics where possible.
+
+    Anything not covered by ``rows``/``footer``/``constants`` (hive partition values) is
+    computed in a single projected ``select`` over ``lf``.
+    """
+    footer = footer or {}
+    constants = constants or {}
     schema = lf.collect_schema()
-    null_cols = [name for name, dtype in schema.items() if dtype == pl.Null]
-    if null_cols:
-        lf = lf.with_columns([pl.col(c).cast(pl.Utf8) for c in null_cols])
-    return lf.collect()
+    cols = list(schema.names())
+    dtypes = {name: str(pl.Utf8 if dtype == pl.Null else dtype) for name, dtype in schema.items()}
+    present = set(cols) | set(constants)
 
+    exprs: List[pl.Expr] = []
+    if rows is None:
+        exprs.append(pl.len().alias("__rows"))
+
+    key_nulls: Dict[str, object] = {}
+    for k in key_cols:
+        if k not in present:
+            continue
+        if k in schema:
+            ent = footer.get(k)
+            if schema[k] == pl.Null and rows is not None:
+                key_nulls[k] = rows
+            elif ent is not None and ent["nulls_ok"]:
+                key_nulls[k] = int(ent["null_count"])  # type: ignore[arg-type]
+            else:
+                exprs.append(pl.col(k).is_null().sum().alias(f"__nulls_{k}"))
+        else:
+            key_nulls[k] = 0
+
+    scan_keys = [k for k in key_cols if k in schema]
+    have_all_keys = all(k in present for k in key_cols)
+    if have_all_keys and scan_keys:
+        exprs.append(pl.struct([pl.col(k) for k in scan_keys]).n_unique().alias("__key_unique"))
+
+    bounds: Dict[str, object] = {}
+    for fld in ["season", "year", "week"]:
+        if fld in schema:
+            ent = footer.get(fld)
+            if ent is not None and ent["minmax_ok"] and ent["min"] is not None:
+                bounds[f"{fld}_min"] = ent["min"]
+                bounds[f"{fld}_max"] = ent["max"]
+            else:
+                exprs.append(pl.col(fld).min().alias(f"__{fld}_min"))
+                exprs.append(pl.col(fld).max().alias(f"__{fld}_max"))
+        elif fld in constants:
+            bounds[f"{fld}_min"] = constants[fld]
+            bounds[f"{fld}_max"] = constants[fld]
+
+    scanned: Dict[str, object] = {}
+    if exprs:
+        scanned = lf.select(exprs).collect().row(0, named=True)
+    if rows is None:
+        rows = int(scanned["__rows"])  # type: ignore[arg-type]
 
-def _compute_metrics(df: pl.DataFrame, key_cols: List[str]) -> Dict[str, object]:
-    rows = df.height
-    cols = list(df.columns)
-    dtypes = {name: str(dtype) for name, dtype in df.schema.items()}
     metrics: Dict[str, object] = {
         "rows": rows,
         "num_columns": len(cols),
         "columns": cols,
         "dtypes": dtypes,
     }
-    # Key nulls and duplicates
-    nulls = {}
     for k in key_cols:
-        if k in df.columns:
-            nulls[k] = int(df.select(pl.col(k).is_null().sum()).item())
-    metrics["key_nulls"] = nulls
-    if all(k in df.columns for k in key_cols):
-        uniq = df.select(pl.concat_list([pl.col(k) for k in key_cols]).alias("__k")).unique().height
-        metrics["key_unique_rows"] = int(uniq)
+        if f"__nulls_{k}" in scanned:
+            key_nulls[k] = int(scanned[f"__nulls_{k}"])  # type: ignore[arg-type]
+    metrics["key_nulls"] = {k: key_nulls[k] for k in key_cols if k in key_nulls}
+    if have_all_keys:
+        uniq = int(scanned["__key_unique"]) if "__key_unique" in scanned else (1 if rows else 0)  # type: ignore[arg-type]
+        uniq = min(uniq, rows)
+        metrics["key_unique_rows"] = uniq
         metrics["key_duplicate_rows"] = int(rows - uniq)
         metrics["key_unique_ratio"] = float(uniq / rows) if rows else 1.0
-    # Optional common fields
     for fld in ["season", "year", "week"]:
-        if fld in df.columns:
+        for suffix in ("min", "max"):
+            name = f"{fld}_{suffix}"
+            val = scanned.get(f"__{name}", bounds.get(name))
+            if val is None:
+                continue
             try:
-                metrics[f"{fld}_min"] = int(df.select(pl.col(fld).min()).item())
-                metrics[f"{fld}_max"] = int(df.select(pl.col(fld).max()).item())
-            except Exception:
+                metrics[name] = int(val)  # type: ignore[arg-type]
+            except (TypeError, ValueError):
                 pass
     return metrics
 
 
+def _compute_metrics(df: pl.DataFrame, key_cols: List[str]) -> Dict[str, object]:
+    return _profile_metrics(df.lazy(), key_cols, rows=df.height)
+
+
+def _profile_partition(
+    root: str,
+    dataset: str,
+    layer: str,
+    partition: str,
+    key_cols: List[str],
+    files: Optional[List[Path]] = None,
+    location: Optional[str] = None,
+) -> Dict[str, object]:
+    target = _partition_root(root, dataset, layer, partition, location)
+    if files is None:
+        files = sorted(target.rglob("*.parquet"))
+    lf = pl.scan_parquet(str(target), hive_partitioning=True)
+    rows, footer = _footer_summary(files)
+    return _profile_metrics(lf, key_cols, rows=rows, footer=footer, constants=_partition_constants(partition))
+
+
+def _partition_root(root: str, dataset: str, layer: str, partition: str, location: Optional[str] = None) -> Path:
+    # ``location`` is the lake-relative directory of tables not stored at <layer>/<dataset> (gold)
+    target = Path(root) / (location or f"{layer}/{dataset}")
+    if partition:
+        target = target / partition
+    return target
+
+
+def _source_fingerprint(base: Path, files: List[Path], key_cols: List[str]) -> str:
+    """Cheap change detector for a partition: relative file paths, sizes and mtimes (no data read)."""
+    h = hashlib.sha256()
+    h.update(PROFILE_VERSION.encode("utf-8"))
+    h.update("|".join(key_cols).encode("utf-8"))
+    for f in files:
+        st = f.stat()
+        h.update(f"{f.relative_to(base).as_posix()}:{st.st_size}:{st.st_mtime_ns};".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _quality_path(out: Path, dataset: str, layer: str, partition: str) -> Path:
+    part_name = partition.replace("/", "_") or "all"
+    return out / dataset / f"{layer}_{part_name}.json"
+
+
+def _previous_fingerprint(path: Path) -> Optional[str]:
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text()).get("source_fingerprint")
+    except (OSError, ValueError):
+        return None
+
+
+def _profile_and_write(
+    root: str,
+    dataset: str,
+    layer: str,
+    partition: str,
+    key_cols: List[str],
+    files: List[str],
+    fpath: str,
+    source_fp: str,
+    run_id: Optional[str] = None,
+    location: Optional[str] = None,
+) -> Tuple[Tuple[str, str, str], Optional[pl.DataFrame]]:
+    # Top-level so it can run inside a process pool worker
+    metrics = _profile_partition(root, dataset, layer, partition, key_cols, [Path(f) for f in files], location)
+    columns = None
+    if run_id is not None:
+        # Column sketches need every value of a column, so they are built one column at a time
+        columns = scan_column_profiles([str(f) for f in files], dataset, layer, partition, run_id)
+    rec = {
+        "dataset": dataset,
+        "layer": layer,
+        "partition": partition or "all",
+        "source_fingerprint": source_fp,
+        "metrics": metrics,
+    }
+    target = Path(fpath)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(rec, indent=2))
+    return (dataset, layer, partition or "all"), columns
+
+
 def run_profile(
     root: str,
     catalog: DatasetCatalog,
@@ -97,38 +295,67 @@ def run_profile(
     layer: str,
     limit_values: Optional[List[str]],
     output_dir: str = "catalog/quality",
+    max_workers: int = 1,
+    force: bool = False,
+    columns: bool = True,
 ) -> List[Tuple[str, str, str]]:
+    """Profile partitions and write ``<output_dir>/<dataset>/<layer>_<part>.json``.
+
+    ``layer`` is ``bronze`` or ``silver`` for catalog datasets, or ``gold`` for the catalog's
+    gold tables (reports with an ``output``), which are profiled under their report name.
+    Partitions whose source files (names, sizes, mtimes) are unchanged since their last
+    profile are skipped unless ``force`` is set. With ``max_workers > 1`` partitions are
+    profiled in a process pool. With ``columns`` set, per-column profiles of the (re)profiled
+    partitions are appended to the Parquet store ``<output_dir>/columns`` as one file per run.
+    Returns the partitions that were (re)profiled.
+    """
     out = Path(output_dir)
     out.mkdir(parents=True, exist_ok=True)
     selected = []
     allow = None
     if datasets_filter:
         allow = {x.strip() for x in datasets_filter.split(",") if x.strip()}
-    for name, cfg in catalog.datasets.items():
-        if allow and name not in allow:
+    # (name, lake-relative location or None for <layer>/<name>, partitions, key)
+    tables: List[Tuple[str, Optional[str], List[str], List[str]]] = []
+    if layer == "gold":
+        tables = [(name, rep.output, rep.partitions, rep.key) for name, rep in catalog.gold_tables().items()]
+    else:
+        tables = [(name, None, cfg.partitions, cfg.key) for name, cfg in catalog.datasets.items()]
+    for table in tables:
+        if allow and table[0] not in allow:
             continue
-        selected.append(cfg)
+        selected.append(table)
 
-    written: List[Tuple[str, str, str]] = []
-    for cfg in selected:
-        partitions = _iter_partitions(root, cfg.name, layer, cfg.partitions, limit_values)
+    run_id = uuid.uuid4().hex if columns else None
+    jobs: List[Tuple[str, str, str, str, List[str], List[str], str, str, Optional[str], Optional[str]]] = []
+    for name, location, partition_keys, key in selected:
+        partitions = _iter_partitions(root, name, layer, partition_keys, limit_values, location)
         if not partitions:
             partitions = [""]
         for part in partitions:
-            df = _read_partition_as_polars(root, cfg.name, layer, part)
-            metrics = _compute_metrics(df, cfg.key)
-            rec = {
-                "dataset": cfg.name,
-                "layer": layer,
-                "partition": part or "all",
-                "metrics": metrics,
-            }
-            ds_out = out / cfg.name
-            ds_out.mkdir(parents=True, exist_ok=True)
-            part_name = part.replace("/", "_") or "all"
-            fpath = ds_out / f"{layer}_{part_name}.json"
-            fpath.write_text(json.dumps(rec, indent=2))
-            written.append((cfg.name, layer, part or "all"))
-    return written
-
+            base = _partition_root(root, name, layer, part, location)
+            files = sorted(base.rglob("*.parquet"))
+            if not files:
+                continue
+            source_fp = _source_fingerprint(base, files, key)
+            fpath = _quality_path(out, name, layer, part)
+            if not force and _previous_fingerprint(fpath) == source_fp:
+                continue
+            jobs.append(
+                (root, name, layer, part, list(key), [str(f) for f in files], str(fpath), source_fp, run_id, location)
+            )
 
+    results: List[Tuple[Tuple[str, str, str], Optional[pl.DataFrame]]] = []
+    if max_workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            results.append(_profile_and_write(*job))
+    else:
+        # spawn: forking after polars has started its thread pool can deadlock the workers
+        ctx = multiprocessing.get_context("spawn")
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+            futures = [pool.submit(_profile_and_write, *job) for job in jobs]
+            for fut in concurrent.futures.as_completed(futures):
+                results.append(fut.result())
+    if run_id is not None:
+        write_column_profiles([cols for _, cols in results if cols is not None], run_id, str(out / "columns"))
+    return sorted(key for key, _ in results)
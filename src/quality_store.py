@@ -0,0 +1,402 @@
+# pyright: reportMissingImports=false, reportMissingModuleSource=false
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import polars as pl
+
+
+DEFAULT_QUALITY_STORE = "catalog/quality/columns"
+
+HLL_PRECISION = 12
+QUANTILE_RELATIVE_ACCURACY = 0.01
+TOP_K = 10
+# Keep more candidates than we report so merged top-k stays accurate across partitions
+TOP_K_CANDIDATES = 4 * TOP_K
+REPORTED_QUANTILES = (0.01, 0.25, 0.5, 0.75, 0.99)
+
+# Row hashes come from polars, whose hash is not stable across releases; sketches are only
+# mergeable when built with the same hasher.
+HASH_IMPL = f"polars-{pl.__version__}-seed0"
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch over 64-bit value hashes (mergeable by register max)."""
+
+    def __init__(self, registers: Optional[np.ndarray] = None, precision: int = HLL_PRECISION) -> None:
+        self.precision = precision
+        m = 1 << precision
+        self.registers = registers if registers is not None else np.zeros(m, dtype=np.uint8)
+
+    @classmethod
+    def from_hashes(cls, hashes: np.ndarray, precision: int = HLL_PRECISION) -> "HyperLogLog":
+        sketch = cls(precision=precision)
+        if hashes.size == 0:
+            return sketch
+        h = hashes.astype(np.uint64, copy=False)
+        p = np.uint64(precision)
+        idx = (h >> (np.uint64(64) - p)).astype(np.int64)
+        # Remaining bits, with a sentinel bit so the rank is bounded by 64 - p + 1
+        w = (h << p) | (np.uint64(1) << (p - np.uint64(1)))
+        rank = (_leading_zeros64(w) + 1).astype(np.uint8)
+        np.maximum.at(sketch.registers, idx, rank)
+        return sketch
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("cannot merge HyperLogLog sketches with different precision")
+        return HyperLogLog(np.maximum(self.registers, other.registers), self.precision)
+
+    def estimate(self) -> int:
+        m = float(1 << self.precision)
+        alpha = 0.7213 / (1.0 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.power(2.0, -self.registers.astype(np.float64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Linear counting for small cardinalities
+            raw = m * math.log(m / zeros)
+        return int(round(raw))
+
+    def to_bytes(self) -> bytes:
+        return self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, precision: int = HLL_PRECISION) -> "HyperLogLog":
+        return cls(np.frombuffer(data, dtype=np.uint8).copy(), precision)
+
+
+def _leading_zeros64(w: np.ndarray) -> np.ndarray:
+    # Split into 32-bit halves so float log2 is exact on the integer inputs
+    hi = (w >> np.uint64(32)).astype(np.float64)
+    lo = (w & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    with np.errstate(divide="ignore"):
+        hi_bits = np.where(hi > 0, np.floor(np.log2(np.maximum(hi, 1.0))) + 1, 0)
+        lo_bits = np.where(lo > 0, np.floor(np.log2(np.maximum(lo, 1.0))) + 1, 0)
+    bit_length = np.where(hi > 0, hi_bits + 32, lo_bits)
+    return (64 - bit_length).astype(np.int64)
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch (DDSketch-style) with bounded relative error.
+
+    Buckets are keyed by ``ceil(log_gamma(|x|))``, so sketches with the same accuracy merge by
+    adding bucket counts.
+    """
+
+    def __init__(
+        self,
+        pos: Optional[Dict[int, int]] = None,
+        neg: Optional[Dict[int, int]] = None,
+        zero_count: int = 0,
+        relative_accuracy: float = QUANTILE_RELATIVE_ACCURACY,
+    ) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.pos = pos or {}
+        self.neg = neg or {}
+        self.zero_count = zero_count
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.pos.values()) + sum(self.neg.values())
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, relative_accuracy: float = QUANTILE_RELATIVE_ACCURACY) -> "QuantileSketch":
+        sketch = cls(relative_accuracy=relative_accuracy)
+        vals = values[np.isfinite(values)].astype(np.float64, copy=False)
+        if vals.size == 0:
+            return sketch
+        log_gamma = math.log(sketch.gamma)
+        sketch.zero_count = int(np.count_nonzero(vals == 0))
+        for target, subset in ((sketch.pos, vals[vals > 0]), (sketch.neg, -vals[vals < 0])):
+            if subset.size:
+                keys = np.ceil(np.log(subset) / log_gamma).astype(np.int64)
+                uniq, counts = np.unique(keys, return_counts=True)
+                target.update({int(k): int(c) for k, c in zip(uniq, counts)})
+        return sketch
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if not math.isclose(other.relative_accuracy, self.relative_accuracy):
+            raise ValueError("cannot merge quantile sketches with different accuracy")
+        pos = dict(self.pos)
+        for k, c in other.pos.items():
+            pos[k] = pos.get(k, 0) + c
+        neg = dict(self.neg)
+        for k, c in other.neg.items():
+            neg[k] = neg.get(k, 0) + c
+        return QuantileSketch(pos, neg, self.zero_count + other.zero_count, self.relative_accuracy)
+
+    def _bucket_value(self, key: int) -> float:
+        return 2 * self.gamma**key / (self.gamma + 1)
+
+    def quantile(self, q: float) -> Optional[float]:
+        total = self.count
+        if total == 0:
+            return None
+        rank = q * (total - 1)
+        seen = 0
+        # Ascending order: most negative first (largest |x| of neg), then zeros, then positives
+        for key in sorted(self.neg, reverse=True):
+            seen += self.neg[key]
+            if seen > rank:
+                return -self._bucket_value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.pos):
+            seen += self.pos[key]
+            if seen > rank:
+                return self._bucket_value(key)
+        return self._bucket_value(max(self.pos)) if self.pos else 0.0
+
+    def to_columns(self) -> Dict[str, Any]:
+        return {
+            "qs_pos_keys": sorted(self.pos),
+            "qs_pos_counts": [self.pos[k] for k in sorted(self.pos)],
+            "qs_neg_keys": sorted(self.neg),
+            "qs_neg_counts": [self.neg[k] for k in sorted(self.neg)],
+            "qs_zero_count": self.zero_count,
+        }
+
+    @classmethod
+    def from_columns(cls, row: Dict[str, Any]) -> "QuantileSketch":
+        pos = dict(zip(row.get("qs_pos_keys") or [], row.get("qs_pos_counts") or []))
+        neg = dict(zip(row.get("qs_neg_keys") or [], row.get("qs_neg_counts") or []))
+        return cls(pos, neg, int(row.get("qs_zero_count") or 0))
+
+
+def merge_top_k(lists: Iterable[List[Dict[str, Any]]], k: int = TOP_K_CANDIDATES) -> List[Dict[str, Any]]:
+    """Merge per-partition top-value candidates by summing counts (approximate beyond ``k``)."""
+    totals: Dict[str, int] = {}
+    for items in lists:
+        for item in items or []:
+            totals[item["value"]] = totals.get(item["value"], 0) + int(item["count"])
+    ranked = sorted(totals.items(), key=lambda kv: (-kv[1], kv[0]))[:k]
+    return [{"value": v, "count": c} for v, c in ranked]
+
+
+_PROFILE_SCHEMA = {
+    "dataset": pl.Utf8,
+    "layer": pl.Utf8,
+    "partition": pl.Utf8,
+    "column": pl.Utf8,
+    "run_id": pl.Utf8,
+    "profiled_at": pl.Utf8,
+    "dtype": pl.Utf8,
+    "rows": pl.Int64,
+    "null_count": pl.Int64,
+    "null_ratio": pl.Float64,
+    "approx_distinct": pl.Int64,
+    "hll_registers": pl.Binary,
+    "hash_impl": pl.Utf8,
+    "min": pl.Float64,
+    "max": pl.Float64,
+    "mean": pl.Float64,
+    "p01": pl.Float64,
+    "p25": pl.Float64,
+    "p50": pl.Float64,
+    "p75": pl.Float64,
+    "p99": pl.Float64,
+    "qs_pos_keys": pl.List(pl.Int64),
+    "qs_pos_counts": pl.List(pl.Int64),
+    "qs_neg_keys": pl.List(pl.Int64),
+    "qs_neg_counts": pl.List(pl.Int64),
+    "qs_zero_count": pl.Int64,
+    "top_values": pl.List(pl.Struct({"value": pl.Utf8, "count": pl.Int64})),
+}
+
+
+def _quantile_fields(sketch: QuantileSketch) -> Dict[str, Optional[float]]:
+    return {f"p{int(round(q * 100)):02d}": sketch.quantile(q) for q in REPORTED_QUANTILES}
+
+
+def column_profiles(
+    df: pl.DataFrame,
+    dataset: str,
+    layer: str,
+    partition: str,
+    run_id: str,
+    profiled_at: Optional[str] = None,
+) -> pl.DataFrame:
+    """One row per column with null ratio, HLL distinct count, quantile sketch and top-k values."""
+    base = _profile_base(dataset, layer, partition, run_id, profiled_at)
+    records = [_column_record(df.get_column(name), base) for name in df.columns]
+    return pl.DataFrame(records, schema=_PROFILE_SCHEMA)
+
+
+def scan_column_profiles(
+    files: List[str],
+    dataset: str,
+    layer: str,
+    partition: str,
+    run_id: str,
+    profiled_at: Optional[str] = None,
+) -> pl.DataFrame:
+    """``column_profiles`` of the Parquet ``files``, reading one column at a time.
+
+    Each sketch needs every value of its column, but never another column's, so peak memory is
+    one column of the partition rather than all of it.
+    """
+    base = _profile_base(dataset, layer, partition, run_id, profiled_at)
+    lf = pl.scan_parquet(files, hive_partitioning=False)
+    records = [_column_record(lf.select(name).collect().to_series(), base) for name in lf.collect_schema().names()]
+    return pl.DataFrame(records, schema=_PROFILE_SCHEMA)
+
+
+def _profile_base(
+    dataset: str, layer: str, partition: str, run_id: str, profiled_at: Optional[str]
+) -> Dict[str, Any]:
+    return {
+        "dataset": dataset,
+        "layer": layer,
+        "partition": partition or "all",
+        "run_id": run_id,
+        "profiled_at": profiled_at or datetime.now(timezone.utc).isoformat(),
+        "hash_impl": HASH_IMPL,
+    }
+
+
+def _column_record(series: pl.Series, base: Dict[str, Any]) -> Dict[str, Any]:
+    dtype = series.dtype
+    rows = series.len()
+    nulls = series.null_count()
+    non_null = series.drop_nulls()
+    rec: Dict[str, Any] = {
+        **base,
+        "column": series.name,
+        "dtype": str(dtype),
+        "rows": rows,
+        "null_count": nulls,
+        "null_ratio": float(nulls / rows) if rows else 0.0,
+    }
+    if dtype == pl.Null or non_null.len() == 0:
+        hll = HyperLogLog()
+    else:
+        hll = HyperLogLog.from_hashes(non_null.hash(seed=0).to_numpy())
+    rec["hll_registers"] = hll.to_bytes()
+    rec["approx_distinct"] = hll.estimate()
+    if dtype.is_numeric() and non_null.len():
+        values = non_null.cast(pl.Float64).to_numpy()
+        sketch = QuantileSketch.from_values(values)
+        finite = values[np.isfinite(values)]
+        if finite.size:
+            rec.update({"min": float(finite.min()), "max": float(finite.max()), "mean": float(finite.mean())})
+        rec.update(sketch.to_columns())
+        rec.update(_quantile_fields(sketch))
+    if not dtype.is_float() and dtype != pl.Null and non_null.len():
+        vc = non_null.cast(pl.Utf8).value_counts(sort=True).head(TOP_K_CANDIDATES)
+        rec["top_values"] = [
+            {"value": str(v), "count": int(c)} for v, c in zip(vc[vc.columns[0]].to_list(), vc["count"].to_list())
+        ]
+    return rec
+
+
+def write_column_profiles(frames: List[pl.DataFrame], run_id: str, store_root: str = DEFAULT_QUALITY_STORE) -> Optional[Path]:
+    """Append one Parquet file holding every column profile produced by a run."""
+    frames = [f for f in frames if f.height]
+    if not frames:
+        return None
+    root = Path(store_root)
+    root.mkdir(parents=True, exist_ok=True)
+    target = root / f"run={run_id}.parquet"
+    tmp = target.with_suffix(".parquet.tmp")
+    pl.concat(frames, how="vertical").write_parquet(tmp, compression="zstd")
+    tmp.replace(target)
+    return target
+
+
+def load_column_profiles(
+    store_root: str = DEFAULT_QUALITY_STORE,
+    dataset: Optional[str] = None,
+    layer: Optional[str] = None,
+    latest: bool = True,
+) -> pl.DataFrame:
+    """Read the store; with ``latest`` keep only the newest run per (dataset, layer, partition, column)."""
+    files = sorted(Path(store_root).glob("*.parquet"))
+    if not files:
+        return pl.DataFrame(schema=_PROFILE_SCHEMA)
+    lf = pl.scan_parquet([str(f) for f in files])
+    if dataset:
+        lf = lf.filter(pl.col("dataset") == dataset)
+    if layer:
+        lf = lf.filter(pl.col("layer") == layer)
+    if latest:
+        lf = lf.filter(
+            pl.col("profiled_at") == pl.col("profiled_at").max().over(["dataset", "layer", "partition", "column"])
+        )
+    return lf.collect()
+
+
+def compact_column_profiles(store_root: str = DEFAULT_QUALITY_STORE) -> Optional[Path]:
+    """Rewrite the store as a single file holding only the latest profile per column."""
+    latest = load_column_profiles(store_root, latest=True)
+    if latest.height == 0:
+        return None
+    root = Path(store_root)
+    old = sorted(root.glob("*.parquet"))
+    target = root / "compacted.parquet"
+    tmp = root / "compacted.parquet.tmp"
+    latest.write_parquet(tmp, compression="zstd")
+    for f in old:
+        if f != target:
+            f.unlink()
+    tmp.replace(target)
+    return target
+
+
+def rollup_column_profiles(profiles: pl.DataFrame) -> pl.DataFrame:
+    """Merge partition-level sketches into dataset-level column profiles without rescanning data.
+
+    HLL registers written under another ``HASH_IMPL`` cannot be merged with current ones: such
+    partitions are counted in ``stale_partitions`` and ``approx_distinct`` is None until they are
+    re-profiled (``profile --force``).
+    """
+    out: List[Dict[str, Any]] = []
+    if profiles.height == 0:
+        return pl.DataFrame()
+    groups: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+    for row in profiles.iter_rows(named=True):
+        groups.setdefault((row["dataset"], row["layer"], row["column"]), []).append(row)
+    for (dataset, layer, column), rows in sorted(groups.items()):
+        total_rows = sum(int(r["rows"] or 0) for r in rows)
+        nulls = sum(int(r["null_count"] or 0) for r in rows)
+        hll: Optional[HyperLogLog] = None
+        sketch: Optional[QuantileSketch] = None
+        stale = 0
+        for r in rows:
+            if r["hll_registers"] is not None:
+                if r["hash_impl"] != HASH_IMPL:
+                    stale += 1
+                    continue
+                part_hll = HyperLogLog.from_bytes(r["hll_registers"])
+                hll = part_hll if hll is None else hll.merge(part_hll)
+            if r["qs_pos_keys"] is not None or r["qs_zero_count"] is not None:
+                part_sketch = QuantileSketch.from_columns(r)
+                sketch = part_sketch if sketch is None else sketch.merge(part_sketch)
+        mins = [r["min"] for r in rows if r["min"] is not None]
+        maxs = [r["max"] for r in rows if r["max"] is not None]
+        weighted = [(r["mean"], r["rows"] - r["null_count"]) for r in rows if r["mean"] is not None]
+        weight = sum(w for _, w in weighted)
+        rec: Dict[str, Any] = {
+            "dataset": dataset,
+            "layer": layer,
+            "column": column,
+            "partitions": len(rows),
+            "stale_partitions": stale,
+            "rows": total_rows,
+            "null_count": nulls,
+            "null_ratio": float(nulls / total_rows) if total_rows else 0.0,
+            "approx_distinct": hll.estimate() if hll is not None and not stale else None,
+            "min": min(mins) if mins else None,
+            "max": max(maxs) if maxs else None,
+            "mean": float(sum(m * w for m, w in weighted) / weight) if weight else None,
+            "top_values": merge_top_k(r["top_values"] for r in rows)[:TOP_K],
+        }
+        for q in REPORTED_QUANTILES:
+            rec[f"p{int(round(q * 100)):02d}"] = sketch.quantile(q) if sketch is not None else None
+        out.append(rec)
+    return pl.DataFrame(out)
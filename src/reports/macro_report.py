@@ -1,90 +1,222 @@
+"""Macro report tables under ``research/`` for the Streamlit macro dashboard.
+
+Each table is one SQL file over the silver lake. ``run_macro_report`` runs the files concurrently
+on one shared connection (a cursor per worker thread, via ``SqlRunner``) and writes each result
+to Parquet, plus CSV on request. Files are replaced atomically, so the dashboard never reads a
+partial table.
+
+A table is skipped when its output exists and nothing it depends on changed since the last run.
+That means the same SQL text and params, and the same signature for every dataset directory its
+``read_parquet('...')`` globs read (``lakedb.scan_dataset``: file names and partition-directory
+mtimes). The globs are relative to the working directory, as when the SQL runs. The signatures
+are kept in ``research/.macro_report_state.json``, and only when they still hold after the table
+ran: a table whose inputs changed meanwhile runs again next time.
+"""
 from __future__ import annotations
 
+import argparse
+import concurrent.futures
+import hashlib
+import itertools
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
 
 import duckdb
 import pandas as pd
 
+from ..lakedb import scan_dataset
+from ..scoring import register_macros
+from ..sql_runner import SqlRunner
+
 
 RESEARCH_DIR = Path(__file__).resolve().parents[2] / "research"
 QUERIES_DIR = Path(__file__).resolve().parents[2] / "queries"
+STATE_NAME = ".macro_report_state.json"
 
+_READ_PARQUET_RE = re.compile(r"read_parquet\(\s*'([^']+)'")
 
-def ensure_research_dir() -> None:
-    RESEARCH_DIR.mkdir(parents=True, exist_ok=True)
 
+@dataclass(frozen=True)
+class MacroTable:
+    name: str
+    file: str  # relative to QUERIES_DIR
+    # Optional tables are reported and skipped on error instead of failing the report
+    optional: bool = False
 
-def run_sql(file_rel: str, duckdb_flags: str | None = None) -> pd.DataFrame:
-    sql_path = QUERIES_DIR / file_rel
-    with open(sql_path, "r", encoding="utf-8") as f:
-        sql = f.read()
-    # DuckDB executes SQL directly; we rely on default params embedded in the SQL files
-    con = duckdb.connect()
-    try:
-        df = con.execute(sql).df()
-        return df
-    finally:
-        con.close()
 
+MACRO_TABLES: Sequence[MacroTable] = (
+    MacroTable("league_week_metrics", "archive/league/league_aggregates_by_week.sql"),
+    MacroTable("league_yoy_metrics", "archive/league/league_aggregates_yoy.sql"),
+    MacroTable("league_efficiency_trends", "archive/league/league_efficiency_trends.sql"),
+    MacroTable("league_by_roof", "archive/league/league_aggregates_by_roof.sql"),
+    MacroTable("team_roof_counts", "archive/league/team_roof_game_counts.sql"),
+    # Team × week × roof game counts, for playoff-week filtering
+    MacroTable("team_roof_counts_by_week", "archive/league/team_roof_game_counts_by_week.sql", optional=True),
+    MacroTable("pos_tier_shares", "archive/weekly/pos_tier_shares.sql"),
+    MacroTable("flex_tier_shares", "archive/weekly/flex_tier_shares.sql"),
+    # Needs date fields across seasons; skipped when the schemas vary
+    MacroTable("calendar_effects", "archive/calendar/calendar_effects.sql", optional=True),
+)
 
-def save_df(df: pd.DataFrame, name: str) -> None:
-    # Save both Parquet and CSV for convenience
-    pq_path = RESEARCH_DIR / f"{name}.parquet"
-    csv_path = RESEARCH_DIR / f"{name}.csv"
-    df.to_parquet(pq_path, index=False)
-    df.to_csv(csv_path, index=False)
 
+@dataclass(frozen=True)
+class MacroResult:
+    name: str
+    status: str  # "ran", "skipped" or "failed"
+    seconds: float = 0.0
+    rows: Optional[int] = None
+    error: Optional[str] = None
 
-def main() -> None:
-    ensure_research_dir()
 
-    # 1) League weekly metrics
-    league_week = run_sql("league/league_aggregates_by_week.sql")
-    save_df(league_week, "league_week_metrics")
+def ensure_research_dir() -> None:
+    RESEARCH_DIR.mkdir(parents=True, exist_ok=True)
+
 
-    # 2) League YoY season aggregates
-    league_yoy = run_sql("league/league_aggregates_yoy.sql")
-    save_df(league_yoy, "league_yoy_metrics")
+@lru_cache(maxsize=1)
+def _runner() -> SqlRunner:
+    # One connection for the whole report, so each file is parsed once; cursors share its macros
+    con = duckdb.connect()
+    register_macros(con)
+    return SqlRunner(con)
 
-    # 3) Efficiency trends (weekly epa splits)
-    eff_trends = run_sql("league/league_efficiency_trends.sql")
-    save_df(eff_trends, "league_efficiency_trends")
 
-    # 3b) Roof splits (indoor/outdoor/retractable)
-    roof_splits = run_sql("league/league_aggregates_by_roof.sql")
-    save_df(roof_splits, "league_by_roof")
+def run_sql(file_rel: str, params: Optional[Mapping[str, Any]] = None) -> pd.DataFrame:
+    # Files carry default params in their SQL; ``params`` binds any $name/:name placeholders
+    return _runner().execute(QUERIES_DIR / file_rel, params).df()
 
-    # 3c) Team × roof game counts
-    team_roof_counts = run_sql("league/team_roof_game_counts.sql")
-    save_df(team_roof_counts, "team_roof_counts")
 
-    # 3d) Team × week × roof game counts (for playoff-week filtering)
-    try:
-        team_roof_by_week = run_sql("league/team_roof_game_counts_by_week.sql")
-        save_df(team_roof_by_week, "team_roof_counts_by_week")
-    except Exception as e:
-        print("Skipping team_roof_counts_by_week:", e)
+def save_df(df: pd.DataFrame, name: str, csv: bool = True) -> None:
+    df.to_parquet(RESEARCH_DIR / f"{name}.parquet", index=False)
+    if csv:
+        df.to_csv(RESEARCH_DIR / f"{name}.csv", index=False)
 
-    # 4) Position tier shares
-    pos_tiers = run_sql("weekly/pos_tier_shares.sql")
-    save_df(pos_tiers, "pos_tier_shares")
 
-    # 5) FLEX tier shares
-    flex_tiers = run_sql("weekly/flex_tier_shares.sql")
-    save_df(flex_tiers, "flex_tier_shares")
+def input_dirs(sql: str) -> List[str]:
+    """Directories read by the ``read_parquet('<glob>')`` calls of ``sql``: each glob cut at its
+    first wildcard component."""
+    dirs = set()
+    for pattern in _READ_PARQUET_RE.findall(sql):
+        fixed = list(itertools.takewhile(lambda part: not any(c in part for c in "*?["), Path(pattern).parts))
+        dirs.add(Path(*fixed).as_posix() if fixed else ".")
+    return sorted(dirs)
+
+
+def _fingerprint(text: str, params: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    return {
+        "sql": hashlib.sha256(text.encode("utf-8")).hexdigest()[:16],
+        "params": json.loads(json.dumps(dict(params or {}), sort_keys=True, default=str)),
+        "inputs": {d: scan_dataset(Path(d))[0] for d in input_dirs(text)},
+    }
 
-    # 6) Calendar effects
-    try:
-      cal = run_sql("calendar/calendar_effects.sql")
-      save_df(cal, "calendar_effects")
-    except Exception as e:
-      # Calendar analysis requires date fields across seasons; skip if schema variance
-      print("Skipping calendar_effects:", e)
 
+def _load_state(path: Path) -> Dict[str, Any]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_table(cur: duckdb.DuckDBPyConnection, name: str, csv: bool) -> int:
+    """Write the cursor's result to ``<name>.parquet`` (and ``.csv``); returns the row count."""
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+
+    table = cur.to_arrow_table()
+    outputs = [("parquet", pq.write_table)] + ([("csv", pacsv.write_csv)] if csv else [])
+    for ext, write in outputs:
+        path = RESEARCH_DIR / f"{name}.{ext}"
+        tmp = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+        write(table, tmp)
+        os.replace(tmp, path)
+    return table.num_rows
+
+
+def _run_table(
+    runner: SqlRunner, table: MacroTable, params: Optional[Mapping[str, Any]], csv: bool
+) -> MacroResult:
+    started = time.perf_counter()
+    # Each worker thread runs on its own cursor of the shared connection
+    rows = _write_table(runner.execute(QUERIES_DIR / table.file, params), table.name, csv)
+    return MacroResult(table.name, "ran", time.perf_counter() - started, rows)
+
+
+def run_macro_report(
+    tables: Sequence[MacroTable] = MACRO_TABLES,
+    params: Optional[Mapping[str, Any]] = None,
+    csv: bool = False,
+    force: bool = False,
+    max_workers: int = 4,
+) -> List[MacroResult]:
+    """Run the tables whose SQL, params or inputs changed; ``force`` runs them all.
+
+    Required tables that fail are reported as failed too; the caller decides whether that fails
+    the report. Results are in ``tables`` order.
+    """
+    ensure_research_dir()
+    runner = _runner()
+    state_path = RESEARCH_DIR / STATE_NAME
+    state = _load_state(state_path)
+    results: Dict[str, MacroResult] = {}
+    fingerprints: Dict[str, Dict[str, Any]] = {}
+    todo: List[MacroTable] = []
+    for table in tables:
+        fingerprints[table.name] = _fingerprint(runner.load(QUERIES_DIR / table.file).text, params)
+        last = dict(state.get(table.name) or {})
+        # A CSV is only current if the last run wrote one
+        wrote_csv = last.pop("csv", False)
+        outputs = [RESEARCH_DIR / f"{table.name}.parquet"] + ([RESEARCH_DIR / f"{table.name}.csv"] if csv else [])
+        current = last == fingerprints[table.name] and (wrote_csv or not csv) and all(p.exists() for p in outputs)
+        if current and not force:
+            results[table.name] = MacroResult(table.name, "skipped")
+        else:
+            todo.append(table)
+
+    # DuckDB releases the GIL while a query runs, so threads overlap the scans of different files
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {pool.submit(_run_table, runner, table, params, csv): table for table in todo}
+        for future in concurrent.futures.as_completed(futures):
+            table = futures[future]
+            try:
+                results[table.name] = future.result()
+                # Inputs rewritten while the table ran may or may not be in its output; record
+                # nothing then, so the next run builds it again
+                if _fingerprint(runner.load(QUERIES_DIR / table.file).text, params) == fingerprints[table.name]:
+                    state[table.name] = {**fingerprints[table.name], "csv": csv}
+                else:
+                    state.pop(table.name, None)
+            except Exception as exc:
+                results[table.name] = MacroResult(table.name, "failed", error=str(exc))
+                state.pop(table.name, None)
+
+    tmp = state_path.with_name(f"{state_path.name}.tmp-{os.getpid()}")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True))
+    os.replace(tmp, state_path)
+    return [results[t.name] for t in tables]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Write the macro report tables to research/")
+    parser.add_argument("--csv", action="store_true", help="Also write CSV next to each Parquet table")
+    parser.add_argument("--force", action="store_true", help="Run every table, even if its inputs are unchanged")
+    parser.add_argument("--max-workers", type=int, default=4, help="Tables run at once on the shared connection")
+    opts = parser.parse_args(argv)
+
+    optional = {t.name for t in MACRO_TABLES if t.optional}
+    results = run_macro_report(csv=opts.csv, force=opts.force, max_workers=opts.max_workers)
+    for r in results:
+        detail = f"{r.seconds:6.2f}s {r.rows} rows" if r.status == "ran" else (r.error or "")
+        print(f"{r.name:<26} {r.status:<8} {detail}")
+    failed = [r.name for r in results if r.status == "failed" and r.name not in optional]
     print("Report tables written to:", RESEARCH_DIR)
+    if failed:
+        raise SystemExit(f"failed: {', '.join(failed)}")
 
 
 if __name__ == "__main__":
     main()
-
-
@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import concurrent.futures
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import duckdb
+
+from ..config import DatasetCatalog
+from ..lakedb import LakeRelation, SchemaCache, lake_relations, parquet_files
+from ..scoring import register_macros
+from ..sql_runner import SqlRunner
+
+try:
+    import structlog  # type: ignore
+    logger = structlog.get_logger(__name__)
+except Exception:  # pragma: no cover
+    class _DummyLogger:
+        def info(self, *args, **kwargs):
+            pass
+
+        def warning(self, *args, **kwargs):
+            pass
+
+    logger = _DummyLogger()
+
+
+# Relations report SQL reads when no catalog is given. Each is a full view ``<view>`` over every
+# season and a season-scoped ``<view>_for_season`` over the files of the ``$season`` partition.
+LAKE_RELATIONS: Dict[str, LakeRelation] = {
+    rel.view: rel
+    for rel in (
+        LakeRelation("silver_pbp", "silver/pbp", ("year",)),
+        LakeRelation("silver_weekly", "silver/weekly"),
+        LakeRelation("silver_schedules", "silver/schedules"),
+        LakeRelation("silver_rosters", "silver/rosters"),
+        # Gold intermediates built once per run and shared by several reports
+        LakeRelation("gold_team_week_context", "gold/team_week_context"),
+        LakeRelation("gold_player_week_events", "gold/player_week_events"),
+        # Dashboard cubes roll up from the week cube
+        LakeRelation("gold_team_position_week", "gold/cubes/team_position_week"),
+    )
+}
+
+# Week fingerprints of each (relation, season), kept with the signature of the files they were computed from
+WEEK_FINGERPRINTS_NAME = ".week_fingerprints.json"
+
+_COPY_TARGET_RE = re.compile(r"\)\s*TO\s+'([^']+)'", re.IGNORECASE)
+_COPY_RE = re.compile(
+    r"^(?P<head>.*?)\bCOPY\s*\((?P<query>.*)\)\s*TO\s+'(?P<target>[^']+)'\s*(?P<options>.*?);?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_PARTITION_BY_RE = re.compile(r"PARTITION_BY\s*\(([^)]*)\)", re.IGNORECASE)
+_OVERWRITE_RE = re.compile(r",\s*OVERWRITE(?:_OR_IGNORE)?\s*(?:1|true)?", re.IGNORECASE)
+# Partition keys that scope a swap unit; deeper keys (e.g. team) are swapped together
+_SCOPE_KEYS = ("season", "week", "season_type")
+
+
+class ReportRunner:
+    """Run report SQL in-process on a single DuckDB connection.
+
+    Each silver dataset and shared gold intermediate is exposed as ``<view>`` over every season
+    (created on first use, since binding it opens every footer) and as ``<view>_for_season``, a
+    temporary view on the statement's cursor over only the ``$season`` partition's files, typed
+    with the relation's cached union schema. Each statement runs on its own cursor so independent
+    reports can execute on parallel threads against the same database. SQL files reference
+    ``$season``/``$season_type`` (and any other ``$name``) as bound parameters; each file is parsed
+    once by the shared ``SqlRunner`` and re-executed with new values.
+    """
+
+    def __init__(
+        self,
+        root: str = "data",
+        database: str = ":memory:",
+        threads: Optional[int] = None,
+        relations: Optional[Dict[str, LakeRelation]] = None,
+    ) -> None:
+        self.root = Path(root)
+        self.con = duckdb.connect(database)
+        if threads:
+            self.con.execute(f"SET threads = {int(threads)}")
+        # Footers are re-read by every report otherwise
+        self.con.execute("SET parquet_metadata_cache = true")
+        self._lock = threading.Lock()
+        self.sql = SqlRunner(self.con)
+        register_macros(self.con)
+        self.relations = relations or LAKE_RELATIONS
+        self._schemas = SchemaCache(self.root)
+        self._columns: Dict[str, List[Tuple[str, str]]] = {}
+        self._created: set[str] = set()
+        self._fingerprints_path = self.root / WEEK_FINGERPRINTS_NAME
+        try:
+            self._week_fps: Dict[str, Dict[str, Any]] = json.loads(self._fingerprints_path.read_text())
+        except (OSError, ValueError):
+            self._week_fps = {}
+        self._fp_locks: Dict[str, threading.Lock] = {}
+        # Full-row hashes computed by ``week_fingerprints``; reused results do not count
+        self.fingerprint_scans = 0
+        self.refresh_views()
+
+    def refresh_views(self) -> List[str]:
+        """Refresh the cached schema of every relation with files; returns those relations.
+
+        Datasets with no files yet are skipped. Full views are (re)created on first use.
+        """
+        with self._lock:
+            columns: Dict[str, List[Tuple[str, str]]] = {}
+            for view, rel in self.relations.items():
+                files = parquet_files(self.root / rel.path)
+                if files:
+                    columns[view] = self._schemas.columns(self.con, view, files)
+            self._schemas.save()
+            # Full views glob at query time, so only those whose dataset disappeared are dropped
+            for view in self._created - set(columns):
+                self.con.execute(f"DROP VIEW IF EXISTS {view}")
+            self._columns = columns
+            self._created &= set(columns)
+        return list(columns)
+
+    def _referenced(self, sql: str) -> Tuple[List[str], List[LakeRelation]]:
+        """Full views and season-scoped relations named in ``sql``."""
+        full = [v for v in self.relations if re.search(rf"\b{v}\b", sql)]
+        scoped = [r for r in self.relations.values() if r.season_key and re.search(rf"\b{r.scoped_view}\b", sql)]
+        if any(v not in self._columns for v in full) or any(r.view not in self._columns for r in scoped):
+            # A dataset may have landed since the views were registered
+            self.refresh_views()
+        return full, scoped
+
+    def _prepare(self, cur: duckdb.DuckDBPyConnection, sql: str, season: Any) -> None:
+        """Create the views ``sql`` reads: shared full views and this cursor's scoped views."""
+        full, scoped = self._referenced(sql)
+        with self._lock:
+            for view in full:
+                if view in self._columns and view not in self._created:
+                    glob = (self.root / self.relations[view].glob).as_posix()
+                    self.con.execute(
+                        f"CREATE OR REPLACE VIEW {view} AS SELECT * FROM "
+                        f"read_parquet('{glob}', hive_partitioning = true, union_by_name = true)"
+                    )
+                    self._created.add(view)
+            columns = {rel.view: self._columns.get(rel.view) for rel in scoped}
+        for rel in scoped:
+            if season is None:
+                raise ValueError(f"{rel.scoped_view} needs a season parameter")
+            body = _scoped_select(rel, self.root, season, columns[rel.view])
+            cur.execute(f"CREATE OR REPLACE TEMP VIEW {rel.scoped_view} AS {body}")
+
+    def execute(self, path: Path, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """Execute one SQL file with bound parameters; returns a polars frame for SELECTs."""
+        query = self.sql.load(path)
+        bound = query.bind(params)
+        for target in _COPY_TARGET_RE.findall(query.text):
+            # DuckDB creates the COPY directory itself but not its parents
+            Path(target).parent.mkdir(parents=True, exist_ok=True)
+        logger.info("run_sql", file=str(path), **bound)
+        cur = self.con.cursor()
+        try:
+            self._prepare(cur, query.text, (params or {}).get("season"))
+            self.sql.execute(query, bound, cur)
+            if cur.description is None:
+                return None
+            return cur.pl()
+        finally:
+            cur.close()
+
+    def week_fingerprints(self, view: str, season: int) -> Dict[int, str]:
+        """Order-insensitive content fingerprint of each week of ``view`` for one season.
+
+        Silver is partitioned by season, so finding the changed weeks means hashing the season's
+        rows. That is done once per version of the season's files: the result is cached (and
+        persisted at ``<root>/.week_fingerprints.json``) under the files' names and mtimes, so
+        report nodes sharing an input, and later runs over unchanged data, reuse it.
+        """
+        rel = self.relations.get(view)
+        if rel is None or rel.season_key is None:
+            return {}
+        key = f"{view}/{season}"
+        with self._lock:
+            lock = self._fp_locks.setdefault(key, threading.Lock())
+        with lock:
+            files = parquet_files(self.root / rel.path / f"{rel.season_key}={season}")
+            signature = hashlib.sha256(json.dumps(sorted(files.items())).encode("utf-8")).hexdigest()[:16]
+            cached = self._week_fps.get(key)
+            if cached is not None and cached["signature"] == signature:
+                return {int(week): fp for week, fp in cached["weeks"].items()}
+            weeks = self._hash_weeks(rel, season) if files else {}
+            with self._lock:
+                self._week_fps[key] = {"signature": signature, "weeks": {str(w): fp for w, fp in weeks.items()}}
+                tmp = self._fingerprints_path.with_name(f"{self._fingerprints_path.name}.tmp-{os.getpid()}")
+                self._fingerprints_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_text(json.dumps(self._week_fps))
+                os.replace(tmp, self._fingerprints_path)
+            return weeks
+
+    def _hash_weeks(self, rel: LakeRelation, season: int) -> Dict[int, str]:
+        if rel.view not in self._columns:
+            self.refresh_views()
+            if rel.view not in self._columns:
+                return {}
+        cur = self.con.cursor()
+        try:
+            self._prepare(cur, rel.scoped_view, season)
+            rows = cur.execute(
+                f"SELECT week, count(*) AS n, sum(hash(t)::HUGEINT) AS h FROM {rel.scoped_view} t "
+                f"WHERE {rel.season_key} = $season AND week IS NOT NULL GROUP BY week",
+                {"season": season},
+            ).fetchall()
+        finally:
+            cur.close()
+        with self._lock:
+            self.fingerprint_scans += 1
+        logger.info("week_fingerprints_computed", view=rel.view, season=season)
+        return {int(week): f"{n}:{h}" for week, n, h in rows}
+
+    def materialize(
+        self, path: Path, params: Dict[str, Any], weeks: Optional[Sequence[int]] = None
+    ) -> List[Path]:
+        """Run a ``COPY (...) TO '<dir>'`` report into a staging dir and swap partitions in.
+
+        With ``weeks`` only those weeks are computed (the filter is pushed down to the silver
+        scans); otherwise everything the query returns is rewritten. Each staged
+        season/week(/season_type) directory replaces its live counterpart with a rename, so
+        readers see either the old or the new partition, never a partial write. Returns the
+        swapped partition directories.
+        """
+        sql = self.sql.load(path).text
+        m = _COPY_RE.match(sql)
+        if m is None:
+            raise ValueError(f"{path}: expected a single COPY (...) TO '<dir>' statement")
+        target = Path(m.group("target"))
+        options = m.group("options")
+        pm = _PARTITION_BY_RE.search(options)
+        keys = [k.strip() for k in pm.group(1).split(",")] if pm else []
+        depth = 0
+        while depth < len(keys) and keys[depth] in _SCOPE_KEYS:
+            depth += 1
+        if depth == 0:
+            raise ValueError(f"{path}: incremental materialization needs PARTITION_BY (season, ...)")
+        if weeks is not None and "week" not in keys[:depth]:
+            raise ValueError(f"{path}: week-level materialization needs week in PARTITION_BY")
+
+        staging = target.parent / f".{target.name}.staging-{uuid.uuid4().hex[:8]}"
+        query = m.group("query")
+        if weeks is not None:
+            query = f"SELECT * FROM ({query}) AS report WHERE list_contains($weeks, week)"
+        staged_sql = (
+            f"{m.group('head')}COPY ({query}) TO '{staging.as_posix()}' {_OVERWRITE_RE.sub('', options)}"
+        )
+        values = dict(params)
+        if weeks is not None:
+            values["weeks"] = sorted(int(w) for w in weeks)
+        # The staging target differs per call, so this statement is parsed here rather than cached
+        staged = self.sql.parse(staged_sql, name=str(path))
+        bound = staged.bind(values)
+        logger.info("materialize", file=str(path), weeks=bound.get("weeks"), **{k: v for k, v in bound.items() if k != "weeks"})
+
+        staging.parent.mkdir(parents=True, exist_ok=True)
+        cur = self.con.cursor()
+        try:
+            self._prepare(cur, sql, values.get("season"))
+            self.sql.execute(staged, bound, cur)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        finally:
+            cur.close()
+        return _swap_partitions(staging, target, depth)
+
+    def run_many(
+        self, jobs: Sequence[Tuple[Path, Dict[str, Any]]], max_workers: int = 4
+    ) -> Dict[str, Optional[str]]:
+        """Run independent SQL files concurrently; returns ``{path: error or None}``."""
+        errors: Dict[str, Optional[str]] = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = {pool.submit(self.execute, path, params): str(path) for path, params in jobs}
+            for fut in concurrent.futures.as_completed(futures):
+                name = futures[fut]
+                try:
+                    fut.result()
+                    errors[name] = None
+                except Exception as exc:
+                    logger.warning("run_sql_failed", file=name, error=str(exc))
+                    errors[name] = str(exc)
+        return errors
+
+    def close(self) -> None:
+        self.con.close()
+
+    def __enter__(self) -> "ReportRunner":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _scoped_select(rel: LakeRelation, root: Path, season: Any, columns: Optional[List[Tuple[str, str]]]) -> str:
+    """``SELECT`` over one season's files with the relation's full column set.
+
+    The zero-row typed relation fixes names and types ahead of the scan; ``UNION ALL BY NAME``
+    NULL-fills columns an older season's files lack. With no files only the empty relation is left.
+    """
+    typed = ", ".join(f'NULL::{typ} AS "{name}"' for name, typ in columns or [])
+    empty = f"SELECT {typed} LIMIT 0" if typed else f"SELECT NULL::BIGINT AS {rel.season_key} LIMIT 0"
+    files = rel.season_files(root, season)
+    if not files:
+        return empty
+    file_list = ", ".join("'" + f.replace("'", "''") + "'" for f in files)
+    return (
+        f"SELECT * FROM ({empty}) UNION ALL BY NAME "
+        f"SELECT * FROM read_parquet([{file_list}], hive_partitioning = true, union_by_name = true)"
+    )
+
+
+def _swap_partitions(staging: Path, target: Path, depth: int) -> List[Path]:
+    """Rename each partition of ``staging`` into ``target`` (see ``io.move_replace`` for what readers see).
+
+    Replaced partitions are moved to a trash directory beside ``staging``, outside ``target``.
+    """
+    swapped: List[Path] = []
+    trash_root = staging.with_name(f"{staging.name}.old")
+    try:
+        if not staging.exists():
+            return swapped
+        units = sorted(p for p in staging.glob("/".join(["*"] * depth)) if p.is_dir())
+        for i, unit in enumerate(units):
+            rel = unit.relative_to(staging)
+            live = target / rel
+            live.parent.mkdir(parents=True, exist_ok=True)
+            trash = trash_root / str(i)
+            if live.exists():
+                trash_root.mkdir(exist_ok=True)
+                live.rename(trash)
+            unit.rename(live)
+            shutil.rmtree(trash, ignore_errors=True)
+            swapped.append(live)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+        shutil.rmtree(trash_root, ignore_errors=True)
+    return swapped
+
+
+_shared: Optional[ReportRunner] = None
+_shared_lock = threading.Lock()
+
+
+def get_runner(root: Optional[str] = None, catalog: Optional[DatasetCatalog] = None) -> ReportRunner:
+    """Process-wide runner so every report in a run shares one connection and its views.
+
+    Without ``root`` the current runner is reused (or one over ``data`` is created). With
+    ``catalog`` its datasets and report outputs become the runner's relations.
+    """
+    global _shared
+    relations = lake_relations(catalog) if catalog is not None else None
+    with _shared_lock:
+        if _shared is not None and (root is None or _shared.root == Path(root)):
+            if relations is not None and relations != _shared.relations:
+                _shared.relations = relations
+                _shared.refresh_views()
+            return _shared
+        if _shared is not None:
+            _shared.close()
+        _shared = ReportRunner(root or "data", relations=relations)
+        return _shared
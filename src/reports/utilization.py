@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-import subprocess
 from pathlib import Path
+from typing import List, Optional
+
+from .runner import get_runner
 
 try:
     import structlog  # type: ignore
@@ -18,13 +20,22 @@ except Exception:  # pragma: no cover
 
 
 def _run_sql(path: Path, season: int, season_type: str = "REG") -> None:
-    cmd = ["bash", "scripts/run_query.sh", "-f", str(path), "-s", str(season), "-t", season_type]
-    logger.info("run_sql", file=str(path), season=season, season_type=season_type)
-    subprocess.run(cmd, check=True)
+    get_runner().execute(path, {"season": season, "season_type": season_type})
+
+
+def materialize_report(
+    path: Path, season: int, season_type: str = "REG", weeks: Optional[List[int]] = None
+) -> List[Path]:
+    """Build a gold report into staging and atomically swap in the affected partitions."""
+    return get_runner().materialize(path, {"season": season, "season_type": season_type}, weeks=weeks)
 
 
 def materialize_team_week_context(season: int, season_type: str = "REG") -> None:
-    _run_sql(Path("queries/utilization/materialize_team_week_context.sql"), season, season_type)
+    materialize_report(Path("queries/reports/materialize_team_week_context.sql"), season, season_type)
+
+
+def materialize_player_week_events(season: int, season_type: str = "REG") -> None:
+    materialize_report(Path("queries/reports/materialize_player_week_events.sql"), season, season_type)
 
 
 def materialize_player_week(season: int, season_type: str = "REG") -> None:
@@ -36,38 +47,39 @@ def smoke_validate_receiving_events(season: int, season_type: str = "REG") -> No
 
 def backfill_weekly_from_pbp(season: int, season_type: str = "REG") -> None:
     _run_sql(Path("queries/utilization/backfill/write_weekly_from_pbp.sql"), season, season_type)
+    get_runner().refresh_views()
 
 
 
 def materialize_player_week_stats(season: int, season_type: str = "REG") -> None:
-    _run_sql(Path("queries/reports/materialize_player_week_stats.sql"), season, season_type)
+    materialize_report(Path("queries/reports/materialize_player_week_stats.sql"), season, season_type)
 
 
 def materialize_player_week_utilization(season: int, season_type: str = "REG") -> None:
-    _run_sql(Path("queries/reports/materialize_player_week_utilization.sql"), season, season_type)
+    materialize_report(Path("queries/reports/materialize_player_week_utilization.sql"), season, season_type)
 
 
 def materialize_player_week_utilization_receiving(season: int, season_type: str = "REG") -> None:
-    _run_sql(Path("queries/reports/materialize_player_week_utilization_receiving.sql"), season, season_type)
+    materialize_report(Path("queries/reports/materialize_player_week_utilization_receiving.sql"), season, season_type)
 
 
 def materialize_player_week_utilization_rushing(season: int, season_type: str = "REG") -> None:
-    _run_sql(Path("queries/reports/materialize_player_week_utilization_rushing.sql"), season, season_type)
+    materialize_report(Path("queries/reports/materialize_player_week_utilization_rushing.sql"), season, season_type)
 
 
 def materialize_player_week_utilization_wr(season: int, season_type: str = "REG") -> None:
-    _run_sql(Path("queries/reports/materialize_player_week_utilization_wr.sql"), season, season_type)
+    materialize_report(Path("queries/reports/materialize_player_week_utilization_wr.sql"), season, season_type)
 
 
 def materialize_player_week_utilization_te(season: int, season_type: str = "REG") -> None:
-    _run_sql(Path("queries/reports/materialize_player_week_utilization_te.sql"), season, season_type)
+    materialize_report(Path("queries/reports/materialize_player_week_utilization_te.sql"), season, season_type)
 
 
 def materialize_player_week_utilization_rb(season: int, season_type: str = "REG") -> None:
-    _run_sql(Path("queries/reports/materialize_player_week_utilization_rb.sql"), season, season_type)
+    materialize_report(Path("queries/reports/materialize_player_week_utilization_rb.sql"), season, season_type)
 
 
 
 def materialize_defense_position_points_allowed(season: int, season_type: str = "REG") -> None:
-    _run_sql(Path("queries/reports/materialize_defense_position_points_allowed.sql"), season, season_type)
+    materialize_report(Path("queries/reports/materialize_defense_position_points_allowed.sql"), season, season_type)
 
@@ -1,74 +1,103 @@
 # pyright: reportMissingImports=false, reportMissingModuleSource=false
 from __future__ import annotations
 
+from functools import lru_cache
+from typing import Any, Dict
 import polars as pl
-import pandera.pandas as pa
+import hashlib
+import inspect
 
+from ..version import PIPELINE_VERSION
 
-PBP_SCHEMA_BRONZE = pa.DataFrameSchema(
-    {
-        "game_id": pa.Column(str, nullable=True),
-        "play_id": pa.Column("Int64", nullable=True),
-        "year": pa.Column("Int64", nullable=True),
-    },
-    coerce=True,
-)
 
-PBP_SCHEMA_SILVER = pa.DataFrameSchema(
-    {
-        "game_id": pa.Column(str, nullable=False),
-        "play_id": pa.Column("Int64", pa.Check.ge(1), nullable=False),
-        "year": pa.Column("Int64", nullable=False),
-    },
-    coerce=True,
+# Pandera takes ~0.3s to import, so the schemas are built on first validation and exposed as
+# module attributes through ``__getattr__``; commands that never validate never import it.
+_SCHEMA_NAMES = (
+    "PBP_SCHEMA_BRONZE",
+    "PBP_SCHEMA_SILVER",
+    "SCHEDULES_SCHEMA_BRONZE",
+    "SCHEDULES_SCHEMA_SILVER",
+    "WEEKLY_SCHEMA_BRONZE",
+    "WEEKLY_SCHEMA_SILVER",
 )
 
-SCHEDULES_SCHEMA_BRONZE = pa.DataFrameSchema(
-    {
-        "game_id": pa.Column(str, nullable=True),
-        # season may be missing in older schedules; allow missing in bronze
-        # and add it from partition later if needed
-    },
-    coerce=True,
-)
 
-SCHEDULES_SCHEMA_SILVER = pa.DataFrameSchema(
-    {
-        "game_id": pa.Column(str, nullable=False),
-        # season remains optional in silver for legacy backfills; we partition on season
-    },
-    coerce=True,
-)
+@lru_cache(maxsize=1)
+def _build_schemas() -> Dict[str, Any]:
+    import pandera.pandas as pa
 
-WEEKLY_SCHEMA_BRONZE = pa.DataFrameSchema(
-    {
-        "season": pa.Column("Int64", nullable=True),
-        "week": pa.Column("Int64", nullable=True),
-        "player_id": pa.Column(str, nullable=True),
-        # team not guaranteed in bronze; may be `recent_team`. Silver enforces `team`.
-    },
-    coerce=True,
-)
+    return {
+        "PBP_SCHEMA_BRONZE": pa.DataFrameSchema(
+            {
+                "game_id": pa.Column(str, nullable=True),
+                "play_id": pa.Column("Int64", nullable=True),
+                "year": pa.Column("Int64", nullable=True),
+            },
+            coerce=True,
+        ),
+        "PBP_SCHEMA_SILVER": pa.DataFrameSchema(
+            {
+                "game_id": pa.Column(str, nullable=False),
+                "play_id": pa.Column("Int64", pa.Check.ge(1), nullable=False),
+                "year": pa.Column("Int64", nullable=False),
+            },
+            coerce=True,
+        ),
+        "SCHEDULES_SCHEMA_BRONZE": pa.DataFrameSchema(
+            {
+                "game_id": pa.Column(str, nullable=True),
+                # season may be missing in older schedules; allow missing in bronze
+                # and add it from partition later if needed
+            },
+            coerce=True,
+        ),
+        "SCHEDULES_SCHEMA_SILVER": pa.DataFrameSchema(
+            {
+                "game_id": pa.Column(str, nullable=False),
+                # season remains optional in silver for legacy backfills; we partition on season
+            },
+            coerce=True,
+        ),
+        "WEEKLY_SCHEMA_BRONZE": pa.DataFrameSchema(
+            {
+                "season": pa.Column("Int64", nullable=True),
+                "week": pa.Column("Int64", nullable=True),
+                "player_id": pa.Column(str, nullable=True),
+                # team not guaranteed in bronze; may be `recent_team`. Silver enforces `team`.
+            },
+            coerce=True,
+        ),
+        "WEEKLY_SCHEMA_SILVER": pa.DataFrameSchema(
+            {
+                "season": pa.Column("Int64", nullable=False),
+                "week": pa.Column("Int64", nullable=False),
+                "player_id": pa.Column(str, nullable=False),
+                # Allow team to be nullable for seasons/rows where team is not provided upstream
+                "team": pa.Column(str, nullable=True),
+            },
+            coerce=True,
+        ),
+    }
 
-WEEKLY_SCHEMA_SILVER = pa.DataFrameSchema(
-    {
-        "season": pa.Column("Int64", nullable=False),
-        "week": pa.Column("Int64", nullable=False),
-        "player_id": pa.Column(str, nullable=False),
-        # Allow team to be nullable for seasons/rows where team is not provided upstream
-        "team": pa.Column(str, nullable=True),
-    },
-    coerce=True,
-)
+
+def _schema(name: str) -> Any:
+    # A module attribute (e.g. a patched schema) takes precedence over the built one
+    return globals().get(name) or _build_schemas()[name]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SCHEMA_NAMES:
+        return _build_schemas()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def validate_bronze(dataset: str, df: pl.DataFrame) -> None:
     if dataset == "pbp":
-        PBP_SCHEMA_BRONZE.validate(df.to_pandas(), lazy=True)
+        _schema("PBP_SCHEMA_BRONZE").validate(df.to_pandas(), lazy=True)
     elif dataset == "schedules":
-        SCHEDULES_SCHEMA_BRONZE.validate(df.to_pandas(), lazy=True)
+        _schema("SCHEDULES_SCHEMA_BRONZE").validate(df.to_pandas(), lazy=True)
     elif dataset == "weekly":
-        WEEKLY_SCHEMA_BRONZE.validate(df.to_pandas(), lazy=True)
+        _schema("WEEKLY_SCHEMA_BRONZE").validate(df.to_pandas(), lazy=True)
     elif dataset == "rosters":
         # minimal: season/week/player_id/team optional in bronze
         pass
@@ -95,11 +124,11 @@ def validate_bronze(dataset: str, df: pl.DataFrame) -> None:
 
 def validate_silver(dataset: str, df: pl.DataFrame) -> None:
     if dataset == "pbp":
-        PBP_SCHEMA_SILVER.validate(df.to_pandas(), lazy=True)
+        _schema("PBP_SCHEMA_SILVER").validate(df.to_pandas(), lazy=True)
     elif dataset == "schedules":
-        SCHEDULES_SCHEMA_SILVER.validate(df.to_pandas(), lazy=True)
+        _schema("SCHEDULES_SCHEMA_SILVER").validate(df.to_pandas(), lazy=True)
     elif dataset == "weekly":
-        WEEKLY_SCHEMA_SILVER.validate(df.to_pandas(), lazy=True)
+        _schema("WEEKLY_SCHEMA_SILVER").validate(df.to_pandas(), lazy=True)
     elif dataset == "rosters":
         # Expect core keys present
         required = ["season", "week", "player_id", "team"]
@@ -133,3 +162,30 @@ def validate_silver(dataset: str, df: pl.DataFrame) -> None:
         required = ["season","player_id"]
         assert all(c in df.columns for c in required), "seasonal_rosters silver missing required key columns"
 
+
+
+def _schema_text(schema: Any) -> str:
+    try:
+        return schema.to_json()
+    except Exception:
+        return repr(schema)
+
+
+@lru_cache(maxsize=1)
+def _rules_digest() -> str:
+    """Digest of every schema definition and validator body in this module.
+
+    Any edit to a pandera schema or to ``validate_bronze``/``validate_silver`` changes the
+    digest, which invalidates cached validation outcomes without a manual version bump.
+    """
+    h = hashlib.sha256()
+    for name in sorted(_SCHEMA_NAMES):
+        h.update(name.encode("utf-8"))
+        h.update(_schema_text(_schema(name)).encode("utf-8"))
+    for fn in (validate_bronze, validate_silver):
+        h.update(inspect.getsource(fn).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def schema_version(dataset: str, layer: str) -> str:
+    return f"{dataset}:{layer}:{_rules_digest()}:{PIPELINE_VERSION}"
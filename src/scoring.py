@@ -0,0 +1,181 @@
+# pyright: reportMissingImports=false, reportMissingModuleSource=false
+"""Fantasy scoring compiled from the rules catalog.
+
+Each rules YAML (``catalog/draftkings/*.yml``, ``catalog/scoring/*.yml``) compiles to a list of
+linear terms and threshold bonuses over player-week stat columns. The same terms render as a
+Polars expression (``ScoringRules.expr``/``score``, vectorized over any frame or Arrow table) and
+as a DuckDB macro ``<name>_points(row)`` (``register_macros``), so reports, pages and ad-hoc
+queries all score from the catalog instead of restating the weights.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Tuple, Union
+
+import duckdb
+import yaml
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import polars as pl
+    import pyarrow as pa
+
+
+CATALOG_DIR = Path(__file__).resolve().parents[1] / "catalog"
+
+# Rules registered as DuckDB macros: ``dk_classic`` -> ``dk_classic_points(row)``
+SCORING_CATALOG: Dict[str, Path] = {
+    "dk_classic": CATALOG_DIR / "draftkings" / "classic.yml",
+    "dk_showdown": CATALOG_DIR / "draftkings" / "showdown.yml",
+    "dk_bestball": CATALOG_DIR / "draftkings" / "bestball.yml",
+    "standard_ppr": CATALOG_DIR / "scoring" / "standard_ppr.yml",
+}
+
+# Player-week stat columns (silver weekly names) each rule counts
+RULE_STATS: Dict[str, Tuple[str, ...]] = {
+    "passing_td": ("passing_tds",),
+    "passing_yards": ("passing_yards",),
+    "passing_300_bonus": ("passing_yards",),
+    "interception": ("interceptions",),
+    "rushing_td": ("rushing_tds",),
+    "rushing_yards": ("rushing_yards",),
+    "rushing_100_bonus": ("rushing_yards",),
+    "receiving_td": ("receiving_tds",),
+    "receiving_yards": ("receiving_yards",),
+    "receiving_100_bonus": ("receiving_yards",),
+    "reception": ("receptions",),
+    "return_td": ("special_teams_tds",),
+    "fumble_lost": ("rushing_fumbles_lost", "receiving_fumbles_lost", "sack_fumbles_lost"),
+    "two_point_conversion": ("passing_2pt_conversions", "rushing_2pt_conversions", "receiving_2pt_conversions"),
+}
+# Rules with no player-week stat: team DST and kicker rows, fumble recoveries returned for a TD
+UNSCORED_RULES = frozenset({"dst", "kicker", "offensive_fumble_recovery_td"})
+
+
+@dataclass(frozen=True)
+class ScoringTerm:
+    """``points`` per unit of the summed ``columns``, or once when they reach ``threshold``."""
+
+    rule: str
+    columns: Tuple[str, ...]
+    points: float
+    threshold: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class ScoringRules:
+    name: str
+    terms: Tuple[ScoringTerm, ...]
+
+    @property
+    def stat_columns(self) -> Tuple[str, ...]:
+        return tuple(sorted({c for t in self.terms for c in t.columns}))
+
+    def expr(
+        self,
+        columns: Optional[Mapping[str, str]] = None,
+        bonuses: bool = True,
+        available: Optional[set] = None,
+    ) -> pl.Expr:
+        """Points as a Polars expression; nulls count as zero.
+
+        ``columns`` renames stats to the frame's columns. Stats missing from ``available`` are
+        left out. ``bonuses=False`` drops threshold bonuses, which are per game and do not apply
+        to season totals.
+        """
+        import polars as pl
+
+        columns = columns or {}
+        total = pl.lit(0.0)
+        for term in self.terms:
+            if term.threshold is not None and not bonuses:
+                continue
+            cols = [columns.get(c, c) for c in term.columns]
+            if available is not None:
+                cols = [c for c in cols if c in available]
+            if not cols:
+                continue
+            value = pl.sum_horizontal([pl.col(c).cast(pl.Float64).fill_null(0.0) for c in cols])
+            if term.threshold is None:
+                total = total + term.points * value
+            else:
+                total = total + pl.when(value >= term.threshold).then(term.points).otherwise(0.0)
+        return total.alias(f"{self.name}_points")
+
+    def score(
+        self,
+        frame: Union[pl.DataFrame, pa.Table, pd.DataFrame],
+        columns: Optional[Mapping[str, str]] = None,
+        bonuses: bool = True,
+    ) -> pl.Series:
+        """Points for every row of ``frame`` in one pass."""
+        import polars as pl
+        import pyarrow as pa
+
+        if isinstance(frame, pa.Table):
+            frame = pl.from_arrow(frame)
+        elif not isinstance(frame, pl.DataFrame):
+            frame = pl.from_pandas(frame)
+        return frame.select(self.expr(columns, bonuses, available=set(frame.columns))).to_series()
+
+    def sql(self, row: str) -> str:
+        """Points as a SQL expression over the fields of ``row`` (a table alias or struct)."""
+        parts = []
+        for term in self.terms:
+            value = " + ".join(f"COALESCE({row}.{c}, 0)" for c in term.columns)
+            if len(term.columns) > 1:
+                value = f"({value})"
+            if term.threshold is None:
+                parts.append(f"{float(term.points)!r} * {value}")
+            else:
+                parts.append(f"CASE WHEN {value} >= {float(term.threshold)!r} THEN {float(term.points)!r} ELSE 0.0 END")
+        return " + ".join(parts) or "0.0"
+
+
+def compile_rules(doc: Mapping[str, Any], name: str) -> ScoringRules:
+    """Compile the ``scoring`` section of a rules document."""
+    terms = []
+    for rule, cfg in (doc.get("scoring") or {}).items():
+        if rule in UNSCORED_RULES:
+            continue
+        if rule not in RULE_STATS:
+            raise ValueError(f"{name}: no player-week stat for scoring rule {rule!r}")
+        if not isinstance(cfg, dict):
+            cfg = {"points": cfg}
+        if "threshold" in cfg:
+            terms.append(ScoringTerm(rule, RULE_STATS[rule], float(cfg["bonus_points"]), float(cfg["threshold"])))
+        elif "per_yard" in cfg:
+            terms.append(ScoringTerm(rule, RULE_STATS[rule], float(cfg["per_yard"])))
+        else:
+            points = float(cfg["points"]) / float(cfg.get("per_units") or 1)
+            terms.append(ScoringTerm(rule, RULE_STATS[rule], points))
+    return ScoringRules(name=name, terms=tuple(terms))
+
+
+@lru_cache(maxsize=None)
+def load_rules(rules: str) -> ScoringRules:
+    """Rules by catalog name (``dk_classic``) or by path to a rules YAML."""
+    path = SCORING_CATALOG.get(rules) or Path(rules)
+    name = rules if rules in SCORING_CATALOG else path.stem
+    return compile_rules(yaml.safe_load(path.read_text()), name)
+
+
+def score(
+    frame: Union[pl.DataFrame, pa.Table, pd.DataFrame],
+    rules: str = "dk_classic",
+    columns: Optional[Mapping[str, str]] = None,
+    bonuses: bool = True,
+) -> pl.Series:
+    return load_rules(rules).score(frame, columns, bonuses)
+
+
+def register_macros(con: duckdb.DuckDBPyConnection, temporary: bool = False) -> None:
+    """Create ``<name>_points(row)`` for every catalog ruleset, e.g. ``dk_classic_points(w)``.
+
+    Temporary macros are visible only to ``con`` itself, not to its cursors.
+    """
+    kind = "TEMP MACRO" if temporary else "MACRO"
+    for name in SCORING_CATALOG:
+        con.execute(f"CREATE OR REPLACE {kind} {name}_points(r) AS CAST({load_rules(name).sql('r')} AS DOUBLE)")
@@ -0,0 +1,131 @@
+# pyright: reportMissingImports=false, reportMissingModuleSource=false
+"""Shared SQL runner: parse each query once, bind parameters instead of splicing literals.
+
+SQL files may use DuckDB's ``$name`` placeholders or the ``:name`` style of the saved queries;
+``:name`` is rewritten to ``$name`` once at load time (strings, comments and ``::`` casts are left
+alone). The parsed statements are cached per connection and re-executed with bound values, so a
+file is read and parsed once per process rather than per call, and values never become SQL text.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Tuple
+
+import duckdb
+
+
+_NAME_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+# A ``:`` after these is a slice bound or struct key separator, not a placeholder
+_NOT_PLACEHOLDER_AFTER = re.compile(r"[A-Za-z0-9_)\]'\"]")
+
+
+def to_duckdb_placeholders(sql: str) -> str:
+    """Rewrite ``:name`` placeholders as ``$name``."""
+    out = []
+    i, n = 0, len(sql)
+    while i < n:
+        c = sql[i]
+        if c in "'\"":
+            j = i + 1
+            while True:
+                j = sql.find(c, j)
+                if j == -1 or sql[j + 1 : j + 2] != c:
+                    break
+                j += 2  # doubled quote inside the literal
+            end = n if j == -1 else j + 1
+        elif sql.startswith("--", i):
+            j = sql.find("\n", i)
+            end = n if j == -1 else j
+        elif sql.startswith("/*", i):
+            j = sql.find("*/", i + 2)
+            end = n if j == -1 else j + 2
+        elif sql.startswith("::", i):
+            end = i + 2
+        elif c == ":" and not (i and _NOT_PLACEHOLDER_AFTER.match(sql[i - 1])):
+            m = _NAME_RE.match(sql, i + 1)
+            if m is None:
+                end = i + 1
+            else:
+                out.append("$" + m.group(0))
+                i = m.end()
+                continue
+        else:
+            end = i + 1
+        out.append(sql[i:end])
+        i = end
+    return "".join(out)
+
+
+@dataclass(frozen=True)
+class SqlQuery:
+    """One SQL text split into parsed statements, with the named parameters it uses."""
+
+    name: str
+    text: str
+    statements: Tuple[Any, ...]
+    params: FrozenSet[str]
+
+    def bind(self, params: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+        """The subset of ``params`` this query uses; raises if any placeholder has no value."""
+        missing = self.params - set(params or {})
+        if missing:
+            raise ValueError(f"{self.name}: missing parameters {sorted(missing)}")
+        return {k: v for k, v in (params or {}).items() if k in self.params}
+
+
+class SqlRunner:
+    """Load, parse and execute SQL on one DuckDB connection.
+
+    ``load`` caches a file's parsed statements until its mtime changes. ``execute`` runs them on
+    the given cursor, or on a per-thread cursor of the connection so threads never share one.
+    """
+
+    def __init__(self, con: duckdb.DuckDBPyConnection) -> None:
+        self.con = con
+        self._lock = threading.Lock()
+        self._files: Dict[Path, Tuple[int, SqlQuery]] = {}
+        self._local = threading.local()
+
+    def parse(self, sql: str, name: str = "<sql>") -> SqlQuery:
+        text = to_duckdb_placeholders(sql)
+        with self._lock:
+            statements = tuple(self.con.extract_statements(text))
+        params = frozenset(p for st in statements for p in st.named_parameters)
+        return SqlQuery(name=name, text=text, statements=statements, params=params)
+
+    def load(self, path: str | Path) -> SqlQuery:
+        path = Path(path)
+        mtime = path.stat().st_mtime_ns
+        cached = self._files.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        query = self.parse(path.read_text(), name=str(path))
+        self._files[path] = (mtime, query)
+        return query
+
+    def cursor(self) -> duckdb.DuckDBPyConnection:
+        cur = getattr(self._local, "cursor", None)
+        if cur is None:
+            cur = self._local.cursor = self.con.cursor()
+        return cur
+
+    def execute(
+        self,
+        query: SqlQuery | str | Path,
+        params: Optional[Mapping[str, Any]] = None,
+        cur: Optional[duckdb.DuckDBPyConnection] = None,
+    ) -> duckdb.DuckDBPyConnection:
+        """Run every statement of ``query`` (a ``SqlQuery`` or a file path) with bound ``params``.
+
+        Returns the cursor, positioned on the result of the last statement.
+        """
+        if not isinstance(query, SqlQuery):
+            query = self.load(query)
+        bound = query.bind(params)
+        cur = cur if cur is not None else self.cursor()
+        for st in query.statements:
+            cur.execute(st, {k: bound[k] for k in st.named_parameters} or None)
+        return cur
@@ -0,0 +1,239 @@
+# pyright: reportMissingImports=false, reportMissingModuleSource=false
+"""Per-stage run telemetry and tracing spans written to the run JSONL (``logs/<run_id>.jsonl``).
+
+Orchestration binds a run id (and dataset) to the worker thread with ``run_context``; pipeline
+code wraps its hot paths in ``stage(...)``. Every stage appends one ``{"event": "stage", ...}``
+record with wall and CPU seconds, rows and rows/sec, bytes read/written and the process peak RSS.
+``span(...)`` records untimed-metric regions (run, dataset, year, partition) the same way. Both carry
+start time, duration, pid and thread id, so ``export_chrome_trace`` can turn a run log into a Chrome
+trace (open it in Perfetto or ``chrome://tracing``) without any collector service. Outside a run
+context stages are only logged at debug level and spans are dropped.
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+import orjson
+import structlog
+
+from .logging_setup import log_run_event
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+# Record keys that describe the trace event itself rather than its arguments
+_TRACE_KEYS = {"event", "name", "cat", "stage", "ts_us", "dur_us", "pid", "tid", "thread"}
+
+_context: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "telemetry_context", default=None
+)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """High-water resident set size of this process so far, in MiB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def path_bytes(path: str | Path) -> int:
+    """Total size of a file or of every file under a directory (0 when missing)."""
+    p = Path(path)
+    if p.is_file():
+        return p.stat().st_size
+    if not p.is_dir():
+        return 0
+    return sum(f.stat().st_size for f in p.rglob("*") if f.is_file())
+
+
+@contextlib.contextmanager
+def run_context(run_id: Optional[str], **fields: Any) -> Iterator[None]:
+    """Send ``stage`` records on this thread to ``logs/<run_id>.jsonl``, tagged with ``fields``.
+
+    Context variables are not inherited by pool threads, so bind inside the submitted callable.
+    """
+    token = _context.set({"run_id": run_id, **fields} if run_id else None)
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def _trace_fields(ts_us: int, wall: float) -> Dict[str, Any]:
+    return {
+        "ts_us": ts_us,
+        "dur_us": int(wall * 1_000_000),
+        "pid": os.getpid(),
+        "tid": threading.get_native_id(),
+        "thread": threading.current_thread().name,
+    }
+
+
+@contextlib.contextmanager
+def span(name: str, cat: str = "span", **fields: Any) -> Iterator[Dict[str, Any]]:
+    """Trace a region of the run; spans nested on one thread render as a stack in the trace."""
+    rec: Dict[str, Any] = dict(fields)
+    ts_us = time.time_ns() // 1000
+    wall0 = time.perf_counter()
+    status = "completed"
+    try:
+        yield rec
+    except BaseException:
+        status = "failed"
+        raise
+    finally:
+        rec.update(name=name, cat=cat, status=status, **_trace_fields(ts_us, time.perf_counter() - wall0))
+        _emit("span", rec)
+
+
+def iter_spans(items: Iterable[T], cat: str, **fields: Any) -> Iterator[T]:
+    """Yield ``items``, tracing each loop iteration as a span named after the item."""
+    for item in items:
+        with span(str(item), cat=cat, **fields):
+            yield item
+
+
+@contextlib.contextmanager
+def stage(name: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+    """Time one pipeline stage.
+
+    Callers may set ``rows``, ``bytes_read`` and ``bytes_written`` on the yielded dict. CPU time is
+    process-wide (it includes Arrow/Polars worker threads), so stages that overlap under
+    ``--max-workers > 1`` share it; peak RSS is the process high-water mark at the end of the stage.
+    """
+    rec: Dict[str, Any] = dict(fields)
+    ts_us = time.time_ns() // 1000
+    wall0 = time.perf_counter()
+    cpu0 = time.process_time()
+    status = "completed"
+    try:
+        yield rec
+    except BaseException:
+        status = "failed"
+        raise
+    finally:
+        wall = time.perf_counter() - wall0
+        rec.update(
+            stage=name,
+            status=status,
+            wall_s=round(wall, 4),
+            cpu_s=round(time.process_time() - cpu0, 4),
+            peak_rss_mb=peak_rss_mb(),
+            **_trace_fields(ts_us, wall),
+        )
+        rows = rec.get("rows")
+        if rows is not None and wall > 0:
+            rec["rows_per_sec"] = round(rows / wall, 1)
+        _emit("stage", rec)
+
+
+def _emit(event: str, rec: Dict[str, Any]) -> None:
+    ctx = _context.get()
+    if ctx is None:
+        if event == "stage":
+            logger.debug("stage", **rec)
+        return
+    tags = {k: v for k, v in ctx.items() if k != "run_id"}
+    log_run_event(ctx["run_id"], event, **{**tags, **rec})
+
+
+def latest_run_id(logs_dir: str | Path = "logs") -> Optional[str]:
+    runs = sorted(Path(logs_dir).glob("run_*.jsonl"))
+    return runs[-1].stem if runs else None
+
+
+def _iter_run_log(run_id: str, logs_dir: str | Path) -> Iterator[Dict[str, Any]]:
+    path = Path(logs_dir) / f"{run_id}.jsonl"
+    if not path.exists():
+        raise FileNotFoundError(f"no run log at {path}")
+    with path.open("rb") as f:
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line)
+
+
+def load_stage_events(run_id: str, logs_dir: str | Path = "logs") -> List[Dict[str, Any]]:
+    return [rec for rec in _iter_run_log(run_id, logs_dir) if rec.get("event") == "stage"]
+
+
+def export_chrome_trace(
+    run_id: str, logs_dir: str | Path = "logs", out: Optional[str | Path] = None
+) -> Path:
+    """Write the run's spans and stages as Chrome trace JSON (``logs/<run_id>.trace.json`` by default).
+
+    Each record becomes a complete (``"ph": "X"``) event on its process/thread track; thread and
+    process names are added as metadata so worker pools are labelled in Perfetto.
+    """
+    events: List[Dict[str, Any]] = []
+    threads: Dict[tuple, str] = {}
+    for rec in _iter_run_log(run_id, logs_dir):
+        if rec.get("event") not in ("span", "stage") or "ts_us" not in rec:
+            continue
+        pid, tid = rec["pid"], rec["tid"]
+        threads.setdefault((pid, tid), rec.get("thread") or str(tid))
+        events.append(
+            {
+                "name": rec.get("name") or rec.get("stage"),
+                "cat": rec.get("cat") or "stage",
+                "ph": "X",
+                "ts": rec["ts_us"],
+                "dur": rec["dur_us"],
+                "pid": pid,
+                "tid": tid,
+                "args": {k: v for k, v in rec.items() if k not in _TRACE_KEYS},
+            }
+        )
+    events.sort(key=lambda e: (e["ts"], -e["dur"]))
+    meta: List[Dict[str, Any]] = []
+    for pid in sorted({pid for pid, _ in threads}):
+        meta.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": f"{run_id} pid={pid}"}})
+    for (pid, tid), name in sorted(threads.items()):
+        meta.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+    target = Path(out) if out else Path(logs_dir) / f"{run_id}.trace.json"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(orjson.dumps({"traceEvents": meta + events, "displayTimeUnit": "ms"}))
+    return target
+
+
+def summarize_stages(events: List[Dict[str, Any]], by: str = "stage") -> List[Dict[str, Any]]:
+    """Aggregate stage records by ``stage``, ``dataset`` or ``dataset,stage``, slowest first."""
+    keys = [k.strip() for k in by.split(",")]
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for rec in events:
+        # Report steps are tagged ``report`` rather than ``dataset``
+        group = tuple((rec.get(k) or (rec.get("report") if k == "dataset" else None)) or "-" for k in keys)
+        agg = groups.setdefault(
+            group,
+            {**dict(zip(keys, group)), "count": 0, "failed": 0, "wall_s": 0.0, "cpu_s": 0.0,
+             "rows": 0, "bytes_read": 0, "bytes_written": 0, "peak_rss_mb": None},
+        )
+        agg["count"] += 1
+        agg["failed"] += rec.get("status") == "failed"
+        for k in ("wall_s", "cpu_s", "rows", "bytes_read", "bytes_written"):
+            agg[k] += rec.get(k) or 0
+        rss = rec.get("peak_rss_mb")
+        if rss is not None:
+            agg["peak_rss_mb"] = max(agg["peak_rss_mb"] or 0.0, rss)
+    out = []
+    for agg in groups.values():
+        agg["wall_s"] = round(agg["wall_s"], 3)
+        agg["cpu_s"] = round(agg["cpu_s"], 3)
+        agg["rows_per_sec"] = round(agg["rows"] / agg["wall_s"], 1) if agg["wall_s"] > 0 and agg["rows"] else None
+        out.append(agg)
+    return sorted(out, key=lambda a: a["wall_s"], reverse=True)
@@ -0,0 +1,204 @@
+# pyright: reportMissingImports=false, reportMissingModuleSource=false
+"""In-season watch daemon: poll upstream, run minimal updates, keep caches warm.
+
+One long-lived process replaces the cron invocations of ``update``. Start-up imports, the ID and
+schedule lookups and the shared DuckDB report connection are paid for once. Each cycle probes
+the season's upstream files (HTTP ``HEAD`` for ETag/Last-Modified/size, or ``stat`` in a local
+mirror) and runs ``run_update`` only for datasets whose files changed; report steps in the same
+graph refresh the affected gold weeks. Datasets without a known upstream file are refreshed every
+``full_refresh_seconds``. Progress is written to a JSON status file that doubles as a health check.
+"""
+from __future__ import annotations
+
+import os
+import signal
+import threading
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import orjson
+import structlog
+
+from .config import DatasetCatalog
+from .importers import nflverse
+from .orchestration import _select_datasets, run_update
+from .reports.runner import get_runner
+
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_STATUS_PATH = "logs/watch_status.json"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def probe_asset(url: str, mirror: Optional[str] = None, timeout: float = 20.0) -> Optional[str]:
+    """Cheap change signature of one upstream file, or ``None`` when it is not published yet."""
+    if mirror:
+        path = Path(mirror) / url.rsplit("/", 1)[-1]
+        if not path.exists():
+            return None
+        st = path.stat()
+        return f"{st.st_size}:{st.st_mtime_ns}"
+    req = urllib.request.Request(url, method="HEAD")
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            headers = resp.headers
+    except Exception as exc:
+        # 404 until upstream publishes the season; any other error just means "no news"
+        logger.debug("watch_probe_failed", url=url, error=str(exc))
+        return None
+    parts = [headers.get("ETag"), headers.get("Last-Modified"), headers.get("Content-Length")]
+    return "|".join(p or "" for p in parts) if any(parts) else None
+
+
+class Watcher:
+    """Poll-and-update loop for one season; ``poll_once`` runs a single cycle."""
+
+    def __init__(
+        self,
+        root: str,
+        catalog: DatasetCatalog,
+        season: int,
+        datasets: Optional[str] = None,
+        interval_seconds: float = 300,
+        full_refresh_seconds: float = 6 * 3600,
+        mirror: Optional[str] = None,
+        status_path: str = DEFAULT_STATUS_PATH,
+        max_workers: int = 2,
+        no_validate: bool = False,
+    ) -> None:
+        self.root = root
+        self.catalog = catalog
+        self.season = season
+        self.interval_seconds = interval_seconds
+        self.full_refresh_seconds = full_refresh_seconds
+        self.mirror = mirror
+        self.status_path = Path(status_path)
+        self.max_workers = max_workers
+        self.no_validate = no_validate
+        self.selected = [cfg.name for cfg in _select_datasets(catalog, datasets)]
+        self._stop = threading.Event()
+        self.status: Dict[str, Any] = {
+            "pid": os.getpid(),
+            "season": season,
+            "datasets": self.selected,
+            "started_utc": _now().isoformat(),
+            "state": "starting",
+            "cycles": 0,
+            "consecutive_failures": 0,
+            "signatures": {},
+            "last_full_refresh_utc": None,
+        }
+        # Resume from the previous daemon's signatures so a restart does not re-pull everything
+        previous = self._read_status()
+        if previous.get("season") == season:
+            self.status["signatures"] = previous.get("signatures") or {}
+            self.status["last_full_refresh_utc"] = previous.get("last_full_refresh_utc")
+
+    def _read_status(self) -> Dict[str, Any]:
+        try:
+            return orjson.loads(self.status_path.read_bytes())
+        except (OSError, ValueError):
+            return {}
+
+    def _write_status(self, **fields: Any) -> None:
+        self.status.update(fields, heartbeat_utc=_now().isoformat())
+        self.status["healthy"] = self.status["state"] != "error" and self.status["consecutive_failures"] == 0
+        self.status_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.status_path.with_name(f".{self.status_path.name}.tmp")
+        tmp.write_bytes(orjson.dumps(self.status, option=orjson.OPT_INDENT_2))
+        os.replace(tmp, self.status_path)
+
+    def warm(self) -> None:
+        """Load the lookups and open the report connection up front."""
+        nflverse.refresh_lookups(self.season)
+        get_runner(self.root, self.catalog)
+
+    def _full_refresh_due(self) -> bool:
+        last = self.status.get("last_full_refresh_utc")
+        if last is None:
+            return True
+        return _now() - datetime.fromisoformat(last) >= timedelta(seconds=self.full_refresh_seconds)
+
+    def changed_datasets(self) -> tuple[List[str], Dict[str, str]]:
+        """Datasets to update this cycle and the upstream signatures that triggered them."""
+        full = self._full_refresh_due()
+        changed: List[str] = []
+        seen: Dict[str, str] = {}
+        for name in self.selected:
+            template = nflverse.SEASON_ASSETS.get(self.catalog.datasets[name].importer)
+            if template is None:
+                if full:
+                    changed.append(name)
+                continue
+            sig = probe_asset(template.format(season=self.season), self.mirror)
+            if sig is None:
+                continue
+            seen[name] = sig
+            if self.status["signatures"].get(name) != sig:
+                changed.append(name)
+        return changed, seen
+
+    def poll_once(self) -> List[str]:
+        """Run one cycle; returns the datasets that were updated successfully."""
+        self._write_status(state="polling", last_poll_utc=_now().isoformat())
+        full = self._full_refresh_due()
+        changed, seen = self.changed_datasets()
+        if not changed:
+            self._write_status(state="idle", cycles=self.status["cycles"] + 1, consecutive_failures=0)
+            return []
+        logger.info("watch_update", season=self.season, datasets=changed)
+        if full:
+            # Pick up new player IDs and schedule changes along with the periodic refresh
+            nflverse.refresh_lookups(self.season)
+        self._write_status(state="updating", updating=changed)
+        results = run_update(
+            self.root, self.catalog, self.season, ",".join(changed), self.max_workers, self.no_validate, None
+        )
+        ok = [name for name in changed if results.get(name) is not None and results[name].status == "completed"]
+        failed = sorted(set(changed) - set(ok))
+        # Only remember signatures that landed; failed datasets are retried next cycle
+        self.status["signatures"].update({name: seen[name] for name in ok if name in seen})
+        if full and not failed:
+            self.status["last_full_refresh_utc"] = _now().isoformat()
+        reports = sorted(n for n, r in results.items() if n in self.catalog.reports and r.status == "completed")
+        self._write_status(
+            state="idle",
+            updating=[],
+            cycles=self.status["cycles"] + 1,
+            consecutive_failures=self.status["consecutive_failures"] + 1 if failed else 0,
+            last_change_utc=_now().isoformat(),
+            last_update={"datasets": ok, "failed": failed, "reports": reports},
+        )
+        return ok
+
+    def stop(self, *_: Any) -> None:
+        self._stop.set()
+
+    def run(self, max_cycles: Optional[int] = None) -> None:
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self.stop)
+        self.warm()
+        cycles = 0
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as exc:
+                logger.error("watch_cycle_failed", season=self.season, error=str(exc))
+                self._write_status(
+                    state="error",
+                    consecutive_failures=self.status["consecutive_failures"] + 1,
+                    last_error=str(exc),
+                )
+            cycles += 1
+            if max_cycles is not None and cycles >= max_cycles:
+                break
+            next_poll = _now() + timedelta(seconds=self.interval_seconds)
+            self._write_status(next_poll_utc=next_poll.isoformat())
+            self._stop.wait(self.interval_seconds)
+        self._write_status(state="stopped")
@@ -0,0 +1,84 @@
+
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import pytest
+import yaml
+
+from src.bestball import LineupSlot, _lineup_points, load_format, run_bestball_sim
+from src.importers.draftkings import fetch_dk_bestball
+
+RULES = Path(__file__).resolve().parents[1] / "catalog" / "draftkings" / "bestball.yml"
+
+BESTBALL_SLOTS = (
+    LineupSlot("QB", 1, ("QB",)),
+    LineupSlot("RB", 2, ("RB",)),
+    LineupSlot("WR", 3, ("WR",)),
+    LineupSlot("TE", 1, ("TE",)),
+    LineupSlot("FLEX", 1, ("RB", "WR", "TE")),
+)
+
+
+def test_lineup_is_the_best_assignment_of_players_to_slots():
+    rng = np.random.default_rng(3)
+    positions = np.array(["QB", "QB", "RB", "RB", "RB", "WR", "WR", "WR", "WR", "TE", "TE"])
+    draws = rng.integers(0, 30, size=(len(positions), 200)).astype(float)
+
+    best = []
+    for col in draws.T:
+        # Brute force over the FLEX choice: positional slots take their best players
+        fixed = {"QB": 1, "RB": 2, "WR": 3, "TE": 1}
+        totals = []
+        for flex in ("RB", "WR", "TE"):
+            counts = dict(fixed, **{flex: fixed[flex] + 1})
+            totals.append(sum(sum(sorted(col[positions == p], reverse=True)[: counts[p]]) for p in counts))
+        best.append(max(totals))
+
+    assert np.allclose(_lineup_points(draws, positions, BESTBALL_SLOTS), best)
+    # A missing position leaves its slot empty rather than failing
+    assert _lineup_points(draws[positions != "TE"], positions[positions != "TE"], BESTBALL_SLOTS).shape == (200,)
+    with pytest.raises(ValueError, match="SUPER"):
+        _lineup_points(draws, positions, (LineupSlot("FLEX", 1, ("RB", "WR")), LineupSlot("SUPER", 1, ("QB", "RB"))))
+
+
+def test_simulation_reads_the_lake_and_returns_advance_and_win_rates(tmp_path):
+    root = tmp_path / "data"
+    silver = fetch_dk_bestball(options={"path": str(RULES)})
+    for section, rows in silver.groupby("section"):
+        part = root / "silver" / "dk_bestball" / f"section={section}"
+        part.mkdir(parents=True)
+        rows.drop(columns="section").to_parquet(part / "part-0.parquet")
+    fmt = load_format(str(root))
+    doc = yaml.safe_load(RULES.read_text())
+    assert [s.slot for s in fmt.slots] == [s["slot"] for s in doc["lineup"]["weekly_slots"]]
+    assert fmt.rounds == tuple(tuple(r["weeks"]) for r in doc["tournaments"]["rounds"])
+
+    # Four rosters of one player per slot plus a bench player; roster "a" is clearly best
+    positions = ["QB", "RB", "RB", "WR", "WR", "WR", "TE", "WR"]
+    rng = np.random.default_rng(0)
+    players, rosters = [], []
+    for team, scale in zip("abcd", (3.0, 1.0, 1.0, 1.0)):
+        for i, pos in enumerate(positions):
+            pid = f"{team}{i}"
+            rosters.append({"roster": team, "player_id": pid})
+            for week in range(1, 18):
+                players.append({"player_id": pid, "position": pos, "week": week, "season_type": "REG",
+                                "dk_ppr_points": float(rng.gamma(2.0, 5.0) * scale)})
+    for week, frame in pl.DataFrame(players).group_by("week"):
+        part = root / "gold" / "reports" / "player_week_stats" / "season=2024" / f"week={week[0]}"
+        part.mkdir(parents=True)
+        frame.drop("week").write_parquet(part / "part-0.parquet")
+    roster_file = tmp_path / "rosters.csv"
+    pl.DataFrame(rosters).write_csv(roster_file)
+
+    rates = run_bestball_sim(str(root), str(roster_file), 2024, n_sims=3000, advance=[2, 2, 2], seed=1)
+    again = run_bestball_sim(str(root), str(roster_file), 2024, n_sims=3000, advance=[2, 2, 2], seed=1, max_workers=2)
+
+    assert rates.equals(again)
+    assert rates["roster"][0] == "a" and rates["advance_rate"][0] > 0.99
+    assert rates["advance_rate"].sum() == pytest.approx(2.0)
+    assert rates["win_rate"].sum() == pytest.approx(1.0)
+    assert (rates["reach_round_3"] <= rates["advance_rate"]).all()
+    with pytest.raises(ValueError, match="advance"):
+        run_bestball_sim(str(root), str(roster_file), 2024, n_sims=10, advance=[2])
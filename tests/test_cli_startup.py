@@ -0,0 +1,39 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+
+def _load_bench():
+    path = Path(__file__).resolve().parents[1] / "scripts" / "bench_startup.py"
+    spec = importlib.util.spec_from_file_location("bench_startup", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+bench_startup = _load_bench()
+
+
+def test_parse_importtime_sums_top_level_cumulative_times():
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |   _io",
+            "import time:       200 |        300 | encodings",
+            "import time:        50 |       1500 |     pandas.core",
+            "import time:      1000 |       2000 |   pandas",
+            "import time:       500 |       2500 | src.promote",
+        ]
+    )
+
+    ms, packages = bench_startup.parse_importtime(stderr)
+
+    assert ms == pytest.approx(2.8)
+    assert {"pandas", "src", "encodings", "_io"} <= packages
+
+
+@pytest.mark.parametrize("command", sorted(bench_startup.CASES))
+def test_cli_commands_do_not_import_unneeded_modules(command: str):
+    # Module rules only: timing budgets depend on the machine and run via `make bench-startup`
+    assert bench_startup.run([command], repeat=1, scale=1.0, timing=False) == []
@@ -0,0 +1,166 @@
+import os
+import threading
+
+import pytest
+
+from src.config import DatasetCatalog, DatasetConfig
+from src.dag import DagNode, inseason_passes, run_dag, upstream_changed
+
+
+def _cfg(name, depends_on=None, unstable=False, enabled=True):
+    return DatasetConfig(
+        name=name,
+        importer=name,
+        years=None,
+        partitions=["season"],
+        key=["season"],
+        options={},
+        enabled=enabled,
+        sort_by=None,
+        max_rows_per_file=None,
+        depends_on=depends_on or [],
+        unstable=unstable,
+    )
+
+
+class TestRunDag:
+    def test_runs_dependencies_first_and_branches_concurrently(self):
+        order = []
+        barrier = threading.Barrier(2, timeout=5)
+
+        def _branch(name):
+            def _run():
+                # Both branches must be in flight at once to pass the barrier
+                barrier.wait()
+                order.append(name)
+                return name
+
+            return _run
+
+        nodes = {
+            "pbp": DagNode("pbp", _branch("pbp")),
+            "rosters": DagNode("rosters", _branch("rosters")),
+            "weekly": DagNode("weekly", lambda: order.append("weekly"), deps=["pbp", "rosters"]),
+        }
+
+        results = run_dag(nodes, max_workers=2)
+
+        assert order[-1] == "weekly"
+        assert {r.status for r in results.values()} == {"completed"}
+
+    def test_skips_when_upstream_unchanged_and_continues_after_failure(self):
+        def _fail():
+            raise RuntimeError("404")
+
+        ran = []
+        nodes = {
+            "schedules": DagNode("schedules", lambda: (0, [], {}), changed=lambda v: bool(v[1])),
+            "weekly": DagNode("weekly", _fail),
+            "report": DagNode(
+                "report",
+                lambda: ran.append("report"),
+                deps=["schedules", "weekly"],
+                kind="report",
+                should_run=lambda deps: upstream_changed(["schedules", "weekly"], [], deps),
+            ),
+        }
+        seen = []
+
+        results = run_dag(nodes, max_workers=2, on_result=lambda r: seen.append(r.name))
+
+        assert results["weekly"].status == "failed"
+        assert results["report"].status == "skipped"
+        assert ran == []
+        assert seen[-1] == "report"
+
+    def test_rejects_cycles(self):
+        nodes = {
+            "a": DagNode("a", lambda: None, deps=["b"]),
+            "b": DagNode("b", lambda: None, deps=["a"]),
+        }
+
+        with pytest.raises(ValueError, match="cycle"):
+            run_dag(nodes, max_workers=1)
+
+    def test_process_executor_runs_dataset_nodes_in_workers_and_merges_caches(self, tmp_path, monkeypatch):
+        from src.lineage import LineageStore
+        from src.orchestration import _dataset_nodes, _run_graph
+
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "logs").mkdir()
+        caches = {"weekly": {}}
+        nodes = _dataset_nodes([_cfg("weekly")], _worker_dataset, caches)
+        nodes["report"] = DagNode("report", os.getpid, deps=["weekly"], kind="report")
+
+        with LineageStore(str(tmp_path / "lineage.db"), json_path=None) as store:
+            results = _run_graph(store, nodes, caches, 2, "run_proc", "update", executor="process")
+            parts = store.partitions("weekly")
+
+        rows, changed, _stats, _cache = results["weekly"].value
+        # Dataset work ran in a spawned worker; the report stayed on a thread in this process
+        assert rows != os.getpid() and results["report"].value == os.getpid()
+        assert changed == ["season=2025"] and parts["season=2025"]["row_count"] == 3
+        assert caches["weekly"]["silver:season=2025"]["fingerprint"] == "abc"
+
+    def test_rejects_unknown_executor(self):
+        with pytest.raises(ValueError, match="executor"):
+            run_dag({"a": DagNode("a", lambda: None)}, max_workers=1, executor="fiber")
+
+
+def _worker_dataset(cfg, validation_cache):
+    # Module-level so it can be pickled into a worker process
+    validation_cache["silver:season=2025"] = {"fingerprint": "abc"}
+    return os.getpid(), ["season=2025"], {"season=2025": {"row_count": 3}}
+
+
+class TestInseasonPasses:
+    def test_unstable_flag_propagates_to_dependents(self):
+        catalog = DatasetCatalog(
+            root="data",
+            compression="zstd",
+            row_group_mb=96,
+            datasets={
+                "pbp": _cfg("pbp"),
+                "injuries": _cfg("injuries", unstable=True),
+                "weekly": _cfg("weekly", depends_on=["pbp"], unstable=True),
+                "weekly_summary": _cfg("weekly_summary", depends_on=["weekly"]),
+                "officials": _cfg("officials", enabled=False),
+            },
+        )
+
+        safe, unstable = inseason_passes(catalog)
+
+        assert safe == ["pbp"]
+        assert unstable == ["injuries", "weekly", "weekly_summary"]
+
+    @pytest.mark.parametrize(
+        "flags, expected",
+        [
+            ({"pbp": False, "injuries": True}, ["pbp", "injuries"]),
+            # With one pass empty, run_update is called once (an empty filter would mean every dataset)
+            ({"pbp": False, "injuries": False}, ["injuries,pbp"]),
+            ({"pbp": True, "injuries": True}, ["injuries,pbp"]),
+        ],
+    )
+    def test_inseason_skips_an_empty_pass(self, monkeypatch, flags, expected):
+        from typer.testing import CliRunner
+
+        from src import cli, orchestration
+
+        catalog = DatasetCatalog(
+            root="data",
+            compression="zstd",
+            row_group_mb=96,
+            datasets={name: _cfg(name, unstable=unstable) for name, unstable in flags.items()},
+        )
+        calls = []
+        # inseason exports its retry options; registering them here restores them afterwards
+        monkeypatch.setenv("IMPORTER_RETRY_ATTEMPTS", "")
+        monkeypatch.setenv("IMPORTER_RETRY_BASE_SECONDS", "")
+        monkeypatch.setattr(cli, "_load_catalog", lambda: (catalog, "data"))
+        monkeypatch.setattr(orchestration, "run_update", lambda root, catalog, season, datasets, **kw: calls.append(datasets))
+
+        result = CliRunner().invoke(cli.app, ["inseason", "--season", "2025"])
+
+        assert result.exit_code == 0, result.output
+        assert calls == expected
@@ -3,7 +3,6 @@ from __future__ import annotations
 from pathlib import Path
 import sys
 
-import duckdb
 import pandas as pd
 import polars as pl
 import pytest
@@ -13,6 +12,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from app.lib import data as report_data  # noqa: E402
+from src.reports.runner import ReportRunner  # noqa: E402
 
 REPORTS_BASE_ATTR = getattr(report_data, "REPORTS_BASE", "data/gold/reports")
 
@@ -22,22 +22,16 @@ def _write_parquet(df: pd.DataFrame, path: Path) -> None:
     df.to_parquet(path)
 
 
-def _run_defense_materialization(sql_path: Path, weekly_dir: Path, schedules_dir: Path, output_dir: Path) -> None:
-    query = sql_path.read_text()
-    query = query.replace("data/silver/weekly", weekly_dir.parent.parent.as_posix())
-    query = query.replace("data/silver/schedules", schedules_dir.parent.as_posix())
-    query = query.replace("data/gold/reports/defense_position_points_allowed", output_dir.as_posix())
-
+def _run_defense_materialization(sql_path: Path, lake_root: Path, output_dir: Path) -> None:
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    con = duckdb.connect()
-    try:
-        con.execute(query)
-    finally:
-        con.close()
+    with ReportRunner(lake_root.as_posix()) as runner:
+        runner.execute(sql_path, {"season": 2025, "season_type": "REG"})
 
 
-def test_materialize_defense_position_points_allowed_aggregates_expected_metrics(tmp_path: Path):
+def test_materialize_defense_position_points_allowed_aggregates_expected_metrics(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
     silver_root = tmp_path / "data" / "silver"
     weekly_dir = silver_root / "weekly" / "season=2025" / "week=1"
     schedules_dir = silver_root / "schedules" / "season=2025"
@@ -65,8 +59,10 @@ def test_materialize_defense_position_points_allowed_aggregates_expected_metrics
     )
     _write_parquet(schedules_df, schedules_dir / "schedules.parquet")
 
-    sql_path = Path("queries/reports/materialize_defense_position_points_allowed.sql")
-    _run_defense_materialization(sql_path, weekly_dir, schedules_dir, tmp_path / "data" / "gold" / "reports" / "defense_position_points_allowed")
+    sql_path = ROOT / "queries" / "reports" / "materialize_defense_position_points_allowed.sql"
+    # The COPY target is relative to the repo root (data/gold/...)
+    monkeypatch.chdir(tmp_path)
+    _run_defense_materialization(sql_path, tmp_path / "data", tmp_path / "data" / "gold" / "reports" / "defense_position_points_allowed")
 
     result_path = tmp_path / "data" / "gold" / "reports" / "defense_position_points_allowed"
     result = pl.read_parquet(result_path.as_posix() + "/**/*.parquet")
@@ -0,0 +1,62 @@
+import pyarrow.parquet as pq
+import polars as pl
+
+from src.config import DatasetCatalog, DatasetConfig, ReportConfig
+from src.lakedb import LakeDatabase, parse_params, write_result
+
+
+def _catalog():
+    weekly = DatasetConfig(
+        name="weekly",
+        importer="weekly",
+        years=None,
+        partitions=["season"],
+        key=["season", "week", "player_id"],
+        options={},
+        enabled=True,
+        sort_by=None,
+        max_rows_per_file=None,
+    )
+    report = ReportConfig(
+        name="player_week_stats",
+        fn=None,
+        inputs=["weekly"],
+        depends_on=[],
+        output="gold/reports/player_week_stats",
+        only_if_missing=None,
+        sql="queries/reports/materialize_player_week_stats.sql",
+    )
+    return DatasetCatalog(
+        root="data", compression="zstd", row_group_mb=96, datasets={"weekly": weekly}, reports={"player_week_stats": report}
+    )
+
+
+def _write_season(root, season, rows):
+    part = root / "silver" / "weekly" / f"season={season}"
+    part.mkdir(parents=True)
+    pl.DataFrame({"week": [1] * rows, "player_id": [f"p{i}" for i in range(rows)]}).write_parquet(part / "part-0.parquet")
+
+
+def test_query_views_refresh_only_when_the_lake_changes(tmp_path):
+    root = tmp_path / "data"
+    _write_season(root, 2023, 2)
+    catalog = _catalog()
+
+    with LakeDatabase(str(root), catalog) as lake:
+        # gold output has no files yet, so only the silver view exists
+        assert lake.open() == ["silver_weekly"]
+        assert lake.execute("SELECT count(*) FROM silver_weekly").fetchone() == (2,)
+    with LakeDatabase(str(root), catalog) as lake:
+        assert lake.open() == []
+
+    _write_season(root, 2024, 3)
+    with LakeDatabase(str(root), catalog) as lake:
+        assert lake.open() == ["silver_weekly"]
+        params = parse_params(["season=2024", "unused=x"])
+        cur = lake.execute("SELECT season, count(*) AS n FROM silver_weekly WHERE season = $season GROUP BY 1", params)
+        out = write_result(cur, "parquet", str(tmp_path / "out.parquet"))
+        profile, seconds = lake.explain_analyze("SELECT * FROM silver_weekly WHERE season = $season", params)
+
+    assert pq.read_table(out).to_pylist() == [{"season": 2024, "n": 3}]
+    # Hive partition pruning still applies to the explicit file list
+    assert "Scanning Files: 1/2" in profile and seconds >= 0
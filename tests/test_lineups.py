@@ -0,0 +1,99 @@
+import itertools
+from collections import Counter
+
+import numpy as np
+import polars as pl
+import pytest
+
+from src.lineups import Slate, build_projections, load_contest, load_slate, optimize, run_lineups
+
+
+def _slate(rng, counts, step=100):
+    positions = [p for p, c in counts.items() for _ in range(c)]
+    n = len(positions)
+    return Slate(
+        tuple(f"p{i}" for i in range(n)),
+        tuple(positions),
+        rng.integers(30, 90, n) * step,
+        rng.uniform(2.0, 25.0, n),
+        rng.uniform(1.0, 6.0, n),
+    )
+
+
+def test_lineups_are_the_salary_capped_optimum():
+    rng = np.random.default_rng(1)
+    classic, showdown = load_contest("classic"), load_contest("showdown")
+    assert classic.size == 9 and showdown.captain == "CPT" and showdown.captain_salary == 1.5
+    for _ in range(3):
+        slate = _slate(rng, {"QB": 3, "RB": 5, "WR": 6, "TE": 3, "DST": 2})
+        pos = np.array(slate.positions)
+        best = -np.inf
+        for flex in ("RB", "WR", "TE"):
+            counts = Counter({"QB": 1, "RB": 2, "WR": 3, "TE": 1, "DST": 1})
+            counts[flex] += 1
+            for combo in itertools.product(*[itertools.combinations(np.flatnonzero(pos == p), k) for p, k in counts.items()]):
+                ids = [i for group in combo for i in group]
+                if slate.salaries[ids].sum() <= 50_000:
+                    best = max(best, slate.projections[ids].sum())
+        (lineup,) = optimize(slate, classic)
+        assert slate.salaries[lineup > 0].sum() <= 50_000
+        assert slate.projections[lineup > 0].sum() == pytest.approx(best, rel=1e-5)
+
+        # Showdown: 1.5x captain salaries put the grid on 50s
+        slate = _slate(rng, {"QB": 2, "RB": 2, "WR": 3, "TE": 1}, step=150)
+        best = max(
+            1.5 * slate.projections[c] + slate.projections[list(flex)].sum()
+            for c in range(8)
+            for flex in itertools.combinations([i for i in range(8) if i != c], 5)
+            if 1.5 * slate.salaries[c] + slate.salaries[list(flex)].sum() <= 50_000
+        )
+        (lineup,) = optimize(slate, showdown)
+        assert (lineup == 1).sum() == 1 and (lineup == 2).sum() == 5
+        assert 1.5 * slate.projections[lineup == 1].sum() + slate.projections[lineup == 2].sum() == pytest.approx(best, rel=1e-5)
+
+
+def test_diversified_lineups_from_gold_projections(tmp_path):
+    root = tmp_path / "data"
+    rng = np.random.default_rng(0)
+    counts = {"QB": 4, "RB": 8, "WR": 12, "TE": 4}
+    rows, slate = [], []
+    for pos, count in counts.items():
+        for i in range(count):
+            pid = f"{pos}{i}"
+            slate.append({"player_id": pid, "salary": int(rng.integers(30, 90)) * 100})
+            for week in range(1, 7):
+                # Week 6 would make the player the best on the slate; projections stop before it
+                points = 99.0 if week == 6 and pid == "RB0" else float(rng.gamma(2.0, 5.0))
+                rows.append({"player_id": pid, "player_name": pid.lower(), "position": pos, "team": "KC",
+                             "week": week, "season_type": "REG", "dk_ppr_points": points})
+    for week, frame in pl.DataFrame(rows).group_by("week"):
+        part = root / "gold" / "reports" / "player_week_stats" / "season=2024" / f"week={week[0]}"
+        part.mkdir(parents=True)
+        frame.drop("week").write_parquet(part / "part-0.parquet")
+    # DST projections come with the slate: player-week stats do not score defenses
+    slate += [{"player_id": f"D{i}", "salary": 2500 + 100 * i, "position": "DST", "projection": 6.0 + i, "spread": 3.0} for i in range(3)]
+    slate_file = tmp_path / "slate.csv"
+    pl.DataFrame(slate).write_csv(slate_file)
+
+    projections = build_projections(str(root), 2024, week=6, window=3)
+    rb0 = projections.filter(pl.col("player_id") == "RB0")
+    assert rb0["games"][0] == 3 and rb0["projection"][0] < 99.0
+
+    out = run_lineups(str(root), "classic", str(slate_file), 2024, week=6, window=3, n_lineups=40,
+                      randomness=1.0, min_unique=2, max_exposure=0.5, seed=3)
+    totals = out.group_by("lineup").agg(pl.col("salary").sum(), pl.col("projection").sum(), pl.col("player_id"))
+    assert totals.height == 40
+    assert (totals["salary"] <= 50_000).all()
+    assert sorted(Counter(out.filter(pl.col("lineup") == 1)["slot"]).items()) == [
+        ("DST", 1), ("FLEX", 1), ("QB", 1), ("RB", 2), ("TE", 1), ("WR", 3)
+    ]
+    # Lineup 1 is the unjittered optimum; every pair differs by at least two players
+    slate, _ = load_slate(str(slate_file), projections)
+    (best,) = optimize(slate, load_contest("classic"))
+    first = totals.sort("lineup")["projection"][0]
+    assert first == pytest.approx(slate.projections[best > 0].sum(), rel=1e-5)
+    assert first == pytest.approx(totals["projection"].max())
+    lineups = [set(p) for p in totals["player_id"]]
+    assert all(len(a & b) <= 7 for a, b in itertools.combinations(lineups, 2))
+    assert max(Counter(out["player_id"]).values()) <= 20
+
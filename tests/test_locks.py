@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+from filelock import Timeout
+
+from src import locks
+
+
+def _hold_in_thread(cm_factory, started, release):
+    def _run():
+        with cm_factory():
+            started.set()
+            release.wait(5)
+
+    t = threading.Thread(target=_run)
+    t.start()
+    assert started.wait(5)
+    return t
+
+
+def test_disjoint_datasets_and_partitions_write_concurrently(tmp_path):
+    root = tmp_path / "data"
+    started, release = threading.Event(), threading.Event()
+    t = _hold_in_thread(lambda: locks.write_lock(root, "pbp", ["year=2025"]), started, release)
+    try:
+        with locks.lake_lock(root), locks.write_lock(root, "schedules", timeout=1):
+            pass
+        with locks.write_lock(root, "pbp", ["year=2024"], timeout=1):
+            pass
+    finally:
+        release.set()
+        t.join()
+
+
+def test_overlapping_writers_wait(tmp_path):
+    root = tmp_path / "data"
+    started, release = threading.Event(), threading.Event()
+    t = _hold_in_thread(lambda: locks.write_lock(root, "pbp", ["year=2025"]), started, release)
+    try:
+        with pytest.raises(Timeout):
+            with locks.write_lock(root, "pbp", ["year=2025"], timeout=0.2):
+                pass
+        # A whole-dataset writer conflicts with any partition writer
+        with pytest.raises(Timeout):
+            with locks.write_lock(root, "pbp", timeout=0.2):
+                pass
+    finally:
+        release.set()
+        t.join()
+    with locks.write_lock(root, "pbp", timeout=1):
+        pass
+
+
+def test_exclusive_lake_lock_waits_for_shared_holders(tmp_path):
+    root = tmp_path / "data"
+    started, release = threading.Event(), threading.Event()
+    t = _hold_in_thread(lambda: locks.lake_lock(root), started, release)
+    try:
+        with locks.lake_lock(root, timeout=1):
+            pass
+        with pytest.raises(Timeout):
+            with locks.lake_lock(root, exclusive=True, timeout=0.2):
+                pass
+    finally:
+        release.set()
+        t.join()
@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 
 import pandas as pd
@@ -5,6 +6,8 @@ import polars as pl
 import pytest
 
 from src.config import DatasetConfig
+from src import promote as promote_module
+from src import telemetry
 from src.promote import discover_changed_partitions, promote_to_silver, write_bronze_and_collect
 
 
@@ -106,3 +109,158 @@ def test_promote_to_silver_merges_existing_and_new_bronze(tmp_root: Path, datase
     assert silver_updated.height == 1
     assert silver_updated.select("targets").item() == 10
 
+
+def test_promote_to_silver_skips_validation_for_unchanged_partitions(
+    tmp_root: Path, dataset_cfg: DatasetConfig, monkeypatch: pytest.MonkeyPatch
+):
+    calls = []
+    monkeypatch.setattr(promote_module, "validate_bronze", lambda name, df: calls.append(("bronze", name)))
+    monkeypatch.setattr(promote_module, "validate_silver", lambda name, df: calls.append(("silver", name)))
+
+    df = pd.DataFrame({"season": [2024], "week": [1], "player_id": ["00-001"], "team": ["BUF"]})
+    changed, _ = write_bronze_and_collect(str(tmp_root), dataset_cfg, df)
+
+    cache: dict = {}
+    promote_to_silver(str(tmp_root), dataset_cfg, changed, no_validate=False, validation_cache=cache)
+    assert calls == [("bronze", "weekly"), ("silver", "weekly")]
+    assert set(cache) == {"bronze/season=2024/week=1", "silver/season=2024/week=1"}
+
+    calls.clear()
+    promote_to_silver(str(tmp_root), dataset_cfg, changed, no_validate=False, validation_cache=cache)
+    assert calls == []
+
+    promote_to_silver(
+        str(tmp_root), dataset_cfg, changed, no_validate=False, validation_cache=cache, revalidate=True
+    )
+    assert calls == [("bronze", "weekly"), ("silver", "weekly")]
+
+
+def test_schema_version_changes_when_schema_definitions_change(monkeypatch: pytest.MonkeyPatch):
+    import pandera.pandas as pa
+
+    from src import schemas
+
+    before = schemas.schema_version("pbp", "silver")
+    monkeypatch.setattr(
+        schemas,
+        "PBP_SCHEMA_SILVER",
+        pa.DataFrameSchema({"game_id": pa.Column(str, nullable=True)}, coerce=True),
+    )
+    schemas._rules_digest.cache_clear()
+    try:
+        assert schemas.schema_version("pbp", "silver") != before
+    finally:
+        schemas._rules_digest.cache_clear()
+
+
+def test_promote_records_stage_telemetry_in_run_log(
+    tmp_root: Path, dataset_cfg: DatasetConfig, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.chdir(tmp_root.parent)
+    (tmp_root.parent / "logs").mkdir()
+    df = pd.DataFrame({"season": [2024, 2024], "week": [1, 2], "player_id": ["00-001", "00-002"]})
+
+    with telemetry.run_context("run_test", dataset="weekly"):
+        changed, _ = write_bronze_and_collect(str(tmp_root), dataset_cfg, df)
+        promote_to_silver(str(tmp_root), dataset_cfg, changed, no_validate=True)
+
+    events = telemetry.load_stage_events("run_test")
+    stages = {e["stage"] for e in events}
+    assert {"write_bronze", "read_bronze", "merge", "transform", "fingerprint", "write_silver"} <= stages
+    assert all(e["dataset"] == "weekly" and e["wall_s"] >= 0 and e["cpu_s"] >= 0 for e in events)
+    by_stage = {r["stage"]: r for r in telemetry.summarize_stages(events)}
+    # One read/write per partition; bytes come from the files on disk
+    assert by_stage["read_bronze"]["count"] == 2 and by_stage["read_bronze"]["rows"] == 2
+    assert by_stage["read_bronze"]["bytes_read"] > 0
+    assert by_stage["write_silver"]["bytes_written"] > 0
+
+
+def test_promote_spans_export_as_chrome_trace(
+    tmp_root: Path, dataset_cfg: DatasetConfig, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.chdir(tmp_root.parent)
+    (tmp_root.parent / "logs").mkdir()
+    df = pd.DataFrame({"season": [2024, 2024], "week": [1, 2], "player_id": ["00-001", "00-002"]})
+
+    with telemetry.run_context("run_trace", dataset="weekly"), telemetry.span("weekly", cat="dataset"):
+        changed, _ = write_bronze_and_collect(str(tmp_root), dataset_cfg, df)
+        promote_to_silver(str(tmp_root), dataset_cfg, changed, no_validate=True)
+
+    trace = json.loads(telemetry.export_chrome_trace("run_trace").read_text())
+    complete = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    cats = {e["cat"] for e in complete}
+    assert {"dataset", "stage", "partition"} <= cats
+    assert all(isinstance(e["pid"], int) and isinstance(e["tid"], int) and e["dur"] >= 0 for e in complete)
+    # Partition spans sit inside the dataset span on the same thread
+    outer = next(e for e in complete if e["cat"] == "dataset")
+    for part in (e for e in complete if e["cat"] == "partition"):
+        assert part["tid"] == outer["tid"] and outer["ts"] <= part["ts"] <= outer["ts"] + outer["dur"]
+    assert any(e["ph"] == "M" and e["name"] == "thread_name" for e in trace["traceEvents"])
+
+
+def test_resumed_bootstrap_skips_completed_years_and_retries_failures(
+    tmp_root: Path, dataset_cfg: DatasetConfig, monkeypatch: pytest.MonkeyPatch
+):
+    from src import orchestration
+    from src.lineage import LineageStore
+
+    fetched: list[str] = []
+    failing = {"2024"}
+
+    def _fetch(cfg, years):
+        fetched.append(years)
+        if years in failing:
+            failing.discard(years)
+            raise ConnectionError(f"network error for {years}")
+        return pd.DataFrame({"season": [int(years)], "week": [1], "player_id": [f"00-{years}"]})
+
+    monkeypatch.setattr(orchestration.importers, "fetch_dataset_bootstrap", _fetch)
+    db = str(tmp_root.parent / "lineage.db")
+    args = (str(tmp_root), dataset_cfg, "2023-2024", True)
+
+    with pytest.raises(ConnectionError):
+        orchestration._run_dataset_bootstrap(*args, lineage_path=db, retry_attempts=1)
+    with LineageStore(db, json_path=None) as store:
+        ck = store.checkpoints("bootstrap", "weekly")
+        assert ck[("2023", "silver")]["status"] == "completed"
+        assert ck[("2024", "bronze")]["status"] == "failed"
+        # The completed year is already in lineage even though the dataset failed
+        assert "season=2023/week=1" in store.partitions("weekly")
+
+    fetched.clear()
+    failing.add("2024")
+    rows, parts, _stats = orchestration._run_dataset_bootstrap(
+        *args, lineage_path=db, resume=True, retry_attempts=2, retry_base_seconds=0
+    )
+
+    # 2023 is skipped; 2024 fails once and succeeds on the retry
+    assert fetched == ["2024", "2024"]
+    assert rows == 1 and parts == ["season=2024/week=1"]
+    with LineageStore(db, json_path=None) as store:
+        assert store.checkpoints("bootstrap", "weekly")[("2024", "silver")]["status"] == "completed"
+        assert store.checkpoints("bootstrap", "weekly")[("2024", "bronze")]["attempts"] == 2
+    assert (tmp_root / "silver" / "weekly" / "season=2024").exists()
+
+
+def test_move_replace_moves_the_old_tree_into_staging(tmp_root: Path, monkeypatch: pytest.MonkeyPatch):
+    import shutil
+
+    from src.io import move_replace
+
+    live = tmp_root / "silver" / "weekly" / "season=2024"
+    live.mkdir(parents=True)
+    (live / "part-0.parquet").write_text("old")
+    staged = tmp_root / "silver" / "_staging" / "abc" / "weekly" / "season=2024"
+    staged.mkdir(parents=True)
+    (staged / "part-0.parquet").write_text("new")
+    removed = []
+    rmtree = shutil.rmtree
+    monkeypatch.setattr(shutil, "rmtree", lambda path, **kw: (removed.append(Path(path)), rmtree(path, **kw)))
+
+    move_replace(staged, live)
+
+    assert (live / "part-0.parquet").read_text() == "new"
+    # The replaced tree never sits inside the dataset directory, where season globs could match it
+    (trash,) = removed
+    assert trash.parent == staged.parent and not trash.exists()
+    assert sorted(p.name for p in (tmp_root / "silver" / "weekly").iterdir()) == ["season=2024"]
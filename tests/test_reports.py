@@ -0,0 +1,511 @@
+import re
+import shutil
+from dataclasses import replace
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from src.config import DatasetCatalog, ReportConfig, load_dataset_catalog
+from src.dag import DagNode
+from src.lineage import LineageStore
+from src.orchestration import _materialize_changed_weeks, _report_nodes, _run_graph
+from src.profiling import run_profile
+from src.reports import macro_report
+from src.reports.runner import ReportRunner, _swap_partitions, get_runner
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _write_silver(tmp_path: Path) -> None:
+    weekly = {
+        2025: {"opponent_team": ["NYJ", "NYJ", "DAL"], "position": ["WR", "RB", "WR"], "fantasy_points_ppr": [15.0, 12.0, 5.0]},
+        2024: {"opponent_team": ["NYJ"], "position": ["WR"], "fantasy_points_ppr": [99.0]},
+    }
+    for season, frame in weekly.items():
+        weekly_dir = tmp_path / "data" / "silver" / "weekly" / f"season={season}"
+        weekly_dir.mkdir(parents=True)
+        n = len(frame["position"])
+        pl.DataFrame(
+            {"season": [season] * n, "week": [1] * n, "season_type": ["REG"] * n, **frame}
+        ).write_parquet(weekly_dir / "part-0.parquet")
+    sched_dir = tmp_path / "data" / "silver" / "schedules" / "season=2025"
+    sched_dir.mkdir(parents=True)
+    pl.DataFrame(
+        {"season": [2025], "week": [1], "game_type": ["REG"], "home_team": ["NYJ"], "away_team": ["DAL"]}
+    ).write_parquet(sched_dir / "part-0.parquet")
+
+
+def _write_pbp_and_weekly(tmp_path: Path) -> None:
+    # Two targets for WR1 (one into the end zone) and a goal-line carry for RB1
+    pbp_dir = tmp_path / "data" / "silver" / "pbp" / "year=2025"
+    pbp_dir.mkdir(parents=True)
+    pl.DataFrame(
+        {
+            "week": [1, 1, 1],
+            "season_type": ["REG"] * 3,
+            "posteam": ["NYJ"] * 3,
+            "game_id": ["g1"] * 3,
+            "drive": [1, 1, 2],
+            "pass": [1, 1, 0],
+            "pass_attempt": [1, 1, 0],
+            "sack": [0, 0, 0],
+            "rush": [0, 0, 1],
+            "rush_attempt": [0, 0, 1],
+            "qb_dropback": [1, 1, 0],
+            "xpass": [0.5, 0.5, 0.2],
+            "yardline_100": [15, 25, 4],
+            "air_yards": [10.0, 30.0, None],
+            "down": [1, 3, 1],
+            "ydstogo": [10, 8, 4],
+            "half_seconds_remaining": [900, 600, 300],
+            "offense_personnel": ["11", "11", "21"],
+            "shotgun": [1, 0, 0],
+            "no_huddle": [0, 0, 0],
+            "drive_play_count": [2, 2, 1],
+            "drive_time_of_possession": ["1:00", "1:00", "0:30"],
+            "receiver_player_id": ["WR1", "WR1", None],
+            "rusher_player_id": [None, None, "RB1"],
+        }
+    ).write_parquet(pbp_dir / "part-0.parquet")
+    weekly_dir = tmp_path / "data" / "silver" / "weekly" / "season=2025"
+    weekly_dir.mkdir(parents=True)
+    pl.DataFrame(
+        {
+            "season": [2025, 2025],
+            "week": [1, 1],
+            "season_type": ["REG", "REG"],
+            "team": ["NYJ", "NYJ"],
+            "player_id": ["WR1", "RB1"],
+            "player_name": ["Wide Out", "Running Back"],
+            "position": ["WR", "RB"],
+            "source": ["nflverse", "nflverse"],
+            "receiving_yards": [40.0, 0.0],
+            "air_yards_share": [1.0, 0.0],
+            "wopr": [1.0, 0.0],
+        }
+    ).write_parquet(weekly_dir / "part-0.parquet")
+
+
+class TestReportRunner:
+    def test_binds_season_and_registers_only_present_views(self, tmp_path, monkeypatch):
+        _write_silver(tmp_path)
+        monkeypatch.chdir(tmp_path)
+        sql = ROOT / "queries" / "reports" / "materialize_defense_position_points_allowed.sql"
+
+        with ReportRunner("data") as runner:
+            assert sorted(runner.refresh_views()) == ["silver_schedules", "silver_weekly"]
+            runner.execute(sql, {"season": 2025, "season_type": "REG"})
+
+        out = pl.read_parquet("data/gold/reports/defense_position_points_allowed/**/*.parquet", hive_partitioning=True)
+        assert out["season"].unique().to_list() == [2025]
+        # The 99-point 2024 row is excluded by the bound season parameter
+        assert out["points_allowed_ppr"].max() < 99.0
+
+    def test_season_scoped_views_open_only_that_seasons_files(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        for season in (2023, 2024, 2025):
+            part = tmp_path / "data" / "silver" / "weekly" / f"season={season}"
+            part.mkdir(parents=True)
+            cols = {"week": [1, 2], "pts": [1.0, 2.0]}
+            if season == 2025:
+                cols["targets"] = [3, 4]
+            pl.DataFrame(cols).write_parquet(part / "part-0.parquet")
+        sql = tmp_path / "q.sql"
+        sql.write_text("SELECT season, week, targets FROM silver_weekly_for_season WHERE season = $season ORDER BY week")
+
+        with ReportRunner("data") as runner:
+            runner.con.execute("CALL enable_logging('FileSystem')")
+            out = runner.execute(sql, {"season": 2024})
+            opened = {
+                row[0]
+                for row in runner.con.execute(
+                    "SELECT DISTINCT message::JSON->>'path' FROM duckdb_logs WHERE message::JSON->>'op' = 'OPEN'"
+                ).fetchall()
+            }
+            missing = runner.execute(sql, {"season": 2030})
+
+        assert opened == {"data/silver/weekly/season=2024/part-0.parquet"}
+        # Columns only newer seasons have come from the cached union schema
+        assert out.to_dicts() == [{"season": 2024, "week": 1, "targets": None}, {"season": 2024, "week": 2, "targets": None}]
+        assert missing.is_empty() and missing.columns == ["season", "week", "targets"]
+
+    def test_run_many_shares_connection_and_reports_errors(self, tmp_path):
+        _write_silver(tmp_path)
+        ok = tmp_path / "ok.sql"
+        ok.write_text("SELECT count(*) AS n FROM silver_weekly WHERE season = $season")
+        bad = tmp_path / "bad.sql"
+        bad.write_text("SELECT * FROM silver_pbp WHERE year = $season")
+
+        with ReportRunner((tmp_path / "data").as_posix()) as runner:
+            assert runner.execute(ok, {"season": 2025, "season_type": "REG"})["n"].to_list() == [3]
+            errors = runner.run_many([(ok, {"season": 2025}), (bad, {"season": 2025})], max_workers=2)
+
+        assert errors[str(ok)] is None
+        assert "silver_pbp" in errors[str(bad)]
+
+    def test_missing_parameter_is_an_error(self, tmp_path):
+        sql = tmp_path / "q.sql"
+        sql.write_text("SELECT $season AS season, $season_type AS season_type")
+
+        with ReportRunner((tmp_path / "data").as_posix()) as runner:
+            with pytest.raises(ValueError, match="season_type"):
+                runner.execute(sql, {"season": 2025})
+
+    def test_materialize_swaps_only_requested_weeks(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        weekly_dir = tmp_path / "data" / "silver" / "weekly" / "season=2025"
+        weekly_dir.mkdir(parents=True)
+        frame = pl.DataFrame({"season": [2025, 2025], "week": [1, 2], "pts": [10.0, 20.0]})
+        frame.write_parquet(weekly_dir / "part-0.parquet")
+        sql = tmp_path / "report.sql"
+        sql.write_text(
+            "COPY (SELECT season, week, sum(pts) AS pts FROM silver_weekly WHERE season = $season GROUP BY ALL)\n"
+            "TO 'data/gold/reports/demo' WITH (FORMAT PARQUET, PARTITION_BY (season, week), OVERWRITE_OR_IGNORE 1);"
+        )
+        out = "data/gold/reports/demo/**/*.parquet"
+
+        with ReportRunner("data") as runner:
+            assert len(runner.materialize(sql, {"season": 2025})) == 2
+            before = runner.week_fingerprints("silver_weekly", 2025)
+
+            frame.with_columns(pl.col("pts") + 1).write_parquet(weekly_dir / "part-0.parquet")
+            after = runner.week_fingerprints("silver_weekly", 2025)
+            swapped = runner.materialize(sql, {"season": 2025}, weeks=[2])
+
+        assert before.keys() == after.keys() and all(before[w] != after[w] for w in before)
+        assert [p.as_posix() for p in swapped] == ["data/gold/reports/demo/season=2025/week=2"]
+        result = pl.read_parquet(out, hive_partitioning=True).sort("week")
+        # Week 1 keeps its previous build; week 2 was rebuilt from the new silver data
+        assert result["pts"].to_list() == [10.0, 21.0]
+        assert not list((tmp_path / "data" / "gold" / "reports").glob(".*"))
+
+    def test_swap_moves_replaced_partitions_outside_the_target(self, tmp_path, monkeypatch):
+        target = tmp_path / "gold" / "demo"
+        staging = tmp_path / "gold" / ".demo.staging-1"
+        for root in (target, staging):
+            (root / "season=2025" / "week=1").mkdir(parents=True)
+            (root / "season=2025" / "week=1" / "part-0.parquet").write_text(root.name)
+        renamed = []
+        rename = Path.rename
+        monkeypatch.setattr(Path, "rename", lambda self, dest: (renamed.append((self, Path(dest))), rename(self, dest))[1])
+
+        swapped = _swap_partitions(staging, target, 2)
+
+        assert swapped == [target / "season=2025" / "week=1"]
+        assert (swapped[0] / "part-0.parquet").read_text() == staging.name
+        # The live partition went to a trash dir beside the staging dir, never under the target tree
+        assert renamed[0][0] == swapped[0] and target not in renamed[0][1].parents
+        assert sorted(p.name for p in (tmp_path / "gold").iterdir()) == ["demo"]
+
+    def test_week_fingerprints_are_hashed_once_per_file_version(self, tmp_path):
+        weekly_dir = tmp_path / "data" / "silver" / "weekly" / "season=2025"
+        weekly_dir.mkdir(parents=True)
+        frame = pl.DataFrame({"season": [2025, 2025], "week": [1, 2], "pts": [10.0, 20.0]})
+        frame.write_parquet(weekly_dir / "part-0.parquet")
+        root = (tmp_path / "data").as_posix()
+
+        with ReportRunner(root) as runner:
+            first = runner.week_fingerprints("silver_weekly", 2025)
+            assert runner.week_fingerprints("silver_weekly", 2025) == first
+            assert runner.fingerprint_scans == 1
+        # A new runner reuses the persisted fingerprints while the files are unchanged
+        with ReportRunner(root) as runner:
+            assert runner.week_fingerprints("silver_weekly", 2025) == first
+            assert runner.fingerprint_scans == 0
+            frame.with_columns(pl.col("pts") + 1).write_parquet(weekly_dir / "part-1.parquet")
+            (weekly_dir / "part-0.parquet").unlink()
+            assert runner.week_fingerprints("silver_weekly", 2025) != first
+            assert runner.fingerprint_scans == 1
+
+    def test_materialize_rejects_non_copy_sql(self, tmp_path):
+        sql = tmp_path / "q.sql"
+        sql.write_text("SELECT 1")
+
+        with ReportRunner((tmp_path / "data").as_posix()) as runner:
+            with pytest.raises(ValueError, match="COPY"):
+                runner.materialize(sql, {})
+
+    def test_position_reports_read_shared_intermediates(self, tmp_path, monkeypatch):
+        _write_pbp_and_weekly(tmp_path)
+        monkeypatch.chdir(tmp_path)
+        reports = ROOT / "queries" / "reports"
+        params = {"season": 2025, "season_type": "REG"}
+
+        with ReportRunner("data") as runner:
+            runner.materialize(reports / "materialize_team_week_context.sql", params)
+            runner.materialize(reports / "materialize_player_week_events.sql", params)
+            for pos in ("wr", "rb", "rushing"):
+                sql = reports / f"materialize_player_week_utilization_{pos}.sql"
+                # Only the intermediates scan pbp
+                assert "silver_pbp" not in sql.read_text()
+                runner.materialize(sql, params)
+
+        ctx = pl.read_parquet("data/gold/team_week_context/**/*.parquet", hive_partitioning=True)
+        assert ctx.select("team_targets", "team_pass_attempts", "team_carries", "team_rz5_carries").row(0) == (2, 2, 1, 1)
+        wr = pl.read_parquet("data/gold/reports/player_week_utilization_wr/**/*.parquet", hive_partitioning=True)
+        assert wr.select("targets", "target_share", "end_zone_targets", "adot").row(0) == (2, 1.0, 1, 20.0)
+        rushing = pl.read_parquet(
+            "data/gold/reports/player_week_utilization_rushing/**/*.parquet", hive_partitioning=True
+        ).filter(pl.col("player_id") == "RB1")
+        assert rushing.select("carries", "carry_share", "rz5_carry_share").row(0) == (1, 1.0, 1.0)
+
+    def test_update_report_pass_scans_pbp_once_per_intermediate(self, tmp_path, monkeypatch):
+        _write_pbp_and_weekly(tmp_path)
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "logs").mkdir()
+        full = load_dataset_catalog(str(ROOT / "catalog" / "datasets.yml"))
+        reports = {
+            name: replace(full.reports[name], sql=str(ROOT / full.reports[name].sql), depends_on=[
+                dep for dep in full.reports[name].depends_on if dep != "weekly_backfill"
+            ])
+            for name in ("team_week_context", "player_week_events", *(f"player_week_utilization_{p}" for p in ("wr", "rb", "rushing")))
+        }
+        catalog = replace(full, root="data", reports=reports)
+        root = (tmp_path / "data").as_posix()
+
+        nodes = _report_nodes(root, catalog, 2025, {})
+        runner = get_runner(root, catalog)
+        runner.con.execute("CALL enable_logging('FileSystem')")
+        scans_before = runner.fingerprint_scans
+        with LineageStore(str(tmp_path / "lineage.db"), json_path=None) as store:
+            results = _run_graph(store, nodes, {}, 4, "run_scan", "update", season=2025)
+        # Every statement runs on its own cursor, so cursors that opened a pbp file count the scans
+        scans = runner.con.execute(
+            "SELECT count(DISTINCT connection_id) FROM duckdb_logs WHERE (message::JSON->>'op') = 'OPEN' "
+            "AND (message::JSON->>'path') LIKE '%/silver/pbp/%'"
+        ).fetchone()[0]
+
+        assert {name: res.status for name, res in results.items()} == dict.fromkeys(reports, "completed")
+        # Five reports list pbp as an input: its week fingerprints are hashed once and shared, and
+        # only the two intermediates read it for their builds
+        assert runner.fingerprint_scans - scans_before == 2  # pbp and weekly
+        assert scans == 3
+
+
+class TestGoldTables:
+    def test_catalog_layout_matches_what_the_sql_writes(self):
+        catalog = load_dataset_catalog(str(ROOT / "catalog" / "datasets.yml"))
+
+        assert catalog.gold_tables()
+        for name, rep in catalog.gold_tables().items():
+            m = re.search(r"TO\s+'([^']+)'.*PARTITION_BY\s*\(([^)]*)\)", (ROOT / rep.sql).read_text(), re.DOTALL)
+            assert m.group(1) == f"data/{rep.output}", name
+            assert [k.strip() for k in m.group(2).split(",")] == rep.partitions, name
+
+    def test_builds_record_partition_lineage_and_profile_as_gold(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "logs").mkdir()
+        weekly_dir = tmp_path / "data" / "silver" / "weekly" / "season=2025"
+        weekly_dir.mkdir(parents=True)
+        pl.DataFrame(
+            {"season": [2025] * 3, "week": [1, 1, 2], "player_id": ["a", "b", "a"], "pts": [1.0, 2.0, 3.0]}
+        ).write_parquet(weekly_dir / "part-0.parquet")
+        sql = tmp_path / "demo.sql"
+        sql.write_text(
+            "COPY (SELECT season, week, player_id, sum(pts) AS pts FROM silver_weekly_for_season "
+            "WHERE season = $season GROUP BY ALL)\n"
+            "TO 'data/gold/demo' WITH (FORMAT PARQUET, PARTITION_BY (season, week), OVERWRITE_OR_IGNORE 1);"
+        )
+        rep = ReportConfig(
+            name="demo",
+            fn=None,
+            inputs=["weekly"],
+            depends_on=[],
+            output="gold/demo",
+            only_if_missing=None,
+            sql=str(sql),
+            partitions=["season", "week"],
+            key=["season", "week", "player_id"],
+        )
+        catalog = DatasetCatalog(root="data", compression="zstd", row_group_mb=96, datasets={}, reports={"demo": rep})
+        root = (tmp_path / "data").as_posix()
+
+        build = _materialize_changed_weeks(root, rep, 2025, "REG", {})
+        with LineageStore(str(tmp_path / "lineage.db"), json_path=None) as store:
+            nodes = {"demo": DagNode("demo", lambda: build, kind="report")}
+            _run_graph(store, nodes, {}, 1, "run_gold", "update", season=2025)
+            parts = store.partitions("demo")
+            runs = store.runs(dataset="demo")
+        rebuilt = _materialize_changed_weeks(root, rep, 2025, "REG", {})
+        profiled = run_profile("data", catalog, None, "gold", None, output_dir=str(tmp_path / "quality"), columns=False)
+
+        assert sorted(build.weeks) == [1, 2]
+        assert {p: st["row_count"] for p, st in parts.items()} == {"season=2025/week=1": 2, "season=2025/week=2": 1}
+        assert runs[0]["status"] == "completed" and runs[0]["rows"] == 3
+        # Unchanged rows keep their fingerprint however the rebuild ordered them
+        assert {p: st.sha256_fingerprint for p, st in rebuilt.partition_stats.items()} == {
+            p: st["sha256_fingerprint"] for p, st in parts.items()
+        }
+        # Nothing changed since the last build, so nothing is rebuilt
+        assert _materialize_changed_weeks(root, rep, 2025, "REG", build.weeks) == ({}, {})
+        assert profiled == [("demo", "gold", "season=2025/week=1"), ("demo", "gold", "season=2025/week=2")]
+
+    def test_season_rebuild_drops_weeks_it_no_longer_produces(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        weekly_dir = tmp_path / "data" / "silver" / "weekly" / "season=2025"
+        weekly_dir.mkdir(parents=True)
+        frame = pl.DataFrame({"season": [2025] * 2, "week": [1, 2], "pts": [1.0, 2.0]})
+        frame.write_parquet(weekly_dir / "part-0.parquet")
+        sql = tmp_path / "season_to_date.sql"
+        sql.write_text(
+            "COPY (SELECT season, week, sum(pts) OVER (ORDER BY week) AS pts FROM silver_weekly_for_season "
+            "WHERE season = $season)\n"
+            "TO 'data/gold/std' WITH (FORMAT PARQUET, PARTITION_BY (season, week), OVERWRITE_OR_IGNORE 1);"
+        )
+        rep = ReportConfig(
+            name="std", fn=None, inputs=["weekly"], depends_on=[], output="gold/std", only_if_missing=None,
+            sql=str(sql), week_local=False, partitions=["season", "week"], key=["season", "week"],
+        )
+        root = (tmp_path / "data").as_posix()
+        season_dir = tmp_path / "data" / "gold" / "std" / "season=2025"
+
+        build = _materialize_changed_weeks(root, rep, 2025, "REG", {})
+        assert sorted(p.name for p in season_dir.iterdir()) == ["week=1", "week=2"]
+        # Week 2 is withdrawn from silver and week 1 restated
+        frame.head(1).with_columns(pl.col("pts") + 1).write_parquet(weekly_dir / "part-1.parquet")
+        (weekly_dir / "part-0.parquet").unlink()
+        rebuilt = _materialize_changed_weeks(root, rep, 2025, "REG", build.weeks)
+
+        assert sorted(rebuilt.weeks) == [1]
+        assert sorted(p.name for p in season_dir.iterdir()) == ["week=1"]
+        # A recorded week whose partition is gone is rebuilt even though its inputs are unchanged
+        assert _materialize_changed_weeks(root, rep, 2025, "REG", rebuilt.weeks) == ({}, {})
+        shutil.rmtree(season_dir / "week=1")
+        assert sorted(_materialize_changed_weeks(root, rep, 2025, "REG", rebuilt.weeks).weeks) == [1]
+
+
+class TestCubes:
+    def test_cube_sums_reproduce_player_week_aggregates(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        weekly_dir = tmp_path / "data" / "silver" / "weekly" / "season=2025"
+        weekly_dir.mkdir(parents=True)
+        stats = ["targets", "receptions", "receiving_yards", "receiving_air_yards", "carries", "rushing_yards", "passing_yards"]
+        rows = [
+            # week, team, opponent, player, position, source, ppr
+            (1, "NYJ", "DAL", "w1", "WR", "nflverse", 15.0),
+            (1, "NYJ", "DAL", "w2", "wr", "nflverse", 4.5),
+            (1, "NYJ", "DAL", "w1", "WR", None, 99.0),  # duplicate source row, dropped
+            (1, "DAL", "NYJ", "w3", "WR", "nflverse", None),
+            (1, "NYJ", "DAL", "r1", "RB", "nflverse", 12.0),
+            (2, "NYJ", "BUF", "w1", "WR", "nflverse", 8.0),
+            (2, "NYJ", "BUF", "w2", "WR", "nflverse", 21.0),
+        ]
+        frame = pl.DataFrame(
+            {
+                "season": [2025] * len(rows),
+                "week": [r[0] for r in rows],
+                "season_type": ["REG"] * len(rows),
+                "team": [r[1] for r in rows],
+                "opponent_team": [r[2] for r in rows],
+                "player_id": [r[3] for r in rows],
+                "position": [r[4] for r in rows],
+                "source": [r[5] for r in rows],
+                "fantasy_points_ppr": [r[6] for r in rows],
+                **{s: [float(i + 1) for i in range(len(rows))] for s in stats},
+            }
+        )
+        frame.write_parquet(weekly_dir / "part-0.parquet")
+        reports = ROOT / "queries" / "reports"
+        params = {"season": 2025, "season_type": "REG"}
+
+        with ReportRunner("data") as runner:
+            runner.materialize(reports / "materialize_team_position_week_cube.sql", params)
+            runner.materialize(reports / "materialize_team_position_season_cube.sql", params)
+
+        week = pl.read_parquet("data/gold/cubes/team_position_week/**/*.parquet", hive_partitioning=True)
+        season = pl.read_parquet("data/gold/cubes/team_position_season/**/*.parquet", hive_partitioning=True)
+        wr = week.filter((pl.col("team") == "NYJ") & (pl.col("position") == "WR")).sort("week")
+        assert wr.select("week", "opponent_team", "n_player_weeks").rows() == [(1, "DAL", 2), (2, "BUF", 2)]
+
+        # Mean and population std of WR player-weeks, from sums alone
+        nyj_wr = season.filter((pl.col("team") == "NYJ") & (pl.col("position") == "WR")).row(0, named=True)
+        points = [15.0, 4.5, 8.0, 21.0]
+        n, s, ss = nyj_wr["n_player_weeks"], nyj_wr["sum_fantasy_points_ppr"], nyj_wr["sumsq_fantasy_points_ppr"]
+        assert n == 4 and s == pytest.approx(sum(points))
+        assert (ss / n - (s / n) ** 2) ** 0.5 == pytest.approx(pl.Series(points).std(ddof=0))
+        assert nyj_wr["n_team_weeks"] == 2
+        assert nyj_wr["sumsq_week_fantasy_points_ppr"] == pytest.approx(19.5**2 + 29.0**2)
+        # A player with no points still counts as a player-week with zero points
+        assert season.filter(pl.col("team") == "DAL").select("n_player_weeks", "sum_fantasy_points_ppr").row(0) == (1, 0.0)
+
+        # The season cube is the week cube rolled up
+        measures = [c for c in week.columns if c.startswith(("sum_", "sumsq_")) or c == "n_player_weeks"]
+        rolled = week.group_by("season", "season_type", "team", "position").agg(pl.col(measures).sum())
+        key = ["team", "position"]
+        assert rolled.sort(key).select(key + measures).equals(season.sort(key).select(key + measures))
+
+
+class TestMacroReport:
+    def test_runs_changed_tables_concurrently_and_skips_unchanged_ones(self, tmp_path, monkeypatch):
+        _write_silver(tmp_path)
+        monkeypatch.chdir(tmp_path)
+        queries = tmp_path / "queries"
+        queries.mkdir()
+        monkeypatch.setattr(macro_report, "QUERIES_DIR", queries)
+        monkeypatch.setattr(macro_report, "RESEARCH_DIR", tmp_path / "research")
+        (queries / "by_position.sql").write_text(
+            "SELECT position, sum(fantasy_points_ppr) AS points "
+            "FROM read_parquet('data/silver/weekly/season=*/*.parquet') GROUP BY ALL ORDER BY position"
+        )
+        (queries / "games.sql").write_text(
+            "SELECT count(*) AS games FROM read_parquet('data/silver/schedules/season=*/*.parquet')"
+        )
+        (queries / "broken.sql").write_text("SELECT * FROM read_parquet('data/silver/missing/*.parquet')")
+        tables = [
+            macro_report.MacroTable("by_position", "by_position.sql"),
+            macro_report.MacroTable("games", "games.sql"),
+            macro_report.MacroTable("broken", "broken.sql", optional=True),
+        ]
+        assert macro_report.input_dirs((queries / "by_position.sql").read_text()) == ["data/silver/weekly"]
+
+        def statuses(**kwargs):
+            return {r.name: r.status for r in macro_report.run_macro_report(tables, max_workers=3, **kwargs)}
+
+        assert statuses() == {"by_position": "ran", "games": "ran", "broken": "failed"}
+        research = tmp_path / "research"
+        assert pl.read_parquet(research / "by_position.parquet").rows() == [("RB", 12.0), ("WR", 119.0)]
+        assert not (research / "by_position.csv").exists()
+        assert statuses() == {"by_position": "skipped", "games": "skipped", "broken": "failed"}
+
+        # A new weekly partition reruns only the table reading weekly; CSV is written on request
+        new = tmp_path / "data" / "silver" / "weekly" / "season=2026"
+        new.mkdir()
+        pl.DataFrame({"position": ["TE"], "fantasy_points_ppr": [7.0]}).write_parquet(new / "part-0.parquet")
+        assert statuses() == {"by_position": "ran", "games": "skipped", "broken": "failed"}
+        assert statuses(csv=True) == {"by_position": "ran", "games": "ran", "broken": "failed"}
+        assert pl.read_csv(research / "by_position.csv")["position"].to_list() == ["RB", "TE", "WR"]
+        assert statuses(csv=True) == {"by_position": "skipped", "games": "skipped", "broken": "failed"}
+        # Changed SQL text reruns the file
+        (queries / "games.sql").write_text(
+            "SELECT count(*) AS n_games FROM read_parquet('data/silver/schedules/season=*/*.parquet')"
+        )
+        assert statuses(force=False)["games"] == "ran"
+        assert pl.read_parquet(research / "games.parquet").columns == ["n_games"]
+
+    def test_inputs_changed_during_a_run_are_not_recorded_as_current(self, tmp_path, monkeypatch):
+        _write_silver(tmp_path)
+        monkeypatch.chdir(tmp_path)
+        queries = tmp_path / "queries"
+        queries.mkdir()
+        monkeypatch.setattr(macro_report, "QUERIES_DIR", queries)
+        monkeypatch.setattr(macro_report, "RESEARCH_DIR", tmp_path / "research")
+        (queries / "games.sql").write_text("SELECT count(*) AS games FROM read_parquet('data/silver/schedules/season=*/*.parquet')")
+        tables = [macro_report.MacroTable("games", "games.sql")]
+        run_table = macro_report._run_table
+
+        def run_then_publish(*args):
+            result = run_table(*args)
+            # A new schedules season lands after the query read its inputs
+            new = tmp_path / "data" / "silver" / "schedules" / "season=2026"
+            new.mkdir(exist_ok=True)
+            pl.DataFrame({"season": [2026], "week": [1]}).write_parquet(new / "part-0.parquet")
+            return result
+
+        monkeypatch.setattr(macro_report, "_run_table", run_then_publish)
+        assert [r.status for r in macro_report.run_macro_report(tables)] == ["ran"]
+        monkeypatch.setattr(macro_report, "_run_table", run_table)
+
+        assert [r.status for r in macro_report.run_macro_report(tables)] == ["ran"]
+        assert pl.read_parquet(tmp_path / "research" / "games.parquet")["games"].to_list() == [2]
+        assert [r.status for r in macro_report.run_macro_report(tables)] == ["skipped"]
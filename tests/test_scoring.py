@@ -0,0 +1,49 @@
+import duckdb
+import numpy as np
+import polars as pl
+import pytest
+
+from src.scoring import compile_rules, load_rules, register_macros, score
+
+
+def _stat_frame(n: int) -> pl.DataFrame:
+    rng = np.random.default_rng(7)
+    rules = load_rules("dk_classic")
+    return pl.DataFrame(
+        {c: rng.integers(0, 400 if c.endswith("yards") else 3, n).astype(float) for c in rules.stat_columns}
+    ).with_columns(pl.col("passing_tds").cast(pl.Int64), pl.lit(None, dtype=pl.Float64).alias("receptions"))
+
+
+def test_catalog_rules_score_bonuses_and_per_unit_yards():
+    game = pl.DataFrame(
+        {"passing_yards": [310.0], "passing_tds": [2], "interceptions": [1], "rushing_yards": [12.0], "receptions": [None]}
+    )
+
+    # 12.4 yards + 8 TD - 1 INT + 3 bonus + 1.2 rushing; absent stats and nulls count as zero
+    assert score(game, "dk_classic").to_list() == [pytest.approx(23.6)]
+    assert score(game, "dk_bestball").to_list() == [pytest.approx(23.6)]
+    assert score(game, "standard_ppr").to_list() == [pytest.approx(19.6)]
+    # Season totals renamed to the catalog stats, without the per-game bonuses
+    season = pl.DataFrame({"rush_yds": [1500.0], "rush_td": [10]})
+    assert score(season.to_pandas(), columns={"rushing_yards": "rush_yds", "rushing_tds": "rush_td"}, bonuses=False).to_list() == [
+        pytest.approx(210.0)
+    ]
+    with pytest.raises(ValueError, match="safety_bonus"):
+        compile_rules({"scoring": {"safety_bonus": {"points": 1}}}, "custom")
+
+
+def test_duckdb_macros_match_the_vectorized_expressions():
+    frame = _stat_frame(5_000)
+    con = duckdb.connect()
+    register_macros(con)
+    con.execute("CREATE TABLE weekly AS SELECT * FROM frame")
+
+    # Cursors share the macros; the row alias is passed as a struct
+    out = con.cursor().execute(
+        "SELECT dk_classic_points(w) AS dk, dk_showdown_points(w) AS sd, standard_ppr_points(w) AS ppr FROM weekly w"
+    ).pl()
+
+    assert out.schema["dk"] == pl.Float64
+    assert np.allclose(out["dk"].to_numpy(), score(frame.to_arrow(), "dk_classic").to_numpy())
+    assert np.allclose(out["sd"].to_numpy(), score(frame, "dk_showdown").to_numpy())
+    assert np.allclose(out["ppr"].to_numpy(), score(frame, "standard_ppr").to_numpy())
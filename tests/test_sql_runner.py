@@ -0,0 +1,34 @@
+import os
+
+import duckdb
+import pytest
+
+from src.sql_runner import SqlRunner, to_duckdb_placeholders
+
+
+def test_colon_placeholders_become_duckdb_parameters_outside_strings_and_comments():
+    sql = "SELECT CAST(:season AS INTEGER), x::INT, 'a :b', l[i:j], {'k':v} -- :c\nWHERE y = :y /* :d */"
+
+    assert to_duckdb_placeholders(sql) == (
+        "SELECT CAST($season AS INTEGER), x::INT, 'a :b', l[i:j], {'k':v} -- :c\nWHERE y = $y /* :d */"
+    )
+
+
+def test_files_are_parsed_once_and_values_are_bound_not_spliced(tmp_path):
+    path = tmp_path / "q.sql"
+    path.write_text("SELECT :name AS name, $season + 1 AS next FROM range(3) LIMIT :limit")
+    runner = SqlRunner(duckdb.connect())
+
+    query = runner.load(path)
+    assert query.params == {"name", "season", "limit"}
+    assert runner.load(path) is query
+    hostile = "x'); DROP TABLE t; --"
+    rows = runner.execute(path, {"name": hostile, "season": 2024, "limit": 2, "unused": 1}).fetchall()
+    assert rows == [(hostile, 2025), (hostile, 2025)]
+    with pytest.raises(ValueError, match="limit"):
+        runner.execute(path, {"name": "x", "season": 2024})
+
+    # An edited file is re-read
+    path.write_text("SELECT $season AS season")
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+    assert runner.execute(path, {"season": 2024}).fetchall() == [(2024,)]
@@ -3,8 +3,17 @@ import hashlib
 import polars as pl
 import pytest
 
-from src.lineage import compute_sha256_for_keys, record_partition_counts
-from src.profiling import _compute_metrics
+from src.lineage import LineageStore, PartitionStats, compute_sha256_for_keys, record_partition_counts, save_lineage
+from src.config import DatasetCatalog, DatasetConfig
+from src.profiling import _compute_metrics, _profile_partition, run_profile
+from src.quality_store import (
+    HyperLogLog,
+    QuantileSketch,
+    column_profiles,
+    load_column_profiles,
+    rollup_column_profiles,
+    scan_column_profiles,
+)
 
 
 class TestComputeMetrics:
@@ -44,6 +53,137 @@ class TestComputeMetrics:
         assert metrics["key_unique_rows"] == 2
         assert metrics["key_duplicate_rows"] == 0
 
+    def test_partition_profile_uses_footer_stats_and_partition_values(self, tmp_path):
+        part_dir = tmp_path / "silver" / "weekly" / "season=2024"
+        part_dir.mkdir(parents=True)
+        pl.DataFrame(
+            {"week": [1, 2], "player_id": ["A", None], "value": [1.0, 2.0]}
+        ).write_parquet(part_dir / "part-0.parquet")
+        pl.DataFrame(
+            {"week": [3], "player_id": ["A"], "value": [None]}, schema_overrides={"value": pl.Float64}
+        ).write_parquet(part_dir / "part-1.parquet")
+
+        metrics = _profile_partition(str(tmp_path), "weekly", "silver", "season=2024", ["season", "week", "player_id"])
+
+        assert metrics["rows"] == 3
+        assert metrics["columns"] == ["week", "player_id", "value"]
+        assert metrics["key_nulls"] == {"season": 0, "week": 0, "player_id": 1}
+        assert metrics["key_unique_rows"] == 3
+        assert metrics["season_min"] == metrics["season_max"] == 2024
+        assert metrics["week_min"] == 1
+        assert metrics["week_max"] == 3
+
+
+class TestRunProfile:
+    @staticmethod
+    def _catalog(tmp_path) -> DatasetCatalog:
+        cfg = DatasetConfig(
+            name="weekly",
+            importer="weekly",
+            years=None,
+            partitions=["season"],
+            key=["season", "player_id"],
+            options={},
+            enabled=True,
+            sort_by=None,
+            max_rows_per_file=None,
+        )
+        for season in (2023, 2024):
+            part = tmp_path / "lake" / "silver" / "weekly" / f"season={season}"
+            part.mkdir(parents=True)
+            pl.DataFrame({"player_id": ["A", "B"]}).write_parquet(part / "part-0.parquet")
+        return DatasetCatalog(root=str(tmp_path / "lake"), compression="zstd", row_group_mb=96, datasets={"weekly": cfg})
+
+    def test_skips_unchanged_partitions(self, tmp_path):
+        catalog = self._catalog(tmp_path)
+        out = str(tmp_path / "quality")
+
+        first = run_profile(catalog.root, catalog, None, "silver", None, output_dir=out, max_workers=2)
+        assert sorted(first) == [("weekly", "silver", "season=2023"), ("weekly", "silver", "season=2024")]
+
+        assert run_profile(catalog.root, catalog, None, "silver", None, output_dir=out) == []
+
+        pl.DataFrame({"player_id": ["A", "B", "C"]}).write_parquet(
+            tmp_path / "lake" / "silver" / "weekly" / "season=2024" / "part-0.parquet"
+        )
+        assert run_profile(catalog.root, catalog, None, "silver", None, output_dir=out) == [
+            ("weekly", "silver", "season=2024")
+        ]
+        assert len(run_profile(catalog.root, catalog, None, "silver", None, output_dir=out, force=True)) == 2
+
+    def test_appends_column_profiles_per_run(self, tmp_path):
+        catalog = self._catalog(tmp_path)
+        out = tmp_path / "quality"
+
+        run_profile(catalog.root, catalog, None, "silver", None, output_dir=str(out))
+        run_profile(catalog.root, catalog, None, "silver", None, output_dir=str(out), force=True)
+
+        assert len(list((out / "columns").glob("*.parquet"))) == 2
+        latest = load_column_profiles(str(out / "columns"), dataset="weekly")
+        assert sorted(latest["partition"].to_list()) == ["season=2023", "season=2024"]
+        assert latest["approx_distinct"].to_list() == [2, 2]
+
+
+class TestQualityStore:
+    def test_sketches_merge_across_partitions(self):
+        a = pl.DataFrame({"player_id": [f"p{i}" for i in range(600)], "yards": [float(i) for i in range(600)]})
+        b = pl.DataFrame(
+            {"player_id": [f"p{i}" for i in range(300, 1000)], "yards": [float(i) for i in range(300, 1000)]}
+        )
+        parts = pl.concat(
+            [
+                column_profiles(a, "weekly", "silver", "season=2023", "r1"),
+                column_profiles(b, "weekly", "silver", "season=2024", "r1"),
+            ]
+        )
+
+        rolled = {r["column"]: r for r in rollup_column_profiles(parts).iter_rows(named=True)}
+
+        assert rolled["player_id"]["rows"] == 1300
+        assert abs(rolled["player_id"]["approx_distinct"] - 1000) < 50
+        assert abs(rolled["yards"]["p50"] - 499.5) / 499.5 < 0.05
+        assert rolled["yards"]["min"] == 0.0 and rolled["yards"]["max"] == 999.0
+        assert rolled["player_id"]["stale_partitions"] == 0
+
+    def test_rollup_flags_registers_from_another_hasher(self):
+        a = column_profiles(pl.DataFrame({"player_id": ["a", "b"]}), "weekly", "silver", "season=2023", "r1")
+        b = column_profiles(pl.DataFrame({"player_id": ["c"]}), "weekly", "silver", "season=2024", "r1")
+        old = b.with_columns(pl.lit("polars-0.0.0-seed0").alias("hash_impl"))
+
+        (mixed,) = rollup_column_profiles(pl.concat([a, old])).iter_rows(named=True)
+        (current,) = rollup_column_profiles(pl.concat([a, b])).iter_rows(named=True)
+
+        # Merging only the current registers would silently undercount
+        assert mixed["stale_partitions"] == 1 and mixed["approx_distinct"] is None
+        assert mixed["rows"] == 3
+        assert current["stale_partitions"] == 0 and current["approx_distinct"] == 3
+
+    def test_null_ratio_and_top_values(self):
+        df = pl.DataFrame({"team": ["KC", "KC", "BUF", None], "score": [0, -3, 7, None]})
+
+        rows = {r["column"]: r for r in column_profiles(df, "weekly", "silver", "", "r1").iter_rows(named=True)}
+
+        assert rows["team"]["null_ratio"] == 0.25
+        assert rows["team"]["top_values"][0] == {"value": "KC", "count": 2}
+        sketch = QuantileSketch.from_columns(rows["score"])
+        assert sketch.count == 3 and sketch.quantile(0.0) < 0 and sketch.quantile(0.5) == 0.0
+
+    def test_column_at_a_time_scan_matches_in_memory_profiles(self, tmp_path):
+        df = pl.DataFrame({"team": ["KC", None, "BUF", "KC"], "score": [0.0, -3.0, 7.5, None], "empty": [None] * 4})
+        df.head(2).write_parquet(tmp_path / "part-0.parquet")
+        df.tail(2).write_parquet(tmp_path / "part-1.parquet")
+        files = [str(tmp_path / "part-0.parquet"), str(tmp_path / "part-1.parquet")]
+
+        scanned = scan_column_profiles(files, "weekly", "silver", "", "r1", profiled_at="t")
+
+        assert scanned.equals(column_profiles(df, "weekly", "silver", "", "r1", profiled_at="t"))
+
+    def test_hll_round_trips_through_bytes(self):
+        hll = HyperLogLog.from_hashes(pl.Series(range(5000)).hash(seed=0).to_numpy())
+
+        assert HyperLogLog.from_bytes(hll.to_bytes()).estimate() == hll.estimate()
+        assert abs(hll.estimate() - 5000) / 5000 < 0.05
+
 
 class TestComputeSha256:
     def test_matches_direct_hashlib(self):
@@ -87,6 +227,131 @@ class TestRecordPartitionCounts:
         assert updated["weekly"]["partitions"]["season=2024/week=1"]["row_count"] == 25
 
 
+class TestLineageStore:
+    def test_report_weeks_round_trip_and_update(self, tmp_path):
+        db = tmp_path / "lineage.db"
+        with LineageStore(str(db), json_path=None) as store:
+            store.record_report_weeks("player_week_stats", 2025, {1: "a", 2: "b"})
+            store.record_report_weeks("player_week_stats", 2025, {2: "c"})
+
+            assert store.report_weeks("player_week_stats", 2025) == {1: "a", 2: "c"}
+            assert store.report_weeks("player_week_stats", 2024) == {}
+
+    def test_records_partitions_and_appends_run_history(self, tmp_path):
+        db = tmp_path / "lineage.db"
+        with LineageStore(str(db), json_path=None) as store:
+            store.record_dataset_run(
+                dataset="weekly",
+                last_ingest_utc="2024-09-01T00:00:00+00:00",
+                rows_last_batch=10,
+                changed_partitions=["season=2024"],
+                partition_stats={"season=2024": PartitionStats(row_count=10, sha256_fingerprint="abc")},
+                run_id="run_1",
+                flow="update",
+            )
+            store.record_dataset_run(
+                dataset="weekly",
+                last_ingest_utc="2024-09-08T00:00:00+00:00",
+                rows_last_batch=5,
+                changed_partitions=["season=2023"],
+                partition_row_counts={"season=2023": 5},
+                run_id="run_2",
+                flow="update",
+            )
+
+        with LineageStore(str(db), json_path=None) as store:
+            ds = store.dataset("weekly")
+            assert ds["rows_last_batch"] == 5
+            assert ds["changed_partitions"] == ["season=2023"]
+            assert ds["partitions"]["season=2024"]["sha256_fingerprint"] == "abc"
+            assert ds["partitions"]["season=2023"]["row_count"] == 5
+            assert [r["run_id"] for r in store.runs("weekly")] == ["run_2", "run_1"]
+
+    def test_count_only_updates_keep_ingested_at_bounds(self, tmp_path):
+        with LineageStore(str(tmp_path / "lineage.db"), json_path=None) as store:
+            store.record_dataset_run(
+                dataset="w",
+                last_ingest_utc="2024-02-02T00:00:00+00:00",
+                rows_last_batch=3,
+                changed_partitions=["p"],
+                partition_stats={
+                    "p": PartitionStats(
+                        row_count=3, sha256_fingerprint="fp", max_ingested_at="2024-02", min_ingested_at="2024-01"
+                    )
+                },
+            )
+            store.record_partition_counts("w", "p", 5)
+
+            part = store.partitions("w")["p"]
+            assert part["row_count"] == 5
+            assert part["sha256_fingerprint"] == "fp"
+            assert part["max_ingested_at"] == "2024-02"
+            assert part["min_ingested_at"] == "2024-01"
+
+    def test_failure_only_appends_run_history(self, tmp_path):
+        with LineageStore(str(tmp_path / "lineage.db"), json_path=None) as store:
+            store.record_dataset_run(
+                dataset="weekly",
+                last_ingest_utc="2024-09-01T00:00:00+00:00",
+                rows_last_batch=10,
+                changed_partitions=["season=2024"],
+                run_id="run_1",
+            )
+            store.record_run_failure("weekly", "2024-09-08T00:00:00+00:00", run_id="run_2")
+
+            ds = store.dataset("weekly")
+            assert ds["rows_last_batch"] == 10
+            assert ds["last_ingest_utc"] == "2024-09-01T00:00:00+00:00"
+            assert [r["status"] for r in store.runs(run_id="run_2")] == ["failed"]
+
+    def test_validation_upserts_only_changed_keys(self, tmp_path):
+        db = str(tmp_path / "lineage.db")
+        entry = {"schema_version": "v1", "fingerprint": "a", "validated_at": "t0"}
+        with LineageStore(db, json_path=None) as store:
+            store.record_dataset_run("pbp", "t0", 0, [], validation_cache={"bronze/year=2023": entry})
+
+        with LineageStore(db, json_path=None) as job_a, LineageStore(db, json_path=None) as job_b:
+            cache_a = job_a.validation_cache("pbp")
+            cache_b = job_b.validation_cache("pbp")
+            cache_b["bronze/year=2023"] = {"schema_version": "v1", "fingerprint": "b", "validated_at": "t1"}
+            job_b.record_dataset_run("pbp", "t1", 0, [], validation_cache=cache_b)
+            cache_a["bronze/year=2024"] = {"schema_version": "v1", "fingerprint": "c", "validated_at": "t2"}
+            job_a.record_dataset_run("pbp", "t2", 0, [], validation_cache=cache_a)
+
+            final = job_a.validation_cache("pbp")
+            assert final["bronze/year=2023"]["fingerprint"] == "b"
+            assert final["bronze/year=2024"]["fingerprint"] == "c"
+
+    def test_imports_legacy_json_once_and_exports_same_shape(self, tmp_path):
+        legacy = {
+            "schedules": {
+                "last_ingest_utc": "2025-09-29T00:00:00+00:00",
+                "rows_last_batch": 272,
+                "changed_partitions": ["season=2025"],
+                "partitions": {
+                    "season=2025": {
+                        "row_count": 272,
+                        "sha256_fingerprint": "f",
+                        "max_ingested_at": None,
+                        "min_ingested_at": None,
+                    }
+                },
+            }
+        }
+        json_path = tmp_path / "lineage.json"
+        save_lineage(legacy, str(json_path))
+
+        with LineageStore(str(tmp_path / "lineage.db"), json_path=str(json_path)) as store:
+            assert store.to_dict() == legacy
+            store.record_partition_counts("schedules", "season=2025", 300)
+            out = store.export_json(str(tmp_path / "export.json"))
+
+        with LineageStore(str(tmp_path / "lineage.db"), json_path=str(json_path)) as store:
+            # Second open must not re-import the stale JSON over newer rows
+            assert store.partitions("schedules")["season=2025"]["row_count"] == 300
+        assert out.exists()
+
+
 class TestSpotCheckStats:
     def test_passing_totals_match_pro_football_reference_sample(self):
         weekly = pl.DataFrame(
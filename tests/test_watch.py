@@ -0,0 +1,59 @@
+import os
+
+import orjson
+
+from src.config import DatasetCatalog, DatasetConfig
+from src.dag import NodeResult
+from src import watch
+
+
+def _cfg(name, importer):
+    return DatasetConfig(
+        name=name,
+        importer=importer,
+        years=None,
+        partitions=["season"],
+        key=["season"],
+        options={},
+        enabled=True,
+        sort_by=None,
+        max_rows_per_file=None,
+    )
+
+
+def test_watch_updates_only_changed_upstream_files(tmp_path, monkeypatch):
+    catalog = DatasetCatalog(
+        root="data",
+        compression="zstd",
+        row_group_mb=96,
+        datasets={"pbp": _cfg("pbp", "pbp"), "weekly": _cfg("weekly", "weekly"), "officials": _cfg("officials", "officials")},
+    )
+    mirror = tmp_path / "mirror"
+    mirror.mkdir()
+    (mirror / "play_by_play_2025.parquet").write_bytes(b"v1")
+    calls = []
+
+    def _fake_update(root, catalog, season, datasets, *args, **kwargs):
+        calls.append(sorted(datasets.split(",")))
+        return {name: NodeResult(name=name, status="completed") for name in datasets.split(",")}
+
+    monkeypatch.setattr(watch, "run_update", _fake_update)
+    monkeypatch.setattr(watch.nflverse, "refresh_lookups", lambda season=None: None)
+    status_path = tmp_path / "status.json"
+    watcher = watch.Watcher("data", catalog, 2025, mirror=str(mirror), status_path=str(status_path))
+
+    # First cycle: published pbp plus the probe-less dataset's periodic refresh; weekly is not out yet
+    assert sorted(watcher.poll_once()) == ["officials", "pbp"]
+    assert watcher.poll_once() == []
+    (mirror / "stats_player_week_2025.parquet").write_bytes(b"v1")
+    pbp = mirror / "play_by_play_2025.parquet"
+    pbp.write_bytes(b"v2-corrections")
+    os.utime(pbp, ns=(pbp.stat().st_atime_ns, pbp.stat().st_mtime_ns + 1_000_000))
+    assert sorted(watcher.poll_once()) == ["pbp", "weekly"]
+
+    assert calls == [["officials", "pbp"], ["pbp", "weekly"]]
+    status = orjson.loads(status_path.read_bytes())
+    assert status["state"] == "idle" and status["healthy"] and status["cycles"] == 3
+    assert status["last_update"]["datasets"] == ["pbp", "weekly"]
+    # A restarted daemon picks up where this one left off
+    assert watch.Watcher("data", catalog, 2025, mirror=str(mirror), status_path=str(status_path)).poll_once() == []